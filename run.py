@@ -192,7 +192,7 @@ def main():
     print("=" * 50)
     
     try:
-        from src.ui.app import app
+        from src.ui.app import serve
         
         print("✓ Schlanke Web-App geladen")
         print("✓ 3D-Visualisierung verfügbar")
@@ -213,7 +213,7 @@ def main():
         
         threading.Thread(target=open_browser, daemon=True).start()
         
-        app.run(host='127.0.0.1', port=port, use_reloader=False)
+        serve(host='127.0.0.1', port=port)
         
     except ImportError as e:
         print(f"❌ Import-Fehler: {e}")
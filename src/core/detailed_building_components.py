@@ -7,10 +7,21 @@ nach DIN 4108, DIN EN ISO 13790, GEG und weiteren deutschen Normen.
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple, Union
+from functools import wraps
+from typing import ClassVar, Dict, Iterable, List, Optional, Tuple, Union
+import copy
+import hashlib
+import json
 import uuid
 from enum import Enum
 import numpy as np
+from src.simulation.kernels import layer_u_value
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 class ComponentType(Enum):
     """Bauteiltypen nach deutscher Bauphysik"""
@@ -34,7 +45,7 @@ class MaterialType(Enum):
     GLASS = "glass"  # λ = 1.0 W/(m·K)
     PLASTER = "plaster"  # λ = 0.87 W/(m·K)
     
-@dataclass
+@dataclass(slots=True)
 class Material:
     """Materialspezifikation nach DIN 4108-4"""
     name: str
@@ -44,14 +55,14 @@ class Material:
     vapor_diffusion: float  # Wasserdampf-Diffusionswiderstandszahl μ
     fire_class: str = "A1"  # Baustoffklasse nach DIN 4102
     
-@dataclass
+@dataclass(slots=True)
 class Layer:
     """Schichtaufbau nach DIN 4108"""
     material: Material
     thickness: float  # m
     continuous: bool = True  # Unterbrechungsfreie Schicht
 
-@dataclass
+@dataclass(slots=True)
 class Position3D:
     """3D-Position und Orientierung"""
     x: float
@@ -61,9 +72,33 @@ class Position3D:
     rotation_y: float = 0.0
     rotation_z: float = 0.0
 
-@dataclass
-class DetailedWall:
+class _LayeredComponent:
+    """
+    Basisklasse für Bauteile mit Schichtaufbau.
+    
+    Dicken und λ-Werte werden bei jedem Aufruf neu aus ``layers`` gelesen,
+    damit auch Änderungen an der Liste oder an einzelnen Schichten wirken.
+    """
+    
+    __slots__ = ()
+    
+    def layer_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Schichtdicken und Wärmeleitfähigkeiten als Arrays.
+        
+        Returns:
+            Tuple aus (Dicken in m, λ-Werte in W/(m·K))
+        """
+        n = len(self.layers)
+        thicknesses = np.fromiter((layer.thickness for layer in self.layers), dtype=np.float64, count=n)
+        lambdas = np.fromiter((layer.material.lambda_value for layer in self.layers), dtype=np.float64, count=n)
+        return thicknesses, lambdas
+
+@dataclass(slots=True)
+class DetailedWall(_LayeredComponent):
     """Detaillierte Wandspezifikation nach DIN 4108"""
+    COMPONENT_TYPE: ClassVar[ComponentType] = ComponentType.WALL
+    
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     name: str = "Wand"
     area: float = 0.0  # m²
@@ -93,24 +128,21 @@ class DetailedWall:
         """Berechnet U-Wert nach DIN EN ISO 6946"""
         if not self.layers:
             return 0.0
-            
-        # Wärmeübergangswiderstände
-        r_si = 0.13  # innen, W/(m²·K)
-        r_se = 0.04  # außen, W/(m²·K)
         
-        r_total = r_si + r_se
-        
-        # Schichtwiderstände
-        for layer in self.layers:
-            if layer.thickness > 0 and layer.material.lambda_value > 0:
-                r_total += layer.thickness / layer.material.lambda_value
-        
-        self.u_value = 1.0 / r_total if r_total > 0 else 0.0
+        self.u_value = layer_u_value(*self.layer_arrays(), *self.surface_resistances())
         return self.u_value
+    
+    def surface_resistances(self) -> Tuple[float, float]:
+        """Wärmeübergangswiderstände (innen, außen) in m²·K/W"""
+        r_si = 0.13  # innen
+        r_se = 0.04  # außen
+        return r_si, r_se
 
-@dataclass
+@dataclass(slots=True)
 class DetailedWindow:
     """Detaillierte Fensterspezifikation nach DIN EN 673"""
+    COMPONENT_TYPE: ClassVar[ComponentType] = ComponentType.WINDOW
+    
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     name: str = "Fenster"
     area: float = 0.0  # m²
@@ -145,9 +177,11 @@ class DetailedWindow:
         if self.area == 0.0:
             self.area = self.width * self.height
 
-@dataclass
+@dataclass(slots=True)
 class DetailedDoor:
     """Detaillierte Türspezifikation"""
+    COMPONENT_TYPE: ClassVar[ComponentType] = ComponentType.DOOR
+    
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     name: str = "Tür"
     area: float = 0.0  # m²
@@ -173,9 +207,11 @@ class DetailedDoor:
         if self.area == 0.0:
             self.area = self.width * self.height
 
-@dataclass
-class DetailedRoof:
+@dataclass(slots=True)
+class DetailedRoof(_LayeredComponent):
     """Detaillierte Dachspezifikation nach DIN 4108-2"""
+    COMPONENT_TYPE: ClassVar[ComponentType] = ComponentType.ROOF
+    
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     name: str = "Dach"
     area: float = 0.0  # m²
@@ -206,21 +242,21 @@ class DetailedRoof:
         """Berechnet U-Wert des Daches"""
         if not self.layers:
             return 0.0
-            
-        r_si = 0.10  # innen (nach oben)
-        r_se = 0.04  # außen
-        r_total = r_si + r_se
         
-        for layer in self.layers:
-            if layer.thickness > 0 and layer.material.lambda_value > 0:
-                r_total += layer.thickness / layer.material.lambda_value
-        
-        self.u_value = 1.0 / r_total if r_total > 0 else 0.0
+        self.u_value = layer_u_value(*self.layer_arrays(), *self.surface_resistances())
         return self.u_value
+    
+    def surface_resistances(self) -> Tuple[float, float]:
+        """Wärmeübergangswiderstände (innen, außen) in m²·K/W"""
+        r_si = 0.10  # innen (nach oben)
+        r_se = 0.04  # außen
+        return r_si, r_se
 
-@dataclass
-class DetailedFloor:
+@dataclass(slots=True)
+class DetailedFloor(_LayeredComponent):
     """Detaillierte Bodenspezifikation nach DIN 4108-2"""
+    COMPONENT_TYPE: ClassVar[ComponentType] = ComponentType.FLOOR
+    
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     name: str = "Boden"
     area: float = 0.0  # m²
@@ -244,24 +280,23 @@ class DetailedFloor:
         """Berechnet U-Wert des Bodens"""
         if not self.layers:
             return 0.0
-            
+        
+        self.u_value = layer_u_value(*self.layer_arrays(), *self.surface_resistances())
+        return self.u_value
+    
+    def surface_resistances(self) -> Tuple[float, float]:
+        """Wärmeübergangswiderstände (innen, außen) in m²·K/W"""
         r_si = 0.17  # innen (nach unten)
         r_se = 0.04  # außen
         if self.ground_coupling:
             r_se += 0.5  # zusätzlicher Erdreichwiderstand
-            
-        r_total = r_si + r_se
-        
-        for layer in self.layers:
-            if layer.thickness > 0 and layer.material.lambda_value > 0:
-                r_total += layer.thickness / layer.material.lambda_value
-        
-        self.u_value = 1.0 / r_total if r_total > 0 else 0.0
-        return self.u_value
+        return r_si, r_se
 
-@dataclass
+@dataclass(slots=True)
 class HeatingElement:
     """Heizkörper und Heizflächen"""
+    COMPONENT_TYPE: ClassVar[ComponentType] = ComponentType.RADIATOR
+    
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     name: str = "Heizkörper"
     position: Position3D = field(default_factory=lambda: Position3D(0, 0.1, 0))
@@ -297,9 +332,11 @@ class HeatingElement:
         power_factor = (dt_actual / dt_nominal) ** 1.3
         return self.heating_power * power_factor
 
-@dataclass
+@dataclass(slots=True)
 class ThermalBridge:
     """Wärmebrücken nach DIN 4108 Beiblatt 2"""
+    COMPONENT_TYPE: ClassVar[ComponentType] = ComponentType.THERMAL_BRIDGE
+    
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     name: str = "Wärmebrücke"
     bridge_type: str = "edge"  # edge, corner, penetration, balcony
@@ -316,9 +353,11 @@ class ThermalBridge:
         """Berechnet Wärmeverlust durch Wärmebrücke"""
         return self.psi_value * self.length * delta_t
 
-@dataclass
+@dataclass(slots=True)
 class ShadingElement:
     """Verschattungselemente"""
+    COMPONENT_TYPE: ClassVar[ComponentType] = ComponentType.SHADING
+    
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     name: str = "Verschattung"
     position: Position3D = field(default_factory=lambda: Position3D(0, 0, 0))
@@ -335,6 +374,190 @@ class ShadingElement:
     shading_factor: float = 0.5  # 0 = keine Verschattung, 1 = vollständig verschattet
     seasonal_variation: bool = True  # Unterschiedliche Verschattung je Jahreszeit
 
+def layered_u_values(components: List[_LayeredComponent]) -> np.ndarray:
+    """
+    Berechnet die U-Werte mehrerer Bauteile mit Schichtaufbau auf einmal.
+    
+    Die Schichten aller Bauteile werden hintereinander in flache Arrays
+    gepackt (CSR-Format) und die Widerstände je Bauteil mit np.add.reduceat
+    summiert.
+    
+    Args:
+        components: Wände, Dächer oder Böden mit mindestens einer Schicht
+        
+    Returns:
+        U-Werte in W/(m²·K) in der Reihenfolge der Bauteile
+    """
+    if not components:
+        return np.empty(0)
+    
+    layer_arrays = [component.layer_arrays() for component in components]
+    thicknesses = np.concatenate([arrays[0] for arrays in layer_arrays])
+    lambdas = np.concatenate([arrays[1] for arrays in layer_arrays])
+    offsets = np.zeros(len(components), dtype=np.intp)
+    np.cumsum([len(arrays[0]) for arrays in layer_arrays[:-1]], out=offsets[1:])
+    
+    # Schichten ohne Dicke oder Wärmeleitfähigkeit tragen nicht bei
+    valid = (thicknesses > 0) & (lambdas > 0)
+    resistances = np.divide(thicknesses, lambdas, out=np.zeros_like(thicknesses), where=valid)
+    surface = np.fromiter((sum(component.surface_resistances()) for component in components),
+                          dtype=np.float64, count=len(components))
+    
+    return 1.0 / (surface + np.add.reduceat(resistances, offsets))
+
+def _wall_3d_data(wall: DetailedWall) -> Dict:
+    """3D-Darstellungsdaten einer Wand"""
+    if wall.u_value is None:
+        wall.calculate_u_value()
+    return {
+        "id": wall.id,
+        "name": wall.name,
+        "area": wall.area,
+        "width": wall.width,
+        "height": wall.height,
+        "orientation": wall.orientation,
+        "u_value": wall.u_value,
+        "position": {
+            "x": wall.position.x,
+            "y": wall.position.y,
+            "z": wall.position.z,
+            "rotation": wall.position.rotation_z
+        },
+        "is_external": wall.is_external,
+        "is_load_bearing": wall.is_load_bearing,
+        "layers": [
+            {
+                "material": layer.material.name,
+                "thickness": layer.thickness,
+                "lambda": layer.material.lambda_value
+            } for layer in wall.layers
+        ]
+    }
+
+def _window_3d_data(window: DetailedWindow) -> Dict:
+    """3D-Darstellungsdaten eines Fensters"""
+    return {
+        "id": window.id,
+        "name": window.name,
+        "area": window.area,
+        "width": window.width,
+        "height": window.height,
+        "orientation": window.orientation,
+        "u_value": window.u_value,
+        "g_value": window.g_value,
+        "position": {
+            "x": window.position.x,
+            "y": window.position.y,
+            "z": window.position.z
+        },
+        "glazing_type": window.glazing_type,
+        "frame_u_value": window.frame_u_value,
+        "is_openable": window.is_openable
+    }
+
+def _door_3d_data(door: DetailedDoor) -> Dict:
+    """3D-Darstellungsdaten einer Tür"""
+    return {
+        "id": door.id,
+        "name": door.name,
+        "area": door.area,
+        "width": door.width,
+        "height": door.height,
+        "orientation": door.orientation,
+        "u_value": door.u_value,
+        "position": {
+            "x": door.position.x,
+            "y": door.position.y,
+            "z": door.position.z
+        },
+        "door_type": door.door_type,
+        "material": door.material,
+        "is_main_entrance": door.is_main_entrance
+    }
+
+def _roof_3d_data(roof: DetailedRoof) -> Dict:
+    """3D-Darstellungsdaten eines Dachs"""
+    if roof.u_value is None:
+        roof.calculate_u_value()
+    return {
+        "id": roof.id,
+        "name": roof.name,
+        "area": roof.area,
+        "tilt": roof.tilt,
+        "orientation": roof.orientation,
+        "u_value": roof.u_value,
+        "position": {
+            "x": roof.position.x,
+            "y": roof.position.y,
+            "z": roof.position.z
+        },
+        "roof_type": roof.roof_type,
+        "has_attic": roof.has_attic,
+        "pv_suitable": roof.pv_suitable,
+        "pv_area_available": roof.pv_area_available
+    }
+
+def _floor_3d_data(floor: DetailedFloor) -> Dict:
+    """3D-Darstellungsdaten eines Bodens"""
+    if floor.u_value is None:
+        floor.calculate_u_value()
+    return {
+        "id": floor.id,
+        "name": floor.name,
+        "area": floor.area,
+        "u_value": floor.u_value,
+        "position": {
+            "x": floor.position.x,
+            "y": floor.position.y,
+            "z": floor.position.z
+        },
+        "floor_type": floor.floor_type,
+        "ground_coupling": floor.ground_coupling,
+        "has_underfloor_heating": floor.has_underfloor_heating
+    }
+
+def _radiator_3d_data(radiator: HeatingElement) -> Dict:
+    """3D-Darstellungsdaten eines Heizkörpers"""
+    return {
+        "id": radiator.id,
+        "name": radiator.name,
+        "heating_power": radiator.heating_power,
+        "position": {
+            "x": radiator.position.x,
+            "y": radiator.position.y,
+            "z": radiator.position.z
+        },
+        "dimensions": {
+            "width": radiator.width,
+            "height": radiator.height,
+            "depth": radiator.depth
+        },
+        "radiator_type": radiator.radiator_type,
+        "supply_temp": radiator.supply_temp,
+        "return_temp": radiator.return_temp,
+        "has_thermostatic_valve": radiator.has_thermostatic_valve
+    }
+
+# 3D-Darstellung je Bauteiltyp (Wärmebrücken und Verschattung werden nicht dargestellt)
+_3D_DATA_BUILDERS = {
+    ComponentType.WALL: _wall_3d_data,
+    ComponentType.WINDOW: _window_3d_data,
+    ComponentType.DOOR: _door_3d_data,
+    ComponentType.ROOF: _roof_3d_data,
+    ComponentType.FLOOR: _floor_3d_data,
+    ComponentType.RADIATOR: _radiator_3d_data
+}
+
+def _cached_by_revision(method):
+    """Speichert das Ergebnis einer Manager-Methode bis zur nächsten Änderung der Komponenten."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        if key not in self._cache:
+            self._cache[key] = method(self, *args, **kwargs)
+        return self._cache[key]
+    return wrapper
+
 class DetailedBuildingManager:
     """Manager für detaillierte Gebäudekomponenten"""
     
@@ -343,6 +566,13 @@ class DetailedBuildingManager:
                                       DetailedRoof, DetailedFloor, HeatingElement,
                                       ThermalBridge, ShadingElement]] = {}
         
+        # Komponenten je Bauteiltyp (ID -> Komponente, in Einfügereihenfolge)
+        self._by_type: Dict[ComponentType, Dict[str, object]] = {}
+        
+        # Änderungszähler und abgeleitete Ergebnisse der aktuellen Revision
+        self._revision = 0
+        self._cache: Dict[tuple, object] = {}
+        
         # Standard-Materialien nach DIN 4108-4
         self.standard_materials = self._create_standard_materials()
         
@@ -441,13 +671,53 @@ class DetailedBuildingManager:
         
         return constructions
     
+    @property
+    def revision(self) -> int:
+        """Änderungszähler der Komponenten"""
+        return self._revision
+    
+    def mark_modified(self):
+        """
+        Verwirft abgeleitete Ergebnisse nach einer Änderung.
+        
+        add_component und remove_component rufen dies selbst auf; nach direkter
+        Änderung einer Komponente (z.B. Schichten oder Fläche) muss es
+        explizit aufgerufen werden.
+        """
+        self._revision += 1
+        self._cache.clear()
+    
+    def _insert(self, component):
+        """Legt eine Komponente ab und trägt sie im Typ-Index ein"""
+        previous = self.components.get(component.id)
+        if previous is not None and previous.COMPONENT_TYPE != component.COMPONENT_TYPE:
+            self._unindex(previous)
+        self.components[component.id] = component
+        self._by_type.setdefault(component.COMPONENT_TYPE, {})[component.id] = component
+    
+    def _unindex(self, component):
+        """Entfernt eine Komponente aus dem Typ-Index"""
+        self._by_type.get(component.COMPONENT_TYPE, {}).pop(component.id, None)
+    
     def add_component(self, component: Union[DetailedWall, DetailedWindow, DetailedDoor,
                                           DetailedRoof, DetailedFloor, HeatingElement,
                                           ThermalBridge, ShadingElement]) -> str:
         """Fügt Komponente hinzu und gibt ID zurück"""
-        self.components[component.id] = component
+        self._insert(component)
+        self.mark_modified()
         return component.id
     
+    def add_components(self, components: Iterable[Union[DetailedWall, DetailedWindow, DetailedDoor,
+                                                          DetailedRoof, DetailedFloor, HeatingElement,
+                                                          ThermalBridge, ShadingElement]]) -> List[str]:
+        """Fügt mehrere Komponenten mit einer einzigen Änderung hinzu und gibt deren IDs zurück"""
+        ids = []
+        for component in components:
+            self._insert(component)
+            ids.append(component.id)
+        self.mark_modified()
+        return ids
+    
     def get_component(self, component_id: str) -> Optional[Union[DetailedWall, DetailedWindow, DetailedDoor,
                                                                 DetailedRoof, DetailedFloor, HeatingElement,
                                                                 ThermalBridge, ShadingElement]]:
@@ -457,7 +727,8 @@ class DetailedBuildingManager:
     def remove_component(self, component_id: str) -> bool:
         """Entfernt Komponente"""
         if component_id in self.components:
-            del self.components[component_id]
+            self._unindex(self.components.pop(component_id))
+            self.mark_modified()
             return True
         return False
     
@@ -465,29 +736,36 @@ class DetailedBuildingManager:
                                                                                 DetailedRoof, DetailedFloor, HeatingElement,
                                                                                 ThermalBridge, ShadingElement]]:
         """Gibt alle Komponenten eines bestimmten Typs zurück"""
-        result = []
-        for component in self.components.values():
-            if isinstance(component, DetailedWall) and component_type == ComponentType.WALL:
-                result.append(component)
-            elif isinstance(component, DetailedWindow) and component_type == ComponentType.WINDOW:
-                result.append(component)
-            elif isinstance(component, DetailedDoor) and component_type == ComponentType.DOOR:
-                result.append(component)
-            elif isinstance(component, DetailedRoof) and component_type == ComponentType.ROOF:
-                result.append(component)
-            elif isinstance(component, DetailedFloor) and component_type == ComponentType.FLOOR:
-                result.append(component)
-            elif isinstance(component, HeatingElement) and component_type == ComponentType.RADIATOR:
-                result.append(component)
-            elif isinstance(component, ThermalBridge) and component_type == ComponentType.THERMAL_BRIDGE:
-                result.append(component)
-            elif isinstance(component, ShadingElement) and component_type == ComponentType.SHADING:
-                result.append(component)
-        
-        return result
+        return list(self._by_type.get(component_type, {}).values())
+    
+    @_cached_by_revision
+    def _area_u_arrays(self, component_type: ComponentType) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Flächen und U-Werte aller Bauteile eines Typs als Arrays.
+        
+        Fehlende U-Werte geschichteter Bauteile werden dabei berechnet.
+        
+        Args:
+            component_type: Wand, Fenster, Tür, Dach oder Boden
+            
+        Returns:
+            Tuple aus (Flächen in m², U-Werte in W/(m²·K))
+        """
+        components = self.get_components_by_type(component_type)
+        pending = [c for c in components if c.u_value is None and c.layers]
+        for component, u_value in zip(pending, layered_u_values(pending)):
+            component.u_value = float(u_value)
+        areas = np.fromiter((c.area for c in components), dtype=np.float64, count=len(components))
+        u_values = np.fromiter((c.u_value for c in components), dtype=np.float64, count=len(components))
+        return areas, u_values
     
     def calculate_total_heat_loss(self, indoor_temp: float = 20.0, outdoor_temp: float = -12.0) -> Dict[str, float]:
-        """Berechnet Gesamtwärmeverluste nach DIN EN 12831"""
+        """Berechnet Gesamtwärmeverluste nach DIN EN 12831 (Kopie des gecachten Ergebnisses)"""
+        return dict(self._total_heat_loss(indoor_temp, outdoor_temp))
+    
+    @_cached_by_revision
+    def _total_heat_loss(self, indoor_temp: float, outdoor_temp: float) -> Dict[str, float]:
+        """Gesamtwärmeverluste nach DIN EN 12831, bis zur nächsten Änderung gecacht"""
         delta_t = indoor_temp - outdoor_temp
         losses = {
             "transmission_walls": 0.0,
@@ -499,35 +777,20 @@ class DetailedBuildingManager:
             "total_transmission": 0.0
         }
         
-        # Transmissionsverluste Wände
-        for wall in self.get_components_by_type(ComponentType.WALL):
-            if wall.u_value is None:
-                wall.calculate_u_value()
-            losses["transmission_walls"] += wall.area * wall.u_value * delta_t
-        
-        # Transmissionsverluste Fenster
-        for window in self.get_components_by_type(ComponentType.WINDOW):
-            losses["transmission_windows"] += window.area * window.u_value * delta_t
-        
-        # Transmissionsverluste Türen
-        for door in self.get_components_by_type(ComponentType.DOOR):
-            losses["transmission_doors"] += door.area * door.u_value * delta_t
-        
-        # Transmissionsverluste Dach
-        for roof in self.get_components_by_type(ComponentType.ROOF):
-            if roof.u_value is None:
-                roof.calculate_u_value()
-            losses["transmission_roof"] += roof.area * roof.u_value * delta_t
-        
-        # Transmissionsverluste Boden
-        for floor in self.get_components_by_type(ComponentType.FLOOR):
-            if floor.u_value is None:
-                floor.calculate_u_value()
-            losses["transmission_floor"] += floor.area * floor.u_value * delta_t
-        
-        # Wärmebrücken
-        for bridge in self.get_components_by_type(ComponentType.THERMAL_BRIDGE):
-            losses["thermal_bridges"] += bridge.calculate_heat_loss(delta_t)
+        # Transmissionsverluste je Bauteiltyp als Skalarprodukt A·U
+        for key, component_type in (("transmission_walls", ComponentType.WALL),
+                                     ("transmission_windows", ComponentType.WINDOW),
+                                     ("transmission_doors", ComponentType.DOOR),
+                                     ("transmission_roof", ComponentType.ROOF),
+                                     ("transmission_floor", ComponentType.FLOOR)):
+            areas, u_values = self._area_u_arrays(component_type)
+            losses[key] = float(areas @ u_values) * delta_t
+        
+        # Wärmebrücken: Summe ψ·l als ein Skalarprodukt
+        bridges = self.get_components_by_type(ComponentType.THERMAL_BRIDGE)
+        psi_values = np.fromiter((bridge.psi_value for bridge in bridges), dtype=np.float64, count=len(bridges))
+        lengths = np.fromiter((bridge.length for bridge in bridges), dtype=np.float64, count=len(bridges))
+        losses["thermal_bridges"] = float(psi_values @ lengths) * delta_t
         
         # Gesamttransmissionsverluste
         losses["total_transmission"] = sum([
@@ -542,156 +805,77 @@ class DetailedBuildingManager:
         return losses
     
     def get_building_3d_data(self) -> Dict:
-        """Konvertiert Gebäudekomponenten zu 3D-Darstellungsdaten"""
+        """
+        Konvertiert Gebäudekomponenten zu 3D-Darstellungsdaten.
+        
+        Liefert eine unabhängige Kopie der gecachten Daten; für die
+        Auslieferung ohne Kopie siehe get_building_3d_payload.
+        """
+        return copy.deepcopy(self._building_3d_data())
+    
+    @_cached_by_revision
+    def _building_3d_data(self) -> Dict:
+        """3D-Darstellungsdaten, bis zur nächsten Änderung gecacht"""
         data = {
-            "walls": [],
-            "windows": [],
-            "doors": [],
+            "walls": [_wall_3d_data(wall) for wall in self.get_components_by_type(ComponentType.WALL)],
+            "windows": [_window_3d_data(window) for window in self.get_components_by_type(ComponentType.WINDOW)],
+            "doors": [_door_3d_data(door) for door in self.get_components_by_type(ComponentType.DOOR)],
             "roof": None,
             "floor": None,
-            "radiators": [],
+            "radiators": [_radiator_3d_data(radiator)
+                          for radiator in self.get_components_by_type(ComponentType.RADIATOR)],
             "thermal_bridges": [],
             "shading": []
         }
         
-        # Wände
-        for wall in self.get_components_by_type(ComponentType.WALL):
-            if wall.u_value is None:
-                wall.calculate_u_value()
-                
-            data["walls"].append({
-                "id": wall.id,
-                "name": wall.name,
-                "area": wall.area,
-                "width": wall.width,
-                "height": wall.height,
-                "orientation": wall.orientation,
-                "u_value": wall.u_value,
-                "position": {
-                    "x": wall.position.x,
-                    "y": wall.position.y,
-                    "z": wall.position.z,
-                    "rotation": wall.position.rotation_z
-                },
-                "is_external": wall.is_external,
-                "is_load_bearing": wall.is_load_bearing,
-                "layers": [
-                    {
-                        "material": layer.material.name,
-                        "thickness": layer.thickness,
-                        "lambda": layer.material.lambda_value
-                    } for layer in wall.layers
-                ]
-            })
-        
-        # Fenster
-        for window in self.get_components_by_type(ComponentType.WINDOW):
-            data["windows"].append({
-                "id": window.id,
-                "name": window.name,
-                "area": window.area,
-                "width": window.width,
-                "height": window.height,
-                "orientation": window.orientation,
-                "u_value": window.u_value,
-                "g_value": window.g_value,
-                "position": {
-                    "x": window.position.x,
-                    "y": window.position.y,
-                    "z": window.position.z
-                },
-                "glazing_type": window.glazing_type,
-                "frame_u_value": window.frame_u_value,
-                "is_openable": window.is_openable
-            })
-        
-        # Türen
-        for door in self.get_components_by_type(ComponentType.DOOR):
-            data["doors"].append({
-                "id": door.id,
-                "name": door.name,
-                "area": door.area,
-                "width": door.width,
-                "height": door.height,
-                "orientation": door.orientation,
-                "u_value": door.u_value,
-                "position": {
-                    "x": door.position.x,
-                    "y": door.position.y,
-                    "z": door.position.z
-                },
-                "door_type": door.door_type,
-                "material": door.material,
-                "is_main_entrance": door.is_main_entrance
-            })
-        
-        # Dach
+        # Dach und Boden: jeweils das erste Bauteil
         roofs = self.get_components_by_type(ComponentType.ROOF)
         if roofs:
-            roof = roofs[0]  # Erstes Dach nehmen
-            if roof.u_value is None:
-                roof.calculate_u_value()
-                
-            data["roof"] = {
-                "id": roof.id,
-                "name": roof.name,
-                "area": roof.area,
-                "tilt": roof.tilt,
-                "orientation": roof.orientation,
-                "u_value": roof.u_value,
-                "position": {
-                    "x": roof.position.x,
-                    "y": roof.position.y,
-                    "z": roof.position.z
-                },
-                "roof_type": roof.roof_type,
-                "has_attic": roof.has_attic,
-                "pv_suitable": roof.pv_suitable,
-                "pv_area_available": roof.pv_area_available
-            }
-        
-        # Boden
+            data["roof"] = _roof_3d_data(roofs[0])
         floors = self.get_components_by_type(ComponentType.FLOOR)
         if floors:
-            floor = floors[0]  # Ersten Boden nehmen
-            if floor.u_value is None:
-                floor.calculate_u_value()
-                
-            data["floor"] = {
-                "id": floor.id,
-                "name": floor.name,
-                "area": floor.area,
-                "u_value": floor.u_value,
-                "position": {
-                    "x": floor.position.x,
-                    "y": floor.position.y,
-                    "z": floor.position.z
-                },
-                "floor_type": floor.floor_type,
-                "ground_coupling": floor.ground_coupling,
-                "has_underfloor_heating": floor.has_underfloor_heating
-            }
-        
-        # Heizkörper
-        for radiator in self.get_components_by_type(ComponentType.RADIATOR):
-            data["radiators"].append({
-                "id": radiator.id,
-                "name": radiator.name,
-                "heating_power": radiator.heating_power,
-                "position": {
-                    "x": radiator.position.x,
-                    "y": radiator.position.y,
-                    "z": radiator.position.z
-                },
-                "dimensions": {
-                    "width": radiator.width,
-                    "height": radiator.height,
-                    "depth": radiator.depth
-                },
-                "radiator_type": radiator.radiator_type,
-                "supply_temp": radiator.supply_temp,
-                "return_temp": radiator.return_temp,
-                "has_thermostatic_valve": radiator.has_thermostatic_valve
-            })
+            data["floor"] = _floor_3d_data(floors[0])
         
         return data
+    
+    def get_component_delta(self, component_id: str) -> Dict:
+        """
+        3D-Daten einer einzelnen Komponente zur inkrementellen Aktualisierung.
+        
+        Ein Client, der die Revision vor der Änderung kennt, kann die Änderung
+        direkt übernehmen; bei einer Lücke in den Revisionen lädt er
+        get_building_3d_data neu.
+        
+        Args:
+            component_id: ID der hinzugefügten, geänderten oder entfernten Komponente
+            
+        Returns:
+            Dict mit aktueller Revision und Änderung (ID -> Bauteiltyp und
+            Daten, None für entfernte oder nicht dargestellte Komponenten)
+        """
+        component = self.components.get(component_id)
+        builder = _3D_DATA_BUILDERS.get(component.COMPONENT_TYPE) if component is not None else None
+        entry = None
+        if builder is not None:
+            entry = {"type": component.COMPONENT_TYPE.value, **builder(component)}
+        return {"revision": self._revision, "delta": {component_id: entry}}
+    
+    @_cached_by_revision
+    def get_building_3d_payload(self) -> Tuple[bytes, str]:
+        """
+        3D-Darstellungsdaten als fertig serialisiertes JSON mit ETag.
+        
+        Bytes und ETag bleiben bis zur nächsten Änderung gleich, sodass ein
+        Endpunkt sie direkt ausliefern bzw. mit If-None-Match vergleichen kann.
+        
+        Returns:
+            Tuple aus (JSON als UTF-8-Bytes, ETag als Header-Wert mit Anführungszeichen)
+        """
+        data = self._building_3d_data()
+        if ORJSON_AVAILABLE:
+            blob = orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+        else:
+            blob = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        # Entity-Tag nach RFC 9110 in Anführungszeichen
+        etag = f'"{hashlib.blake2b(blob, digest_size=8).hexdigest()}"'
+        return blob, etag
@@ -6,6 +6,7 @@ Lädt und verwaltet Daten von PV-Modulen, Wechselrichtern und Wärmepumpen.
 import json
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, Optional
 import logging
 
@@ -114,3 +115,13 @@ class ComponentsDatabase:
     def list_heat_pumps(self) -> list[str]:
         """Listet alle verfügbaren Wärmepumpen auf."""
         return list(self.heat_pumps.keys())
+
+@lru_cache(maxsize=None)
+def get_components_database(components_dir: Optional[str] = None) -> ComponentsDatabase:
+    """
+    Gibt eine gemeinsam genutzte Komponenten-Datenbank zurück.
+    
+    Die JSON-Dateien werden pro Verzeichnis nur einmal geladen und bei
+    wiederholten Simulationen wiederverwendet.
+    """
+    return ComponentsDatabase(components_dir)
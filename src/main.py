@@ -3,11 +3,17 @@ EnergyOS - Main program for building energy system simulation
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
+import matplotlib
+matplotlib.use('Agg')  # Plots werden nur als Datei gespeichert, kein GUI-Backend nötig
+from matplotlib.figure import Figure
 import pandas as pd
 from pathlib import Path
+from dataclasses import astuple
+from functools import lru_cache
 from datetime import datetime, timedelta
 import json
+import re
+import multiprocessing
 from typing import Dict, Any, Optional, Tuple, List, Union
 import importlib.util
 import logging
@@ -19,43 +25,46 @@ logger = logging.getLogger(__name__)
 try:
     if __name__ == "__main__":
         # Wenn direkt ausgeführt
-        from simulation.heat_pump import HeatPump, HeatPumpSpecifications
+        from simulation.heat_pump import HeatPump, HeatPumpSpecifications, build_cop_interpolator
         from simulation.pv_system import PVSystem, PVArrayConfiguration
-        from data_handlers.components import ComponentsDatabase
+        from simulation.kernels import daily_heat_demand, energy_balance, series_statistics
+        from data_handlers.components import get_components_database
         from data_handlers.weather import WeatherDataHandler
         from core.building import Building, BuildingProperties
     else:
         # Wenn als Modul importiert
-        from .simulation.heat_pump import HeatPump, HeatPumpSpecifications
+        from .simulation.heat_pump import HeatPump, HeatPumpSpecifications, build_cop_interpolator
         from .simulation.pv_system import PVSystem, PVArrayConfiguration
-        from .data_handlers.components import ComponentsDatabase
+        from .simulation.kernels import daily_heat_demand, energy_balance, series_statistics
+        from .data_handlers.components import get_components_database
         from .data_handlers.weather import WeatherDataHandler
         from .core.building import Building, BuildingProperties
 except ImportError:
     # Fallback für absolute Importe
-    from src.simulation.heat_pump import HeatPump, HeatPumpSpecifications
+    from src.simulation.heat_pump import HeatPump, HeatPumpSpecifications, build_cop_interpolator
     from src.simulation.pv_system import PVSystem, PVArrayConfiguration
-    from src.data_handlers.components import ComponentsDatabase
+    from src.simulation.kernels import daily_heat_demand, energy_balance, series_statistics
+    from src.data_handlers.components import get_components_database
     from src.data_handlers.weather import WeatherDataHandler
     from src.core.building import Building, BuildingProperties
 
-def init_heat_pump() -> HeatPump:
-    """Initialize heat pump with default parameters."""
-    # Initialize components database
-    db = ComponentsDatabase()
+# COP-Schlüssel im Format A7W35 bzw. A-7W35 (Außentemperatur, Vorlauftemperatur)
+_COP_KEY_PATTERN = re.compile(r'A(-?\d+(?:\.\d+)?)W(-?\d+(?:\.\d+)?)')
+
+@lru_cache(maxsize=None)
+def _default_heat_pump_specs() -> HeatPumpSpecifications:
+    """Load the default heat pump specifications once and reuse them."""
+    db = get_components_database()
     heat_pump_data = db.get_heat_pump("Viessmann_Vitocal_200S")
     
     # COP Datenpunkte konvertieren von A7W35 Format zu (7.0, 35.0) Tupel
     cop_rating_points = {}
     for key, cop in heat_pump_data.cop_data.items():
-        # Format A7W35 aufteilen und konvertieren
-        if key.startswith('A') and 'W' in key:
-            try:
-                outside_temp = float(key.split('A')[1].split('W')[0])
-                flow_temp = float(key.split('W')[1])
-                cop_rating_points[(float(outside_temp), float(flow_temp))] = float(cop)
-            except (ValueError, IndexError) as e:
-                logger.error(f"Fehler bei der Konvertierung des COP-Schlüssels {key}: {e}")
+        match = _COP_KEY_PATTERN.fullmatch(key)
+        if match:
+            cop_rating_points[(float(match.group(1)), float(match.group(2)))] = float(cop)
+        elif key.startswith('A') and 'W' in key:
+            logger.error(f"Fehler bei der Konvertierung des COP-Schlüssels {key}")
     
     specs = HeatPumpSpecifications(
         nominal_heating_power=heat_pump_data.nominal_heating_power / 1000,  # Convert W to kW
@@ -65,8 +74,26 @@ def init_heat_pump() -> HeatPump:
         min_part_load_ratio=0.3,
         defrost_temp_threshold=7.0,
         thermal_mass=20.0,
+        cop_interpolator=build_cop_interpolator(cop_rating_points),
+    )
+    return specs
+
+def init_heat_pump() -> HeatPump:
+    """Initialize heat pump with default parameters."""
+    # Specs are cached, the heat pump itself carries run state and is created fresh
+    return HeatPump(_default_heat_pump_specs())
+
+@lru_cache(maxsize=32)
+def _cached_pv_system(config_values: tuple,
+                      location: Tuple[float, float],
+                      altitude: float) -> PVSystem:
+    """Create a PV system once per configuration and reuse it across runs."""
+    return PVSystem(
+        config=PVArrayConfiguration(*config_values),
+        location=location,
+        altitude=altitude,
+        components_db=get_components_database()
     )
-    return HeatPump(specs)
 
 def init_pv_system() -> PVSystem:
     """Initialize PV system with default parameters using component database."""
@@ -79,11 +106,225 @@ def init_pv_system() -> PVSystem:
         inverter_key="SMA_Sunny_Tripower_10"  # 10 kW inverter
     )
     
-    return PVSystem(
-        config=array_config,
-        location=(52.52, 13.4),  # Berlin
-        altitude=34.0  # Height above sea level in Berlin
+    return _cached_pv_system(
+        astuple(array_config),
+        (52.52, 13.4),  # Berlin
+        34.0  # Height above sea level in Berlin
+    )
+
+# Wiederverwendete Figures je (Zeilen, Spalten, Größe), vermeidet den Neuaufbau bei jedem Plot
+_FIGURE_CACHE: Dict[Tuple[int, int, Tuple[float, float]], Figure] = {}
+
+def _get_figure(nrows: int, ncols: int, figsize: Tuple[float, float]) -> Tuple[Figure, np.ndarray]:
+    """Return a cleared, cached figure with a fresh grid of axes."""
+    key = (nrows, ncols, figsize)
+    fig = _FIGURE_CACHE.get(key)
+    if fig is None:
+        fig = Figure(figsize=figsize)
+        _FIGURE_CACHE[key] = fig
+    else:
+        fig.clf()
+    axes = fig.subplots(nrows, ncols, squeeze=False)
+    return fig, axes
+
+def _render_dashboard(fig: Figure, axes: np.ndarray, hours, data: Dict[str, Any], title: str) -> None:
+    """Draw the 2x2 simulation overview (temperatures, COP/PV, heat pump, radiation)."""
+    (ax1, ax2), (ax3, ax4) = axes
+    fig.suptitle(title)
+    
+    # Plot 1: Temperaturen
+    ax1.plot(hours, data['outside_temperature'], 'b-', label='Outside Temperature')
+    ax1.plot(hours, data['flow_temperature'], 'r-', label='Flow Temperature')
+    ax1.set_xlabel('Hour')
+    ax1.set_ylabel('Temperature (°C)')
+    ax1.legend()
+    ax1.grid(True)
+    
+    # Plot 2: COP und PV-Leistung
+    ax2.plot(hours, data['cop'], 'g-', label='Heat Pump COP')
+    ax2.plot(hours, data['pv_ac_output'], 'y-', label='PV Power (AC)')
+    ax2.set_xlabel('Hour')
+    ax2.set_ylabel('COP / Power (kW)')
+    ax2.legend()
+    ax2.grid(True)
+    
+    # Plot 3: Wärmepumpenleistung
+    ax3.plot(hours, data['heat_output'], 'r-', label='Heat Output')
+    ax3.plot(hours, data['power_input'], 'b-', label='Power Input')
+    ax3.plot(hours, data['heat_demand'], 'k--', label='Heat Demand')
+    ax3.set_xlabel('Hour')
+    ax3.set_ylabel('Power (kW)')
+    ax3.legend()
+    ax3.grid(True)
+    
+    # Plot 4: Solarstrahlung
+    ax4.plot(hours, data['solar_radiation'], 'y-', label='Global Radiation')
+    ax4.set_xlabel('Hour')
+    ax4.set_ylabel('Irradiance (W/m²)')
+    ax4.legend()
+    ax4.grid(True)
+
+def _interp_rows(x: np.ndarray, xp: np.ndarray, fp: np.ndarray) -> np.ndarray:
+    """
+    Lineare Interpolation mehrerer Zeitreihen auf gemeinsamen Stützstellen.
+    
+    Entspricht np.interp für jede Zeile von fp, die Intervallsuche und die
+    Gewichte werden aber nur einmal für alle Zeilen berechnet.
+    
+    Args:
+        x: Zielpunkte
+        xp: Aufsteigend sortierte Stützstellen
+        fp: Werte der Form (Anzahl Reihen, len(xp))
+        
+    Returns:
+        Interpolierte Werte der Form (Anzahl Reihen, len(x))
+    """
+    if len(xp) == 0:
+        raise ValueError("array of sample points is empty")
+    if len(xp) == 1:
+        return np.repeat(fp[:, :1], len(x), axis=1)
+    
+    # Intervallindex je Zielpunkt, außerhalb wird wie bei np.interp der Randwert gehalten
+    idx = np.clip(np.searchsorted(xp, x, side='right') - 1, 0, len(xp) - 2)
+    x_clipped = np.clip(x, xp[0], xp[-1])
+    # Doppelte Stützstellen (z. B. Zeitumstellung im Herbst) haben die Breite 0,
+    # dort wird wie bei np.interp der Stützwert selbst übernommen
+    dx = xp[idx + 1] - xp[idx]
+    slope = np.divide(fp[:, idx + 1] - fp[:, idx], dx,
+                      out=np.zeros((fp.shape[0], len(idx))), where=dx > 0)
+    result = slope * (x_clipped - xp[idx]) + fp[:, idx]
+    # Rechter Rand exakt auf den letzten Stützwert setzen
+    return np.where(x_clipped >= xp[-1], fp[:, -1:], result)
+
+def _simulate_day(args: Tuple) -> Dict[str, Any]:
+    """
+    Simuliert einen einzelnen Tag auf Basis bereits interpolierter Wetterdaten.
+    
+    Als Modulfunktion definiert, damit sie von multiprocessing.Pool in
+    Worker-Prozessen ausgeführt werden kann. Im parallelen Betrieb arbeitet
+    jeder Prozess mit einer eigenen Kopie von Wärmepumpe und PV-System.
+    
+    Args:
+        args: Tuple aus (Zeitpunkte des Tages, Temperaturen, Solarstrahlung,
+              Windgeschwindigkeit, beheizte Fläche, Zeitschritt in Stunden,
+              Wärmepumpe, PV-System, Zeitreihen behalten)
+        
+    Returns:
+        Dictionary mit den Zeitreihen des Tages oder, wenn keine Zeitreihen
+        behalten werden sollen, nur mit deren Kennzahlen (siehe _summarize_series)
+    """
+    (day_timestamps,
+     temp_interpolation, radiation_interpolation, wind_interpolation,
+     heated_area, time_step_hours, heat_pump, pv_system, keep_series) = args
+    
+    # Simplifizierten Wärmebedarf basierend auf Außentemperatur berechnen
+    # In der Realität würde hier ein detailliertes Gebäudemodell verwendet
+    # Einfaches Modell: Heizgrenztemperatur 15°C, darunter linear steigender Bedarf
+    heat_demand_daily = daily_heat_demand(
+        np.asarray(temp_interpolation, dtype=np.float64), float(heated_area)
     )
+    
+    # PV-Erzeugung für alle Zeitschritte des Tages in einem Aufruf berechnen;
+    # ohne Einstrahlung (nachts) liefert das Modell ohnehin 0 und wird übersprungen
+    steps_today = len(day_timestamps)
+    day_radiation = radiation_interpolation[:steps_today]
+    daylight = day_radiation > 0.0
+    pv_dc_day = np.zeros(steps_today)
+    pv_ac_day = np.zeros(steps_today)
+    if daylight.any():
+        daylight_radiation = day_radiation[daylight]
+        pv_dc_day[daylight], pv_ac_day[daylight] = pv_system.calculate_power_output_series(
+            pd.DatetimeIndex(day_timestamps)[daylight], {
+                'ghi': daylight_radiation,
+                'dni': daylight_radiation * 0.85,  # Vereinfachte DNI
+                'dhi': daylight_radiation * 0.15,  # Vereinfachte DHI
+                'temp_air': temp_interpolation[:steps_today][daylight],
+                'wind_speed': wind_interpolation[:steps_today][daylight]
+            }
+        )
+    
+    # Wärmepumpe für alle Zeitschritte des Tages vektorisiert simulieren
+    outside_temps = np.asarray(temp_interpolation[:steps_today], dtype=np.float64)
+    heat_demands = heat_demand_daily[:steps_today] * time_step_hours  # kWh je Zeitschritt
+    flow_temps = heat_pump.calculate_flow_temperature(outside_temps)
+    heat_outputs, power_inputs, cop_values = heat_pump.simulate_series(
+        outside_temps, flow_temps, heat_demands, time_step_hours
+    )
+    
+    series = {
+        'outside_temperature': outside_temps,
+        'solar_radiation': day_radiation,
+        'heat_demand': heat_demands,
+        'heat_output': heat_outputs,
+        'power_input': power_inputs,
+        'pv_dc_output': pv_dc_day,
+        'pv_ac_output': pv_ac_day,
+        'cop': cop_values,
+        'flow_temperature': flow_temps,
+        'timestamp': list(day_timestamps)
+    }
+    if keep_series:
+        return series
+    return _summarize_series(series)
+
+def _summarize_series(series: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Verdichtet Zeitreihen zu den Kennzahlen, die für die Ergebnisse benötigt werden.
+    
+    Args:
+        series: Zeitreihen wie von _simulate_day geliefert
+        
+    Returns:
+        Dictionary mit Summen, Extremwerten und Anzahl der Zeitschritte
+    """
+    pv_ac_outputs = np.asarray(series['pv_ac_output'], dtype=np.float64)
+    power_inputs = np.asarray(series['power_input'], dtype=np.float64)
+    outside_temps = np.asarray(series['outside_temperature'], dtype=np.float64)
+    cop_values = np.asarray(series['cop'], dtype=np.float64)
+    
+    # Einfache Berechnung des Eigenverbrauchs (könnte detaillierter sein)
+    self_consumption, grid_feed, grid_draw = energy_balance(pv_ac_outputs, power_inputs)
+    
+    # Temperatur-, COP- und PV-Kennzahlen in einem Durchlauf
+    temp_sum, temp_min, temp_max, cop_sum, pv_peak = series_statistics(
+        outside_temps, cop_values, pv_ac_outputs
+    )
+    
+    return {
+        'steps': len(outside_temps),
+        'heat_demand': float(np.sum(series['heat_demand'])),
+        'heat_output': float(np.sum(series['heat_output'])),
+        'power_input': float(power_inputs.sum()),
+        'pv_production': float(pv_ac_outputs.sum()),
+        'self_consumption': float(self_consumption),
+        'grid_feed': float(grid_feed),
+        'grid_draw': float(grid_draw),
+        'outside_temp_sum': float(temp_sum),
+        'outside_temp_min': float(temp_min),
+        'outside_temp_max': float(temp_max),
+        'cop_sum': float(cop_sum),
+        'pv_peak_output': float(pv_peak)
+    }
+
+def _merge_summaries(summaries: List[Dict[str, float]]) -> Dict[str, float]:
+    """
+    Fasst die Kennzahlen einzelner Tage zu Kennzahlen des Gesamtzeitraums zusammen.
+    
+    Args:
+        summaries: Tageskennzahlen in zeitlicher Reihenfolge
+        
+    Returns:
+        Kennzahlen des gesamten Simulationszeitraums
+    """
+    merged = {key: sum(summary[key] for summary in summaries)
+              for key in ('steps', 'heat_demand', 'heat_output', 'power_input',
+                          'pv_production', 'self_consumption', 'grid_feed',
+                          'grid_draw', 'outside_temp_sum', 'cop_sum')}
+    merged['outside_temp_min'] = min(summary['outside_temp_min'] for summary in summaries)
+    merged['outside_temp_max'] = max(summary['outside_temp_max'] for summary in summaries)
+    merged['pv_peak_output'] = max(summary['pv_peak_output'] for summary in summaries)
+    return merged
+
 
 def run_simulation(
     latitude: float = 52.52,
@@ -104,7 +345,8 @@ def run_simulation(
     time_step_minutes: int = 60,
     save_output: bool = False,
     output_file: Optional[str] = None,
-    create_plot: bool = False
+    create_plot: bool = False,
+    n_workers: int = 1
 ) -> Dict[str, Any]:
     """
     Führt eine Energiesystemsimulation mit den angegebenen Parametern durch.
@@ -129,6 +371,7 @@ def run_simulation(
         save_output: Wenn True, werden detaillierte Simulationsergebnisse in einer Datei gespeichert
         output_file: Optionaler Pfad für die Ausgabedatei (Standard: 'simulation_results_{Datum}.csv')
         create_plot: Wenn True, wird ein Plot der Simulationsergebnisse erstellt (nur für kurze Zeiträume sinnvoll)
+        n_workers: Anzahl der Prozesse für die parallele Tagessimulation (1 = sequentiell)
         
     Returns:
         Dictionary mit Simulationsergebnissen:
@@ -158,10 +401,10 @@ def run_simulation(
         inverter_key="SMA_Sunny_Tripower_10" if pv_peak_power <= 10 else "SMA_Sunny_Tripower_15"
     )
     
-    pv_system = PVSystem(
-        config=array_config,
-        location=(latitude, longitude),
-        altitude=34.0  # Standardwert, könnte anhand der Koordinaten genauer bestimmt werden
+    pv_system = _cached_pv_system(
+        astuple(array_config),
+        (latitude, longitude),
+        34.0  # Standardwert, könnte anhand der Koordinaten genauer bestimmt werden
     )
     
     # Wetterdaten
@@ -178,161 +421,152 @@ def run_simulation(
     total_steps = int(simulation_duration * steps_per_day)
     
     # Erstelle Zeitpunkte für die Simulation
-    timestamps = [start + timedelta(minutes=i*time_step_minutes) for i in range(total_steps)]
-    
-    # Ergebnisarrays initialisieren
-    outside_temps = []
-    solar_radiations = []
-    heat_demands = []
-    heat_outputs = []
-    power_inputs = []
-    pv_dc_outputs = []
-    pv_ac_outputs = []
-    cop_values = []
-    flow_temps = []
-    # Liste der tatsächlich verwendeten Zeitpunkte
-    used_timestamps = []
+    timestamps = pd.date_range(start=start, periods=total_steps, freq=f'{time_step_minutes}min').to_pydatetime().tolist()
+    
+    # Zeitschritte innerhalb eines Tages sind für alle Tage gleich und werden
+    # einmalig als Minuten- bzw. Stundenversatz zum Tagesbeginn berechnet
+    minutes_in_day = np.arange(0, 24*60, time_step_minutes)
+    hours_as_float = minutes_in_day / 60.0
+    step_hours = hours_as_float.astype(np.int64)
+    step_minutes = ((hours_as_float - step_hours) * 60).astype(np.int64)
+    step_offsets = (step_hours * 60 + step_minutes).astype('timedelta64[m]')
+    end_datetime64 = np.datetime64(end, 'us')
+    
+    # Vollständige Zeitreihen werden nur für Plot und CSV-Export benötigt,
+    # sonst liefert jeder Tag direkt seine Kennzahlen
+    keep_series = save_output or create_plot
+    
+    # Argumente der einzelnen Simulationstage
+    day_args = []
+    
+    # Wetterdaten einmalig für den gesamten Simulationszeitraum laden,
+    # statt das Wetter-Backend für jeden Tag neu abzufragen
+    weather_df = weather.get_historical_data(location, start, end + timedelta(days=1))
+    missing_columns = [column for column in ('temperature', 'solar_radiation', 'wind_speed')
+                       if column not in weather_df.columns]
+    if missing_columns:
+        raise ValueError(f"Wetterdaten ohne Spalten {missing_columns} für {start_date} bis {end_date}")
+    if weather_df.empty:
+        raise ValueError(f"Keine Wetterdaten für {start_date} bis {end_date} verfügbar")
+    
+    # Spalten einmalig in eine zusammenhängende (3, N)-Matrix überführen:
+    # Zeile 0 = Temperatur, Zeile 1 = Solarstrahlung, Zeile 2 = Windgeschwindigkeit
+    weather_all = np.ascontiguousarray(np.vstack([
+        weather_df['temperature'].to_numpy(dtype=np.float64),
+        weather_df['solar_radiation'].to_numpy(dtype=np.float64),
+        weather_df['wind_speed'].to_numpy(dtype=np.float64)
+    ]))
+    
+    # Stunden seit Simulationsbeginn für jeden Wetterdatenpunkt
+    if 'timestamp' in weather_df.columns:
+        weather_times = pd.to_datetime(weather_df['timestamp'], cache=True)
+        if weather_times.dt.tz is not None:
+            # Lokale Uhrzeit beibehalten, nur die Zeitzoneninformation entfernen
+            weather_times = weather_times.dt.tz_localize(None)
+        hours_since_start = (
+            (weather_times.to_numpy(dtype='datetime64[ns]') - np.datetime64(start, 'ns'))
+            / np.timedelta64(1, 'h')
+        )
+    else:
+        # Fallback: Nehme an, dass Daten stündlich ab Simulationsbeginn vorliegen
+        hours_since_start = np.arange(len(weather_df), dtype=np.float64)
+    
+    # Die Tagesfenster werden per Binärsuche bestimmt, die Zeitachse muss daher
+    # aufsteigend sortiert sein (gleiche Zeitpunkte sind erlaubt)
+    if np.any(np.diff(hours_since_start) < 0):
+        raise ValueError("Zeitstempel der Wetterdaten sind nicht aufsteigend sortiert")
     
     # Pro Tag simulieren
     current_date = start
+    day_index = 0
     while current_date <= end:
-        # Hole Wetterdaten für den aktuellen Tag
-        next_day = current_date + timedelta(days=1)
-        weather_data = weather.get_historical_data(location, current_date, next_day)
+        # Wetterdaten des aktuellen Tages aus dem Gesamtzeitraum herausschneiden
+        day_offset = day_index * 24.0
+        lo = np.searchsorted(hours_since_start, day_offset, side='left')
+        hi = np.searchsorted(hours_since_start, day_offset + 24.0, side='left')
         
         # Debug-Ausgabe zum Verstehen der Struktur der Wetterdaten
-        print(f"\nWetterdaten für {current_date.strftime('%Y-%m-%d')}:")
-        print(f"Shape: {weather_data.shape}, Columns: {weather_data.columns}")
-        print(f"Anzahl der Zeitpunkte: {len(weather_data)}")
+        logger.debug("Wetterdaten für %s: Shape (%d, %d), Columns: %s",
+                     current_date.date(), hi - lo, weather_df.shape[1], list(weather_df.columns))
         
-        # Interpoliere Wetterdaten auf Zeitschritte
-        # Verwende die tatsächlichen Stunden aus den Wetterdaten anstatt eine feste Liste
-        if 'timestamp' in weather_data.columns:
-            # Verwende die Stunden direkt aus den timestamp-Daten
-            data_hours = pd.to_datetime(weather_data['timestamp']).dt.hour.values + pd.to_datetime(weather_data['timestamp']).dt.minute.values / 60.0
-        else:
-            # Fallback: Nehme an, dass Daten stündlich von 0-23 Uhr vorliegen
-            data_hours = np.arange(len(weather_data)) % 24
+        # Stunden des Tages aus den vorab berechneten Zeitpunkten
+        data_hours = hours_since_start[lo:hi] - day_offset
+        day_weather = weather_all[:, lo:hi]
             
         # Debug-Ausgabe für die Stunden
-        print(f"Stunden in den Wetterdaten: {data_hours}")
-        
-        minutes_in_day = np.arange(0, 24*60, time_step_minutes)
-        hours_as_float = minutes_in_day / 60.0
-        
-        # Stelle sicher, dass die Daten die richtige Größe haben, bevor wir interpolieren
-        if len(data_hours) != len(weather_data['temperature']):
-            print(f"WARNUNG: Stunden ({len(data_hours)}) und Temperaturdaten ({len(weather_data['temperature'])}) haben unterschiedliche Längen!")
-            # Verwende nur so viele Datenpunkte, wie in beiden Arrays vorhanden sind
-            min_len = min(len(data_hours), len(weather_data['temperature']))
-            data_hours = data_hours[:min_len]
-            weather_data = weather_data.iloc[:min_len]
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Stunden in den Wetterdaten: %s", data_hours)
         
         # Debug-Ausgabe vor der Interpolation
-        print(f"Interpoliere von {len(data_hours)} Wetterdaten-Punkten auf {len(hours_as_float)} Zeitschritte")
-        
-        # Interpoliere Temperaturen
-        temp_interpolation = np.interp(
-            hours_as_float, 
-            data_hours, 
-            weather_data['temperature']
-        )
+        logger.debug("Interpoliere von %d Wetterdaten-Punkten auf %d Zeitschritte",
+                     len(data_hours), len(hours_as_float))
         
-        # Interpoliere Solarstrahlung
-        radiation_interpolation = np.interp(
-            hours_as_float, 
-            data_hours, 
-            weather_data['solar_radiation']
+        # Temperatur, Solarstrahlung und Wind in einem Durchlauf interpolieren
+        temp_interpolation, radiation_interpolation, wind_interpolation = _interp_rows(
+            hours_as_float,
+            data_hours,
+            day_weather
         )
         
-        # Interpoliere Windgeschwindigkeit
-        wind_interpolation = np.interp(
-            hours_as_float, 
-            data_hours, 
-            weather_data['wind_speed']
-        )
+        # Zeitpunkte des Tages bis einschließlich Simulationsende
+        day_datetime64 = np.datetime64(current_date, 'us') + step_offsets
+        steps_today = int(np.searchsorted(day_datetime64, end_datetime64, side='right'))
+        day_timestamps = day_datetime64[:steps_today].astype(datetime).tolist()
         
-        # Simplifizierten Wärmebedarf basierend auf Außentemperatur berechnen
-        # In der Realität würde hier ein detailliertes Gebäudemodell verwendet
-        heat_demand_daily = []
-        for temp in temp_interpolation:
-            # Einfaches Modell: Heizgrenztemperatur 15°C, darunter linear steigender Bedarf
-            if temp < 15:
-                demand = max(0, (15 - temp) * heated_area * 0.03)  # ~3W/m² pro Kelvin
-            else:
-                demand = 0
-            heat_demand_daily.append(demand)
-        
-        # Simuliere für jeden Zeitschritt des Tages
-        for i, minute in enumerate(minutes_in_day):
-            hour_decimal = minute / 60.0
-            hour = int(hour_decimal)
-            minute_of_hour = int((hour_decimal - hour) * 60)
-            
-            timestamp = current_date.replace(hour=hour, minute=minute_of_hour)
-            if timestamp > end:
-                break
-            
-            outside_temp = temp_interpolation[i]
-            solar_radiation = radiation_interpolation[i]
-            wind_speed = wind_interpolation[i]
-            heat_demand = heat_demand_daily[i] * time_step_hours  # kWh für diesen Zeitschritt
-            
-            # Heat pump simulation
-            flow_temp = heat_pump.calculate_flow_temperature(outside_temp)
-            cop = heat_pump.calculate_cop(outside_temp, flow_temp)
-            heat_output, power_input = heat_pump.get_power_output(
-                outside_temp=outside_temp,
-                flow_temp=flow_temp,
-                demand=heat_demand,
-                time_step=time_step_hours
-            )
-            
-            # PV simulation
-            current_weather = {
-                'ghi': solar_radiation,
-                'dni': solar_radiation * 0.85,  # Vereinfachte DNI
-                'dhi': solar_radiation * 0.15,  # Vereinfachte DHI
-                'temp_air': outside_temp,
-                'wind_speed': wind_speed
-            }
-            
-            dc_power, ac_power = pv_system.calculate_power_output(
-                timestamp, current_weather
-            )
-            
-            # Werte speichern
-            outside_temps.append(outside_temp)
-            solar_radiations.append(solar_radiation)
-            heat_demands.append(heat_demand)
-            heat_outputs.append(heat_output)
-            power_inputs.append(power_input)
-            pv_dc_outputs.append(float(dc_power) if dc_power is not None else 0)
-            pv_ac_outputs.append(float(ac_power) if ac_power is not None else 0)
-            cop_values.append(cop)
-            flow_temps.append(flow_temp)
-            used_timestamps.append(timestamp)
+        day_args.append((
+            day_timestamps,
+            temp_interpolation, radiation_interpolation, wind_interpolation,
+            heated_area, time_step_hours, heat_pump, pv_system, keep_series
+        ))
         
         current_date += timedelta(days=1)
+        day_index += 1
     
-    # Ergebnisse zusammenfassen
-    total_heat_demand = sum(heat_demands)
-    total_heat_output = sum(heat_outputs)
-    total_power_input = sum(power_inputs)
-    total_pv_production = sum(pv_ac_outputs)
+    # Tage sind bei gegebenen Wetterdaten unabhängig voneinander und können
+    # parallel simuliert werden; Pool.map erhält die Reihenfolge der Tage
+    if n_workers > 1 and len(day_args) > 1:
+        with multiprocessing.Pool(processes=min(n_workers, len(day_args))) as pool:
+            daily_results = pool.map(_simulate_day, day_args)
+    else:
+        daily_results = [_simulate_day(args) for args in day_args]
     
-    # Einfache Berechnung des Eigenverbrauchs (könnte detaillierter sein)
-    self_consumption = 0
-    grid_feed = 0
-    grid_draw = 0
-    
-    for pv, hp in zip(pv_ac_outputs, power_inputs):
-        if pv >= hp:
-            self_consumption += hp
-            grid_feed += (pv - hp)
-        else:
-            self_consumption += pv
-            grid_draw += (hp - pv)
+    if keep_series:
+        # Tagesergebnisse in fester Reihenfolge zu zusammenhängenden Arrays zusammenführen
+        def _concat(key: str) -> np.ndarray:
+            return np.concatenate([np.asarray(day[key], dtype=np.float64) for day in daily_results])
+        
+        outside_temps = _concat('outside_temperature')
+        solar_radiations = _concat('solar_radiation')
+        heat_demands = _concat('heat_demand')
+        heat_outputs = _concat('heat_output')
+        power_inputs = _concat('power_input')
+        pv_dc_outputs = _concat('pv_dc_output')
+        pv_ac_outputs = _concat('pv_ac_output')
+        cop_values = _concat('cop')
+        flow_temps = _concat('flow_temperature')
+        # Liste der tatsächlich verwendeten Zeitpunkte
+        used_timestamps = [ts for day in daily_results for ts in day['timestamp']]
+        
+        # Ergebnisse zusammenfassen
+        summary = _summarize_series({
+            'outside_temperature': outside_temps,
+            'heat_demand': heat_demands,
+            'heat_output': heat_outputs,
+            'power_input': power_inputs,
+            'pv_ac_output': pv_ac_outputs,
+            'cop': cop_values
+        })
+    else:
+        # Nur Tageskennzahlen aufsummieren, ohne die Zeitreihen vorzuhalten
+        summary = _merge_summaries(daily_results)
+    
+    total_heat_demand = summary['heat_demand']
+    total_heat_output = summary['heat_output']
+    total_power_input = summary['power_input']
+    total_pv_production = summary['pv_production']
+    self_consumption = summary['self_consumption']
+    grid_feed = summary['grid_feed']
+    grid_draw = summary['grid_draw']
     
     # Energiebilanz
     energy_results = {
@@ -373,52 +607,28 @@ def run_simulation(
             # Konvertiere zu stündlichen Werten für die Visualisierung, falls längere Zeiträume
             plot_indices = np.linspace(0, len(timestamps)-1, min(len(timestamps), 24)).astype(int)
             
-            # Erstelle Plot
-            fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 10))
-            fig.suptitle('Building Energy System Simulation')
-            
             # Zeitachse für Plots
             hours = [i * time_step_hours for i in range(len(plot_indices))]
             
-            # Plot 1: Temperaturen
-            ax1.plot(hours, [outside_temps[i] for i in plot_indices], 'b-', label='Outside Temperature')
-            ax1.plot(hours, [flow_temps[i] for i in plot_indices], 'r-', label='Flow Temperature')
-            ax1.set_xlabel('Hour')
-            ax1.set_ylabel('Temperature (°C)')
-            ax1.legend()
-            ax1.grid(True)
-            
-            # Plot 2: COP und PV-Leistung
-            ax2.plot(hours, [cop_values[i] for i in plot_indices], 'g-', label='Heat Pump COP')
-            ax2.plot(hours, [pv_ac_outputs[i] for i in plot_indices], 'y-', label='PV Power (AC)')
-            ax2.set_xlabel('Hour')
-            ax2.set_ylabel('COP / Power (kW)')
-            ax2.legend()
-            ax2.grid(True)
-            
-            # Plot 3: Wärmepumpenleistung
-            ax3.plot(hours, [heat_outputs[i] for i in plot_indices], 'r-', label='Heat Output')
-            ax3.plot(hours, [power_inputs[i] for i in plot_indices], 'b-', label='Power Input')
-            ax3.plot(hours, [heat_demands[i] for i in plot_indices], 'k--', label='Heat Demand')
-            ax3.set_xlabel('Hour')
-            ax3.set_ylabel('Power (kW)')
-            ax3.legend()
-            ax3.grid(True)
-            
-            # Plot 4: Solarstrahlung
-            ax4.plot(hours, [solar_radiations[i] for i in plot_indices], 'y-', label='Global Radiation')
-            ax4.set_xlabel('Hour')
-            ax4.set_ylabel('Irradiance (W/m²)')
-            ax4.legend()
-            ax4.grid(True)
+            # Erstelle Plot
+            fig, axes = _get_figure(2, 2, (15, 10))
+            _render_dashboard(fig, axes, hours, {
+                'outside_temperature': outside_temps[plot_indices],
+                'flow_temperature': flow_temps[plot_indices],
+                'cop': cop_values[plot_indices],
+                'pv_ac_output': pv_ac_outputs[plot_indices],
+                'heat_output': heat_outputs[plot_indices],
+                'power_input': power_inputs[plot_indices],
+                'heat_demand': heat_demands[plot_indices],
+                'solar_radiation': solar_radiations[plot_indices]
+            }, 'Building Energy System Simulation')
             
             # Speichere Plot
             output_dir = Path(__file__).parent.parent / 'output'
             output_dir.mkdir(exist_ok=True)
             
             plot_filename = output_dir / f'simulation_plot_{start_date}_to_{end_date}.png'
-            plt.savefig(plot_filename)
-            plt.close()
+            fig.savefig(plot_filename, dpi=100)
             print(f"Simulationsplot gespeichert unter: {plot_filename}")
         else:
             # Erstelle zusammengefassten Tagesplot für längere Simulationen
@@ -431,7 +641,7 @@ def run_simulation(
                 'pv_output': pv_ac_outputs,
                 'temperature': outside_temps
             })
-            daily_data['date'] = pd.to_datetime(daily_data['timestamp']).dt.date
+            daily_data['date'] = pd.to_datetime(daily_data['timestamp'], cache=True).dt.date
             daily_agg = daily_data.groupby('date').agg({
                 'heat_demand': 'sum',
                 'heat_output': 'sum',
@@ -441,7 +651,8 @@ def run_simulation(
             })
             
             # Plot der täglichen Werte
-            fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
+            fig, axes = _get_figure(2, 1, (12, 10))
+            ax1, ax2 = axes[:, 0]
             fig.suptitle('Daily Energy Balance')
             
             # Plot 1: Energie
@@ -474,8 +685,7 @@ def run_simulation(
             output_dir.mkdir(exist_ok=True)
             
             plot_filename = output_dir / f'daily_energy_balance_{start_date}_to_{end_date}.png'
-            plt.savefig(plot_filename)
-            plt.close()
+            fig.savefig(plot_filename, dpi=100)
             print(f"Tägliche Energiebilanz gespeichert unter: {plot_filename}")
     
     # Wenn gewünscht, speichere detaillierte Zeitreihen in CSV
@@ -501,7 +711,7 @@ def run_simulation(
             'power_input': power_inputs,
             'pv_dc_output': pv_dc_outputs,
             'pv_ac_output': pv_ac_outputs,
-        })
+        }, copy=False)  # Spalten liegen bereits als NumPy-Arrays vor
         
         # Speichere CSV
         df_results.to_csv(output_file, index=False)
@@ -513,11 +723,11 @@ def run_simulation(
         "costs": costs,
         "emissions": emissions,
         "time_series_summary": {
-            "outside_temp_avg": sum(outside_temps) / len(outside_temps),
-            "outside_temp_min": min(outside_temps),
-            "outside_temp_max": max(outside_temps),
-            "cop_avg": sum(cop_values) / len(cop_values),
-            "pv_peak_output": max(pv_ac_outputs),
+            "outside_temp_avg": summary['outside_temp_sum'] / summary['steps'],
+            "outside_temp_min": summary['outside_temp_min'],
+            "outside_temp_max": summary['outside_temp_max'],
+            "cop_avg": summary['cop_sum'] / summary['steps'],
+            "pv_peak_output": summary['pv_peak_output'],
         },
         "output_file": str(output_file) if save_output else None
     }
@@ -580,46 +790,22 @@ def simulate_day():
         pv_ac_output[i] = float(ac_power) if ac_power is not None else 0
     
     # Plot results
-    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 10))
-    fig.suptitle('Building Energy System Simulation over 24 Hours')
-    
-    # Plot 1: Temperatures
-    ax1.plot(hours, outside_temps, 'b-', label='Outside Temperature')
-    ax1.plot(hours, flow_temps, 'r-', label='Flow Temperature')
-    ax1.set_xlabel('Hour')
-    ax1.set_ylabel('Temperature (°C)')
-    ax1.legend()
-    ax1.grid(True)
-    
-    # Plot 2: COP and PV Power
-    ax2.plot(hours, cop_values, 'g-', label='Heat Pump COP')
-    ax2.plot(hours, pv_ac_output, 'y-', label='PV Power (AC)')
-    ax2.set_xlabel('Hour')
-    ax2.set_ylabel('COP / Power (kW)')
-    ax2.legend()
-    ax2.grid(True)
-    
-    # Plot 3: Heat Pump Power
-    ax3.plot(hours, heat_output, 'r-', label='Heat Output')
-    ax3.plot(hours, power_input, 'b-', label='Power Input')
-    ax3.plot(hours, heat_demand, 'k--', label='Heat Demand')
-    ax3.set_xlabel('Hour')
-    ax3.set_ylabel('Power (kW)')
-    ax3.legend()
-    ax3.grid(True)
-    
-    # Plot 4: Solar Radiation
-    ax4.plot(hours, weather_data['solar_radiation'], 'y-', label='Global Radiation')
-    ax4.set_xlabel('Hour')
-    ax4.set_ylabel('Irradiance (W/m²)')
-    ax4.legend()
-    ax4.grid(True)
+    fig, axes = _get_figure(2, 2, (15, 10))
+    _render_dashboard(fig, axes, hours, {
+        'outside_temperature': outside_temps,
+        'flow_temperature': flow_temps,
+        'cop': cop_values,
+        'pv_ac_output': pv_ac_output,
+        'heat_output': heat_output,
+        'power_input': power_input,
+        'heat_demand': heat_demand,
+        'solar_radiation': weather_data['solar_radiation']
+    }, 'Building Energy System Simulation over 24 Hours')
     
     # Save plot
     output_dir = Path(__file__).parent.parent / 'output'
     output_dir.mkdir(exist_ok=True)
-    plt.savefig(output_dir / 'energy_system_simulation.png')
-    plt.close()
+    fig.savefig(output_dir / 'energy_system_simulation.png', dpi=100)
 
 if __name__ == '__main__':
     # Beispiel für eine Simulation
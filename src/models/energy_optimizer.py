@@ -2,6 +2,8 @@ from typing import List, Optional, Tuple, Dict
 import numpy as np
 import tensorflow as tf
 from tensorflow.keras import layers, models
+from src.models.onnx_runtime import OnnxSession, export_onnx
+from src.models.quantization import precision_policy, quantized_converter
 import pandas as pd
 from dataclasses import dataclass
 
@@ -29,6 +31,9 @@ class OptimizationConstraints:
 class EnergyFlowOptimizer:
     """Optimiert die Energieflüsse im System nach VDI 4655."""
     
+    # Namen der Ausgabeschichten in der Reihenfolge der Steuerungssignale
+    _OUTPUT_NAMES = ['heat_pump', 'storage', 'pv_battery']
+    
     def __init__(self):
         self.model: Optional[models.Model] = None
         self.feature_columns: List[str] = [
@@ -38,35 +43,54 @@ class EnergyFlowOptimizer:
         ]
         self.constraints = OptimizationConstraints()
         
-    def build_model(self, input_shape: Tuple[int, int]):
+        # Wiederverwendeter Eingabepuffer (1, 24h, Features) für die Inferenz
+        self._input_buf = np.empty((1, 24, len(self.feature_columns)), dtype=np.float32)
+        
+        # TFLite-Modell und Interpreter für schnelle Einzelvorhersagen
+        self._tflite_model: Optional[bytes] = None
+        self._tflite_interpreter = None
+        self._tflite_input_index: Optional[int] = None
+        self._tflite_input_shape: Tuple[int, ...] = ()
+        self._tflite_output_indices: List[int] = []
+        
+        # ONNX-Runtime-Sitzung für den Einsatz ohne TensorFlow-Laufzeit
+        self._onnx_session: Optional[OnnxSession] = None
+        
+    def build_model(self, input_shape: Tuple[int, int], mixed_precision: Optional[bool] = None):
         """
         Erweiterte Modellarchitektur für Energieflussoptimierung.
         
         Args:
             input_shape: Form der Eingabedaten (Zeitschritte, Features)
+            mixed_precision: bfloat16-Mixed-Precision verwenden; None entscheidet
+                anhand der Hardware (AVX-512-BF16, AMX oder GPU)
         """
-        # Eingabeschicht
-        inputs = layers.Input(shape=input_shape)
+        # Mixed Precision für die inneren Schichten; die Ausgabeschichten bleiben
+        # float32, damit der Loss numerisch stabil ist
+        with precision_policy(mixed_precision):
+            # Eingabeschicht
+            inputs = layers.Input(shape=input_shape)
         
-        # Encoder (Zeitreihenverarbeitung)
-        x = layers.LSTM(128, return_sequences=True)(inputs)
-        x = layers.LSTM(64)(x)
+            # Encoder (Zeitreihenverarbeitung); ausgerollt, damit die
+            # INT8-Quantisierung greift
+            x = layers.LSTM(128, return_sequences=True, unroll=True)(inputs)
+            x = layers.LSTM(64, unroll=True)(x)
         
-        # Verzweigung für verschiedene Optimierungsziele
-        heat_pump_control = layers.Dense(32, activation='relu')(x)
-        heat_pump_control = layers.Dense(1, activation='sigmoid', name='heat_pump')(heat_pump_control)
+            # Verzweigung für verschiedene Optimierungsziele
+            heat_pump_control = layers.Dense(32, activation='relu')(x)
+            heat_pump_control = layers.Dense(1, activation='sigmoid', name='heat_pump', dtype='float32')(heat_pump_control)
         
-        storage_control = layers.Dense(32, activation='relu')(x)
-        storage_control = layers.Dense(1, activation='sigmoid', name='storage')(storage_control)
+            storage_control = layers.Dense(32, activation='relu')(x)
+            storage_control = layers.Dense(1, activation='sigmoid', name='storage', dtype='float32')(storage_control)
         
-        pv_battery_control = layers.Dense(32, activation='relu')(x)
-        pv_battery_control = layers.Dense(1, activation='sigmoid', name='pv_battery')(pv_battery_control)
+            pv_battery_control = layers.Dense(32, activation='relu')(x)
+            pv_battery_control = layers.Dense(1, activation='sigmoid', name='pv_battery', dtype='float32')(pv_battery_control)
         
-        # Kombiniertes Modell
-        self.model = models.Model(
-            inputs=inputs,
-            outputs=[heat_pump_control, storage_control, pv_battery_control]
-        )
+            # Kombiniertes Modell
+            self.model = models.Model(
+                inputs=inputs,
+                outputs=[heat_pump_control, storage_control, pv_battery_control]
+            )
         
         # Multi-Objective Loss
         self.model.compile(
@@ -83,6 +107,8 @@ class EnergyFlowOptimizer:
             },
             metrics=['mae']
         )
+        self._set_tflite_model(None)
+        self._onnx_session = None
     
     def optimize_energy_flows(self, 
                             state: SystemState,
@@ -103,7 +129,12 @@ class EnergyFlowOptimizer:
         input_data = self._prepare_optimization_input(state, weather_forecast)
         
         # Vorhersage der optimalen Steuerungssignale
-        heat_pump, storage, pv_battery = self.model.predict(input_data)
+        if self._onnx_session is not None:
+            heat_pump, storage, pv_battery = self._onnx_session.run(input_data, self._OUTPUT_NAMES)
+        elif self._tflite_model is not None:
+            heat_pump, storage, pv_battery = self.predict_tflite(input_data)
+        else:
+            heat_pump, storage, pv_battery = self.model.predict(input_data)
         
         # Anwendung der Betriebsgrenzen (nach deutschen Normen)
         controls = self._apply_operational_constraints(
@@ -112,37 +143,147 @@ class EnergyFlowOptimizer:
         
         return controls
     
+    def to_tflite(self) -> bytes:
+        """
+        Konvertiert das Modell in ein TFLite-Modell.
+        
+        Danach berechnet optimize_energy_flows die Steuerungssignale über den
+        TFLite-Interpreter, der bei einzelnen Eingaben deutlich weniger
+        Overhead hat als model.predict.
+        
+        Returns:
+            Serialisiertes TFLite-Modell
+        """
+        if self.model is None:
+            raise ValueError("Modell wurde noch nicht erstellt")
+        
+        converter = tf.lite.TFLiteConverter.from_keras_model(self.model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        self._set_tflite_model(converter.convert())
+        return self._tflite_model
+    
+    def predict_tflite(self, input_data: np.ndarray) -> List[np.ndarray]:
+        """
+        Berechnet die Steuerungssignale mit dem TFLite-Interpreter.
+        
+        Args:
+            input_data: Eingabedaten der Form (Batch, Zeitschritte, Features)
+            
+        Returns:
+            Liste der Ausgaben in der Reihenfolge heat_pump, storage, pv_battery
+        """
+        if self._tflite_model is None:
+            raise ValueError("Modell wurde noch nicht nach TFLite konvertiert")
+        
+        if self._tflite_interpreter is None:
+            interpreter = tf.lite.Interpreter(model_content=self._tflite_model)
+            interpreter.allocate_tensors()
+            
+            # Ein- und Ausgänge über die Signatur den Namen der Ausgabeschichten zuordnen
+            runner = interpreter.get_signature_runner()
+            input_details = next(iter(runner.get_input_details().values()))
+            self._tflite_input_index = input_details['index']
+            self._tflite_input_shape = tuple(input_details['shape'])
+            output_details = runner.get_output_details()
+            self._tflite_output_indices = [
+                output_details[name]['index'] for name in self._OUTPUT_NAMES
+            ]
+            self._tflite_interpreter = interpreter
+        
+        interpreter = self._tflite_interpreter
+        input_data = np.asarray(input_data, dtype=np.float32)
+        if self._tflite_input_shape != input_data.shape:
+            interpreter.resize_tensor_input(self._tflite_input_index, input_data.shape)
+            interpreter.allocate_tensors()
+            self._tflite_input_shape = input_data.shape
+        
+        # Eingabe direkt in den Tensorspeicher des Interpreters schreiben
+        interpreter.tensor(self._tflite_input_index)()[...] = input_data
+        interpreter.invoke()
+        return [interpreter.get_tensor(index) for index in self._tflite_output_indices]
+    
+    def quantize(self, representative_data: np.ndarray) -> bytes:
+        """
+        Konvertiert das Modell mit Post-Training-Quantisierung nach TFLite.
+        
+        Auf CPUs mit INT8-Beschleunigung (VNNI, NEON) wird voll auf INT8
+        quantisiert, sonst auf float16-Gewichte ausgewichen.
+        
+        Args:
+            representative_data: Eingabedaten wie von _prepare_optimization_input geliefert
+            
+        Returns:
+            Serialisiertes TFLite-Modell, das anschließend von optimize_energy_flows() genutzt wird
+        """
+        if self.model is None:
+            raise ValueError("Modell wurde noch nicht erstellt")
+        
+        self._set_tflite_model(quantized_converter(self.model, representative_data).convert())
+        return self._tflite_model
+    
+    def to_onnx(self, path: str, quantize: bool = False) -> str:
+        """
+        Exportiert das Modell nach ONNX und lädt es für optimize_energy_flows().
+        
+        Args:
+            path: Zielpfad der ONNX-Datei
+            quantize: Gewichte zusätzlich dynamisch auf INT8 quantisieren
+            
+        Returns:
+            Pfad der geschriebenen Datei
+        """
+        if self.model is None:
+            raise ValueError("Modell wurde noch nicht erstellt")
+        
+        export_onnx(self.model, path, quantize=quantize)
+        self.load_onnx(path)
+        return path
+    
+    def load_onnx(self, path: str):
+        """
+        Lädt ein exportiertes ONNX-Modell; optimize_energy_flows() nutzt danach ONNX Runtime.
+        
+        Args:
+            path: Pfad der ONNX-Datei
+        """
+        self._onnx_session = OnnxSession(path)
+    
+    def _set_tflite_model(self, tflite_model: Optional[bytes]):
+        """Setzt das TFLite-Modell und verwirft den zugehörigen Interpreter."""
+        self._tflite_model = tflite_model
+        self._tflite_interpreter = None
+    
     def _prepare_optimization_input(self,
                                  state: SystemState,
                                  weather_forecast: pd.DataFrame) -> np.ndarray:
-        """Bereitet Daten für die Optimierung vor."""
-        # Kombiniere Zustandsdaten mit Wettervorhersage
-        data = []
-        # Begrenze auf genau 24h
-        for _, weather in weather_forecast.head(24).iterrows():
-            features = [
-                weather['temperature'],
-                weather['solar_radiation'],
-                weather['wind_speed'],
-                state.building_temp,
-                state.dhw_temp,
-                state.pv_power,
-                state.battery_soc,
-                state.heat_storage_temp
-            ]
-            data.append(features)
-        
-        # Stelle sicher, dass genau 24 Zeitschritte vorhanden sind
-        if len(data) < 24:
-            # Fülle fehlende Daten mit dem letzten bekannten Wert
-            last_data = data[-1]
-            while len(data) < 24:
-                data.append(last_data[:])
-        elif len(data) > 24:
-            # Kürze auf 24 Stunden
-            data = data[:24]
-        
-        return np.array([data])  # Shape: (1, 24, 8)
+        """
+        Bereitet Daten für die Optimierung vor.
+        
+        Die Daten werden in den wiederverwendeten Eingabepuffer geschrieben;
+        der Rückgabewert wird beim nächsten Aufruf überschrieben.
+        """
+        data = self._input_buf[0]
+        
+        # Wettervorhersage, begrenzt auf genau 24h
+        weather = weather_forecast.head(24)[
+            ['temperature', 'solar_radiation', 'wind_speed']
+        ].to_numpy(dtype=np.float32)
+        data[:len(weather), :3] = weather
+        
+        # Stelle sicher, dass genau 24 Zeitschritte vorhanden sind;
+        # fehlende Daten werden mit dem letzten bekannten Wert aufgefüllt
+        data[len(weather):, :3] = weather[-1]
+        
+        # Zustandsdaten sind für alle Zeitschritte gleich
+        data[:, 3:] = (
+            state.building_temp,
+            state.dhw_temp,
+            state.pv_power,
+            state.battery_soc,
+            state.heat_storage_temp
+        )
+        
+        return self._input_buf  # Shape: (1, 24, 8)
     
     def _apply_operational_constraints(self,
                                     heat_pump: float,
@@ -150,26 +291,56 @@ class EnergyFlowOptimizer:
                                     pv_battery: float,
                                     state: SystemState) -> Dict[str, float]:
         """Wendet Betriebsgrenzen nach deutschen Normen an."""
-        controls = {}
+        controls = self.apply_operational_constraints(
+            heat_pump, storage, pv_battery,
+            state.building_temp, state.dhw_temp, state.battery_soc
+        )
+        return {name: value.item() for name, value in controls.items()}
+    
+    def apply_operational_constraints(self,
+                                      heat_pump: np.ndarray,
+                                      storage: np.ndarray,
+                                      pv_battery: np.ndarray,
+                                      building_temps: np.ndarray,
+                                      dhw_temps: np.ndarray,
+                                      battery_socs: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Wendet Betriebsgrenzen nach deutschen Normen auf viele Zustände an.
         
-        # Wärmepumpensteuerung (VDI 4645)
-        if state.building_temp < self.constraints.min_room_temp:
-            controls['heat_pump'] = 1.0  # Maximale Heizleistung
-        elif state.building_temp > self.constraints.max_room_temp:
-            controls['heat_pump'] = 0.0  # Heizung aus
-        else:
-            controls['heat_pump'] = heat_pump
+        Die Grenzen werden ohne Verzweigungen über np.where ausgewertet, sodass
+        ganze Batches von Kandidatenzuständen auf einmal verarbeitet werden.
+        
+        Args:
+            heat_pump: Rohe Steuersignale der Wärmepumpe (0-1)
+            storage: Rohe Steuersignale des Warmwasserspeichers (0-1)
+            pv_battery: Rohe Steuersignale der Batterieladung (0-1)
+            building_temps: Gebäudetemperaturen in °C
+            dhw_temps: Warmwassertemperaturen in °C
+            battery_socs: Batterieladezustände in %
+            
+        Returns:
+            Dict mit Steuerungssignalen als Arrays
+        """
+        building_temps = np.asarray(building_temps)
+        
+        # Wärmepumpensteuerung (VDI 4645): unter Mindesttemperatur maximale
+        # Heizleistung, über Höchsttemperatur Heizung aus
+        heat_pump_control = np.where(
+            building_temps < self.constraints.min_room_temp, 1.0,
+            np.where(building_temps > self.constraints.max_room_temp, 0.0, heat_pump)
+        )
         
         # Warmwasserspeicher (DVGW W551, DIN 4753)
-        if state.dhw_temp < self.constraints.min_dhw_temp:
-            controls['dhw_heating'] = 1.0
-        else:
-            controls['dhw_heating'] = storage
+        dhw_control = np.where(np.asarray(dhw_temps) < self.constraints.min_dhw_temp, 1.0, storage)
         
         # PV-Batterie-Steuerung
-        controls['battery_charging'] = pv_battery if state.battery_soc < 100 else 0.0
+        battery_control = np.where(np.asarray(battery_socs) < 100, pv_battery, 0.0)
         
-        return controls
+        return {
+            'heat_pump': heat_pump_control,
+            'dhw_heating': dhw_control,
+            'battery_charging': battery_control
+        }
     
     def calculate_cop_based_operation(self,
                                    outside_temp: float,
@@ -2,6 +2,8 @@ from typing import List, Optional, Tuple
 import numpy as np
 import tensorflow as tf
 from tensorflow.keras import layers, models
+from src.models.onnx_runtime import OnnxSession, export_onnx
+from src.models.quantization import precision_policy, quantized_converter
 import pandas as pd
 
 
@@ -14,39 +16,78 @@ class EnergyPredictor:
         self.target_scaler = None
         self.sequence_length = 24  # 24 Stunden Sequenzlänge
         
-    def build_model(self, input_shape: Tuple[int, int]):
+        # TFLite-Modell und Interpreter für schnelle Einzelvorhersagen
+        self._tflite_model: Optional[bytes] = None
+        self._interpreter = None
+        self._input_details: Optional[dict] = None
+        self._output_details: Optional[dict] = None
+        
+        # Mit XLA kompilierte Inferenzfunktion für einzelne Sequenzen und das
+        # Modell, für das sie erstellt wurde (siehe _inference_function)
+        self._infer = None
+        self._infer_model: Optional[models.Model] = None
+        
+        # ONNX-Runtime-Sitzung für den Einsatz ohne TensorFlow-Laufzeit
+        self._onnx_session: Optional[OnnxSession] = None
+        
+    def build_model(self, input_shape: Tuple[int, int], mixed_precision: Optional[bool] = None):
         """
         Erstellt die Architektur des neuronalen Netzwerks.
         
         Args:
             input_shape: Form der Eingabedaten (Zeitschritte, Features)
+            mixed_precision: bfloat16-Mixed-Precision verwenden; None entscheidet
+                anhand der Hardware (AVX-512-BF16, AMX oder GPU)
         """
-        self.model = models.Sequential([
-            # Input Layer explizit definieren
-            layers.Input(shape=input_shape),
+        # Mixed Precision für die inneren Schichten; die Ausgabeschicht bleibt
+        # float32, damit der Loss numerisch stabil ist
+        with precision_policy(mixed_precision):
+            self.model = models.Sequential([
+                # Input Layer explizit definieren
+                layers.Input(shape=input_shape),
             
-            # Bidirektionales LSTM für Zeitreihenanalyse
-            layers.Bidirectional(
-                layers.LSTM(64, return_sequences=True)
-            ),
-            layers.Dropout(0.2),
+                # Kausale 1D-Faltungen für Zeitreihenanalyse; anders als LSTMs
+                # über alle Zeitschritte parallel berechenbar und gut quantisierbar
+                layers.Conv1D(64, 3, padding='causal', activation='relu'),
+                layers.Dropout(0.2),
             
-            # Zweite LSTM-Schicht für tieferes Lernen
-            layers.Bidirectional(layers.LSTM(32)),
-            layers.Dropout(0.2),
+                # Zweite Faltungsschicht für tieferes Lernen
+                layers.Conv1D(64, 3, padding='causal', activation='relu'),
+                layers.GlobalAveragePooling1D(),
+                layers.Dropout(0.2),
             
-            # Dense Layers für die Vorhersage
-            layers.Dense(64, activation='relu'),
-            layers.BatchNormalization(),
-            layers.Dense(32, activation='relu'),
-            layers.Dense(1)  # Vorhersage des Energiebedarfs
-        ])
+                # Dense Layers für die Vorhersage
+                layers.Dense(64, activation='relu'),
+                layers.BatchNormalization(),
+                layers.Dense(32, activation='relu'),
+                layers.Dense(1, dtype='float32')  # Vorhersage des Energiebedarfs
+            ])
         
         self.model.compile(
             optimizer='adam',
             loss='mse',
             metrics=['mae']
         )
+        self._set_tflite_model(None)
+        self._onnx_session = None
+    
+    def _inference_function(self):
+        """
+        Inferenzfunktion für das aktuelle Keras-Modell.
+        
+        Ohne den Overhead von model.predict; XLA fasst die Schichten zu wenigen
+        Kernels zusammen. Die Funktion wird beim ersten Bedarf erstellt und neu
+        erzeugt, sobald self.model ersetzt wurde, z. B. durch ein geladenes Modell.
+        """
+        if self._infer is None or self._infer_model is not self.model:
+            model = self.model
+            self._infer = tf.function(
+                lambda x: model(x, training=False),
+                jit_compile=True,
+                input_signature=[tf.TensorSpec([None, None, None], tf.float32)]
+            )
+            self._infer_model = model
+        return self._infer
     
     def prepare_sequences(self, data: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -59,18 +100,20 @@ class EnergyPredictor:
             X: Sequenzen der Features
             y: Zielvariablen
         """
-        sequences = []
-        targets = []
+        values = data.to_numpy(dtype=np.float32)
+        targets = data['energy_demand'].to_numpy(dtype=np.float32)[self.sequence_length:]
         
-        for i in range(len(data) - self.sequence_length):
-            # Erstelle Sequenz der Länge sequence_length
-            sequence = data.iloc[i:i + self.sequence_length]
-            target = data.iloc[i + self.sequence_length]['energy_demand']
-            
-            sequences.append(sequence.values)
-            targets.append(target)
-            
-        return np.array(sequences), np.array(targets)
+        if len(targets) == 0:
+            return np.empty((0, self.sequence_length, values.shape[1]), dtype=np.float32), targets
+        
+        # Alle Sequenzen der Länge sequence_length als Sicht auf die Daten;
+        # die letzte Sequenz hat kein Ziel mehr und entfällt
+        windows = np.lib.stride_tricks.sliding_window_view(
+            values, (self.sequence_length, values.shape[1])
+        )[:-1, 0]
+        
+        # Zusammenhängende Kopie für das Training
+        return np.ascontiguousarray(windows), targets
     
     def train(self, 
              train_data: pd.DataFrame,
@@ -106,6 +149,14 @@ class EnergyPredictor:
             verbose=1
         )
         
+        # Zuvor konvertierte TFLite-/ONNX-Modelle sind nach dem Training veraltet
+        self._set_tflite_model(None)
+        self._onnx_session = None
+        
+        # Inferenzfunktion einmal aufrufen, damit die Kompilierung nicht in
+        # die erste Vorhersage fällt
+        self._inference_function()(tf.zeros((1,) + X.shape[1:], dtype=tf.float32))
+        
         return history
     
     def predict(self, input_sequence: np.ndarray) -> np.ndarray:
@@ -118,14 +169,138 @@ class EnergyPredictor:
         Returns:
             Vorhersage des Energiebedarfs
         """
+        # Eingaben als zusammenhängendes float32, damit Keras/TFLite nicht erneut kopieren
+        input_sequence = np.ascontiguousarray(input_sequence, dtype=np.float32)
+        
+        # Geladenes ONNX-Modell hat Vorrang und benötigt kein Keras-Modell
+        if self._onnx_session is not None:
+            if input_sequence.ndim == 2:
+                input_sequence = np.expand_dims(input_sequence, axis=0)
+            return self._onnx_session.run(input_sequence)[0]
+        
         if self.model is None:
             raise ValueError("Modell wurde noch nicht trainiert")
         
+        # Nach der Konvertierung über den TFLite-Interpreter vorhersagen
+        if self._tflite_model is not None:
+            return self.predict_tflite(input_sequence)
+        
         # Reshape für die Vorhersage
         if len(input_sequence.shape) == 2:
             input_sequence = np.expand_dims(input_sequence, axis=0)
             
-        return self.model.predict(input_sequence)
+        return self._inference_function()(tf.constant(input_sequence)).numpy()
+    
+    def to_tflite(self) -> bytes:
+        """
+        Konvertiert das trainierte Modell in ein TFLite-Modell.
+        
+        Danach laufen Vorhersagen über den TFLite-Interpreter, der bei
+        einzelnen Sequenzen deutlich weniger Overhead hat als model.predict.
+        
+        Returns:
+            Serialisiertes TFLite-Modell
+        """
+        if self.model is None:
+            raise ValueError("Modell wurde noch nicht trainiert")
+        
+        converter = tf.lite.TFLiteConverter.from_keras_model(self.model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        self._set_tflite_model(converter.convert())
+        return self._tflite_model
+    
+    def predict_tflite(self, input_sequence: np.ndarray) -> np.ndarray:
+        """
+        Macht eine Vorhersage mit dem TFLite-Interpreter.
+        
+        Args:
+            input_sequence: Sequenz oder Batch von Sequenzen der Eingabedaten
+            
+        Returns:
+            Vorhersage des Energiebedarfs
+        """
+        if self._tflite_model is None:
+            raise ValueError("Modell wurde noch nicht nach TFLite konvertiert")
+        
+        if input_sequence.ndim == 2:
+            input_sequence = np.expand_dims(input_sequence, axis=0)
+        
+        interpreter = self._get_interpreter()
+        
+        # Eingabetensor nur bei geänderter Batch-Größe neu anlegen
+        if tuple(self._input_details['shape']) != input_sequence.shape:
+            interpreter.resize_tensor_input(self._input_details['index'], input_sequence.shape)
+            interpreter.allocate_tensors()
+            self._input_details = interpreter.get_input_details()[0]
+            self._output_details = interpreter.get_output_details()[0]
+        
+        interpreter.set_tensor(
+            self._input_details['index'],
+            input_sequence.astype(self._input_details['dtype'], copy=False)
+        )
+        interpreter.invoke()
+        return interpreter.get_tensor(self._output_details['index'])
+    
+    def quantize(self, representative_data: np.ndarray) -> bytes:
+        """
+        Konvertiert das Modell mit Post-Training-Quantisierung nach TFLite.
+        
+        Auf CPUs mit INT8-Beschleunigung (VNNI, NEON) wird voll auf INT8
+        quantisiert, sonst auf float16-Gewichte ausgewichen.
+        
+        Args:
+            representative_data: Eingabesequenzen wie von prepare_sequences geliefert
+            
+        Returns:
+            Serialisiertes TFLite-Modell, das anschließend von predict() genutzt wird
+        """
+        if self.model is None:
+            raise ValueError("Modell wurde noch nicht trainiert")
+        
+        self._set_tflite_model(quantized_converter(self.model, representative_data).convert())
+        return self._tflite_model
+    
+    def to_onnx(self, path: str, quantize: bool = False) -> str:
+        """
+        Exportiert das trainierte Modell nach ONNX und lädt es für predict().
+        
+        Args:
+            path: Zielpfad der ONNX-Datei
+            quantize: Gewichte zusätzlich dynamisch auf INT8 quantisieren
+            
+        Returns:
+            Pfad der geschriebenen Datei
+        """
+        if self.model is None:
+            raise ValueError("Modell wurde noch nicht trainiert")
+        
+        export_onnx(self.model, path, quantize=quantize)
+        self.load_onnx(path)
+        return path
+    
+    def load_onnx(self, path: str):
+        """
+        Lädt ein exportiertes ONNX-Modell; predict() nutzt danach ONNX Runtime.
+        
+        Args:
+            path: Pfad der ONNX-Datei
+        """
+        self._onnx_session = OnnxSession(path)
+    
+    def _set_tflite_model(self, tflite_model: Optional[bytes]):
+        """Setzt das TFLite-Modell und verwirft den zugehörigen Interpreter."""
+        self._tflite_model = tflite_model
+        self._interpreter = None
+    
+    def _get_interpreter(self):
+        """Erstellt den TFLite-Interpreter beim ersten Aufruf und hält ihn vor."""
+        if self._interpreter is None:
+            interpreter = tf.lite.Interpreter(model_content=self._tflite_model)
+            interpreter.allocate_tensors()
+            self._input_details = interpreter.get_input_details()[0]
+            self._output_details = interpreter.get_output_details()[0]
+            self._interpreter = interpreter
+        return self._interpreter
     
     def evaluate(self, test_data: pd.DataFrame) -> dict:
         """
@@ -0,0 +1,84 @@
+"""
+Export der Keras-Modelle nach ONNX und Inferenz mit ONNX Runtime.
+
+ONNX Runtime hat pro Aufruf deutlich weniger Overhead als Keras und eignet
+sich für den Einsatz trainierter Modelle ohne TensorFlow-Laufzeit.
+"""
+
+import os
+from typing import List, Optional
+
+import numpy as np
+import tensorflow as tf
+
+try:
+    import onnx
+    import onnxruntime as ort
+    import tf2onnx
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+# ONNX-Opset für den Export
+ONNX_OPSET = 15
+
+
+def export_onnx(model: tf.keras.Model, path: str, quantize: bool = False) -> str:
+    """
+    Exportiert ein Keras-Modell als ONNX-Datei.
+
+    Args:
+        model: Trainiertes Keras-Modell
+        path: Zielpfad der ONNX-Datei
+        quantize: Gewichte zusätzlich dynamisch auf INT8 quantisieren
+
+    Returns:
+        Pfad der geschriebenen Datei
+    """
+    if not ONNX_AVAILABLE:
+        raise ImportError("ONNX-Export benötigt tf2onnx, onnx und onnxruntime")
+
+    input_signature = (
+        tf.TensorSpec((None,) + tuple(model.input_shape[1:]), tf.float32, name='input'),
+    )
+    onnx_model, _ = tf2onnx.convert.from_keras(model, input_signature=input_signature, opset=ONNX_OPSET)
+
+    if not quantize:
+        onnx.save(onnx_model, path)
+        return path
+
+    # Quantisierung arbeitet auf Dateien: float32-Modell zwischenspeichern
+    float_path = f"{path}.float32"
+    onnx.save(onnx_model, float_path)
+    try:
+        quantize_dynamic(float_path, path, weight_type=QuantType.QInt8)
+    finally:
+        os.remove(float_path)
+    return path
+
+
+class OnnxSession:
+    """ONNX-Runtime-Sitzung für ein exportiertes Modell."""
+
+    def __init__(self, path: str):
+        if not ONNX_AVAILABLE:
+            raise ImportError("ONNX-Inferenz benötigt onnxruntime")
+
+        self.session = ort.InferenceSession(path, providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def run(self, input_data: np.ndarray, output_names: Optional[List[str]] = None) -> List[np.ndarray]:
+        """
+        Führt das Modell für die Eingabedaten aus.
+
+        Args:
+            input_data: Eingabedaten der Form (Batch, Zeitschritte, Features)
+            output_names: Namen der gewünschten Ausgaben, None für alle
+
+        Returns:
+            Liste der Ausgaben
+        """
+        return self.session.run(output_names, {
+            self.input_name: np.ascontiguousarray(input_data, dtype=np.float32)
+        })
@@ -0,0 +1,115 @@
+"""
+Zahlenformate der Keras-Modelle: Mixed Precision beim Training und
+Post-Training-Quantisierung für die TFLite-Inferenz.
+"""
+
+import platform
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator, List, Optional
+
+import numpy as np
+import tensorflow as tf
+
+# Anzahl Beispiele, mit denen die Wertebereiche für INT8 kalibriert werden
+REPRESENTATIVE_SAMPLES = 100
+
+
+@lru_cache(maxsize=None)
+def _cpu_flags() -> str:
+    """Liest die CPU-Flags aus /proc/cpuinfo (leer, falls nicht verfügbar)."""
+    try:
+        with open('/proc/cpuinfo') as cpuinfo:
+            return cpuinfo.read()
+    except OSError:
+        return ''
+
+
+def int8_acceleration_available() -> bool:
+    """
+    Prüft, ob die CPU beschleunigte INT8-Instruktionen anbietet.
+
+    Auf x86 sind das die VNNI-Erweiterungen, auf ARM die NEON-Einheit. Ohne
+    diese ist INT8-Inferenz oft nicht schneller als Gleitkomma.
+
+    Returns:
+        True wenn INT8-Inferenz voraussichtlich schneller ist
+    """
+    if platform.machine().lower() in ('arm64', 'aarch64'):
+        return True
+    flags = _cpu_flags()
+    return any(flag in flags for flag in ('avx512_vnni', 'avx_vnni', 'amx_int8'))
+
+
+def bf16_acceleration_available() -> bool:
+    """
+    Prüft, ob bfloat16-Berechnungen von der Hardware beschleunigt werden.
+
+    Returns:
+        True bei CPUs mit AVX-512-BF16/AMX oder verfügbarer GPU
+    """
+    flags = _cpu_flags()
+    if any(flag in flags for flag in ('avx512_bf16', 'amx_bf16')):
+        return True
+    return bool(tf.config.list_physical_devices('GPU'))
+
+
+@contextmanager
+def precision_policy(mixed_precision: Optional[bool] = None):
+    """
+    Setzt beim Modellaufbau die Keras-Policy 'mixed_bfloat16'.
+
+    Die Schichten übernehmen die Policy bei ihrer Erstellung; danach wird die
+    vorherige globale Policy wiederhergestellt. Gewichte und Eingaben sind
+    unabhängig davon float32, passend zu den vorbereiteten Eingabedaten.
+
+    Args:
+        mixed_precision: True/False erzwingt bzw. verhindert Mixed Precision,
+            None entscheidet anhand der Hardware
+    """
+    tf.keras.backend.set_floatx('float32')
+    if mixed_precision is None:
+        mixed_precision = bf16_acceleration_available()
+    if not mixed_precision:
+        yield
+        return
+
+    previous_policy = tf.keras.mixed_precision.global_policy()
+    tf.keras.mixed_precision.set_global_policy('mixed_bfloat16')
+    try:
+        yield
+    finally:
+        tf.keras.mixed_precision.set_global_policy(previous_policy)
+
+
+def quantized_converter(model: tf.keras.Model,
+                        representative_data: np.ndarray) -> tf.lite.TFLiteConverter:
+    """
+    Erstellt einen TFLite-Konverter mit Post-Training-Quantisierung.
+
+    Mit INT8-Beschleunigung werden Gewichte und Aktivierungen auf INT8
+    quantisiert, sonst werden die Gewichte als float16 abgelegt.
+
+    Args:
+        model: Zu konvertierendes Keras-Modell
+        representative_data: Eingabesequenzen der Form (Anzahl, Zeitschritte, Features)
+
+    Returns:
+        Konfigurierter TFLiteConverter
+    """
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+
+    if int8_acceleration_available():
+        samples = np.asarray(representative_data, dtype=np.float32)[:REPRESENTATIVE_SAMPLES]
+
+        def representative_dataset() -> Iterator[List[np.ndarray]]:
+            for sample in samples:
+                yield [sample[np.newaxis]]
+
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    else:
+        converter.target_spec.supported_types = [tf.float16]
+
+    return converter
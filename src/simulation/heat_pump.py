@@ -1,6 +1,9 @@
 import numpy as np
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from typing import Any, Callable, Optional, Union
+from scipy.interpolate import RegularGridInterpolator
+from src.simulation.kernels import NUMBA_AVAILABLE, cop_bilinear, heat_pump_series, heat_pump_step, njit
 
 @dataclass
 class HeatPumpSpecifications:
@@ -12,7 +15,157 @@ class HeatPumpSpecifications:
     min_part_load_ratio: float  # Minimale Teillast (0-1)
     defrost_temp_threshold: float = 7.0  # °C, Temperatur unter der Abtauung nötig ist
     thermal_mass: float = 20.0  # kWh/K, Thermische Masse des Heizsystems
+    cop_interpolator: Optional[Any] = None  # Vorberechneter Interpolator, siehe build_cop_interpolator
     
+    # COP-Kennfeld als zusammenhängende Arrays, aus cop_rating_points abgeleitet
+    outside_axis: np.ndarray = field(init=False, repr=False, compare=False)
+    flow_axis: np.ndarray = field(init=False, repr=False, compare=False)
+    cop_grid: np.ndarray = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Überführt die COP-Stützstellen einmalig in sortierte Achsen und Kennfeld."""
+        self.outside_axis, self.flow_axis, self.cop_grid = _build_cop_grid(self.cop_rating_points)
+
+def _build_cop_grid(cop_rating_points: dict) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Überführt die COP-Stützstellen in sortierte Achsen und ein 2D-Kennfeld.
+    
+    Fehlende Kombinationen werden je Außentemperatur linear über die
+    Vorlauftemperatur ergänzt, außerhalb der vorhandenen Werte wird der
+    Randwert übernommen. Achsen mit nur einem Wert werden um einen
+    zweiten Punkt mit gleichem COP erweitert, damit stets bilinear
+    interpoliert werden kann.
+    
+    Args:
+        cop_rating_points: COP-Werte {(außentemp, vorlauftemp): cop}
+        
+    Returns:
+        Tuple aus (Außentemperaturen, Vorlauftemperaturen, COP-Kennfeld)
+    """
+    # Stützstellen als zusammenhängende Arrays: Punkte (N, 2) und COP-Werte (N,)
+    points = np.array(list(cop_rating_points.keys()), dtype=np.float64).reshape(-1, 2)
+    cops = np.fromiter(cop_rating_points.values(), dtype=np.float64, count=len(cop_rating_points))
+    
+    # Sortierte Achsen und Gitterindizes aller Stützstellen in einem Schritt
+    outside_axis, outside_idx = np.unique(points[:, 0], return_inverse=True)
+    flow_axis, flow_idx = np.unique(points[:, 1], return_inverse=True)
+    
+    cop_grid = np.full((len(outside_axis), len(flow_axis)), np.nan)
+    cop_grid[outside_idx, flow_idx] = cops
+    
+    # Lücken im Kennfeld zeilenweise über die Vorlauftemperatur auffüllen;
+    # die Maske zeigt je Außentemperatur, welche Vorlauftemperaturen bekannt sind
+    missing = np.isnan(cop_grid)
+    for i in np.flatnonzero(missing.any(axis=1)):
+        known = ~missing[i]
+        cop_grid[i, missing[i]] = np.interp(flow_axis[missing[i]], flow_axis[known], cop_grid[i, known])
+    
+    if len(outside_axis) == 1:
+        outside_axis = np.append(outside_axis, outside_axis[0] + 1.0)
+        cop_grid = np.vstack([cop_grid, cop_grid])
+    if len(flow_axis) == 1:
+        flow_axis = np.append(flow_axis, flow_axis[0] + 1.0)
+        cop_grid = np.hstack([cop_grid, cop_grid])
+    
+    return outside_axis, flow_axis, cop_grid
+
+def build_cop_interpolator(cop_rating_points: dict) -> RegularGridInterpolator:
+    """
+    Baut einmalig einen bilinearen Interpolator über dem COP-Kennfeld.
+    
+    Args:
+        cop_rating_points: COP-Werte {(außentemp, vorlauftemp): cop}
+        
+    Returns:
+        RegularGridInterpolator über (Außentemperatur, Vorlauftemperatur)
+    """
+    outside_axis, flow_axis, cop_grid = _build_cop_grid(cop_rating_points)
+    return RegularGridInterpolator(
+        (outside_axis, flow_axis), cop_grid, bounds_error=False, fill_value=None
+    )
+
+# Maximale Achsenlänge, bis zu der eine spezialisierte COP-Funktion erzeugt wird
+MAX_GENERATED_AXIS_POINTS = 12
+
+def _cop_function_source(outside_axis: tuple, flow_axis: tuple, cop_grid: tuple) -> str:
+    """
+    Erzeugt den Quelltext einer auf ein Kennfeld spezialisierten COP-Funktion.
+    
+    Achsen und COP-Werte werden als Literale eingesetzt; die Intervallsuche
+    wird zu einer Kette von Vergleichen. Die Funktion rechnet wie
+    kernels.cop_bilinear: Außentemperatur begrenzt, Vorlauftemperatur
+    linear extrapoliert.
+    """
+    lines = [
+        "def _cop(outside_temp, flow_temp):",
+        f"    o = min(max(outside_temp, {outside_axis[0]!r}), {outside_axis[-1]!r})",
+        "    f = flow_temp",
+    ]
+    
+    # Zuerst über die Vorlauftemperatur: COP je Außentemperatur-Stützstelle
+    for j in range(len(flow_axis) - 1):
+        if j == 0:
+            condition = f"    if f < {flow_axis[1]!r}:" if len(flow_axis) > 2 else "    if True:"
+        elif j < len(flow_axis) - 2:
+            condition = f"    elif f < {flow_axis[j + 1]!r}:"
+        else:
+            condition = "    else:"
+        lines.append(condition)
+        lines.append(f"        u = (f - {flow_axis[j]!r}) / {flow_axis[j + 1] - flow_axis[j]!r}")
+        for i, row in enumerate(cop_grid):
+            lines.append(f"        r{i} = (1 - u) * {row[j]!r} + u * {row[j + 1]!r}")
+    
+    # Dann über die Außentemperatur zwischen den benachbarten Zeilen
+    for i in range(len(outside_axis) - 1):
+        if i == 0:
+            condition = f"    if o < {outside_axis[1]!r}:" if len(outside_axis) > 2 else "    if True:"
+        elif i < len(outside_axis) - 2:
+            condition = f"    elif o < {outside_axis[i + 1]!r}:"
+        else:
+            condition = "    else:"
+        lines.append(condition)
+        lines.append(f"        t = (o - {outside_axis[i]!r}) / {outside_axis[i + 1] - outside_axis[i]!r}")
+        lines.append(f"        return (1 - t) * r{i} + t * r{i + 1}")
+    
+    return "\n".join(lines) + "\n"
+
+@lru_cache(maxsize=32)
+def _compile_cop_function(outside_axis: tuple, flow_axis: tuple, cop_grid: tuple) -> Callable[[float, float], float]:
+    """
+    Übersetzt die spezialisierte COP-Funktion; gleiche Kennfelder teilen sich eine Funktion.
+    
+    Mit numba wird sie beim ersten Aufruf kompiliert. Zur Laufzeit erzeugter
+    Code lässt sich nicht auf der Festplatte zwischenspeichern, daher ohne cache=True.
+    """
+    namespace: dict = {}
+    exec(_cop_function_source(outside_axis, flow_axis, cop_grid), {}, namespace)
+    return njit(namespace['_cop'])
+
+def build_cop_function(outside_axis: np.ndarray,
+                       flow_axis: np.ndarray,
+                       cop_grid: np.ndarray) -> Callable[[float, float], float]:
+    """
+    Erzeugt eine auf ein festes COP-Kennfeld spezialisierte Interpolationsfunktion.
+    
+    Args:
+        outside_axis: Aufsteigend sortierte Außentemperaturen (mind. 2 Werte)
+        flow_axis: Aufsteigend sortierte Vorlauftemperaturen (mind. 2 Werte)
+        cop_grid: COP-Werte der Form (len(outside_axis), len(flow_axis))
+        
+    Returns:
+        Funktion (Außentemperatur, Vorlauftemperatur) -> COP
+    """
+    # Große Kennfelder (z.B. detaillierte Herstellerdaten): Vergleichsketten
+    # wachsen linear mit der Achsenlänge, die binäre Suche nur logarithmisch
+    if max(len(outside_axis), len(flow_axis)) > MAX_GENERATED_AXIS_POINTS:
+        return partial(cop_bilinear, outside_axis, flow_axis, cop_grid)
+    
+    return _compile_cop_function(
+        tuple(outside_axis.tolist()),
+        tuple(flow_axis.tolist()),
+        tuple(tuple(row) for row in cop_grid.tolist())
+    )
+
 class HeatPump:
     """
     Simulation einer Wärmepumpe nach VDI 4645.
@@ -32,52 +185,37 @@ class HeatPump:
         self.defrost_energy: float = 0.0
         self.runtime: float = 0.0
         
-    def _find_surrounding_points(self, outside_temp: float, flow_temp: float) -> tuple[tuple[float, float], float]:
-        """
-        Findet die umgebenden Temperaturpunkte für die Interpolation.
+        # Sortierte Achsen und COP-Kennfeld aus den Spezifikationen
+        self._ot, self._ft, self._grid = specs.outside_axis, specs.flow_axis, specs.cop_grid
+        self._cop_interpolator = specs.cop_interpolator
+        if self._cop_interpolator is None:
+            self._cop_interpolator = RegularGridInterpolator(
+                (self._ot, self._ft), self._grid, bounds_error=False, fill_value=None
+            )
         
-        Args:
-            outside_temp: Außentemperatur in °C
-            flow_temp: Vorlauftemperatur in °C
-            
-        Returns:
-            Liste von Tupeln ((außentemp, vorlauftemp), cop)
-        """
-        outside_temps = sorted(set(t[0] for t in self.specs.cop_rating_points.keys()))
-        flow_temps = sorted(set(t[1] for t in self.specs.cop_rating_points.keys()))
-        
-        # Finde die umgebenden Temperaturen
-        lower_outside = max((t for t in outside_temps if t <= outside_temp), default=min(outside_temps))
-        upper_outside = min((t for t in outside_temps if t >= outside_temp), default=max(outside_temps))
-        lower_flow = max((t for t in flow_temps if t <= flow_temp), default=min(flow_temps))
-        upper_flow = min((t for t in flow_temps if t >= flow_temp), default=max(flow_temps))
-        
-        points = []
-        for out_temp in [lower_outside, upper_outside]:
-            for flow_t in [lower_flow, upper_flow]:
-                points.append(((out_temp, flow_t), self.specs.cop_rating_points[(out_temp, flow_t)]))
-                
-        return points
-    
-    def _interpolate_1d(self, x: float, x1: float, x2: float, y1: float, y2: float) -> float:
-        """
-        Führt eine lineare Interpolation zwischen zwei Punkten durch.
+        # Auf das Kennfeld spezialisierte Funktion für einzelne COP-Abfragen
+        self._cop = build_cop_function(self._ot, self._ft, self._grid)
         
-        Args:
-            x: Der x-Wert, für den interpoliert werden soll
-            x1: Der erste x-Wert
-            x2: Der zweite x-Wert
-            y1: Der erste y-Wert
-            y2: Der zweite y-Wert
-            
-        Returns:
-            Der interpolierte y-Wert
-        """
-        if x1 == x2:
-            return y1
-        ratio = (x - x1) / (x2 - x1)
-        return y1 + ratio * (y2 - y1)
+        # Konstante Parameter des Rechenkerns einmalig als float
+        self._step_params = (
+            float(specs.nominal_heating_power),
+            float(specs.min_part_load_ratio),
+            float(specs.defrost_temp_threshold),
+            float(specs.min_outside_temp),
+            float(specs.max_flow_temp)
+        )
+        
+    def __getstate__(self) -> dict:
+        """Zur Übergabe an Worker-Prozesse ohne die erzeugte COP-Funktion serialisieren."""
+        state = self.__dict__.copy()
+        del state['_cop']
+        return state
     
+    def __setstate__(self, state: dict) -> None:
+        """Stellt den Zustand wieder her und erzeugt die COP-Funktion aus dem Kennfeld neu."""
+        self.__dict__.update(state)
+        self._cop = build_cop_function(self._ot, self._ft, self._grid)
+        
     def calculate_cop(self, outside_temp: float, flow_temp: float) -> float:
         """
         Berechnet den COP basierend auf Außen- und Vorlauftemperatur.
@@ -94,74 +232,42 @@ class HeatPump:
         if outside_temp < self.specs.min_outside_temp or flow_temp > self.specs.max_flow_temp:
             return 0.0
         
-        # Stelle sicher, dass beide Temperaturen als float behandelt werden
-        outside_temp_float = float(outside_temp)
-        flow_temp_float = float(flow_temp)
-        
-        # Exakter Match - mit expliziter Float-Konvertierung
-        # Suche nach einem passenden COP-Punkt mit Toleranz für Rundungsfehler
-        for (out_t, fl_t), cop in self.specs.cop_rating_points.items():
-            if abs(float(out_t) - outside_temp_float) < 0.01 and abs(float(fl_t) - flow_temp_float) < 0.01:
-                return cop
-        
-        # Finde die verfügbaren Temperaturen und konvertiere zu float
-        outside_temps = [float(t[0]) for t in self.specs.cop_rating_points.keys()]
-        outside_temps = sorted(set(outside_temps))
-        flow_temps = [float(t[1]) for t in self.specs.cop_rating_points.keys()]
-        flow_temps = sorted(set(flow_temps))
-        
-        # Stelle sicher, dass outside_temp und flow_temp als float behandelt werden
-        outside_temp_float = float(outside_temp)
-        flow_temp_float = float(flow_temp)
-        
-        # Finde die umgebenden Außentemperaturen
-        lower_outside = max((t for t in outside_temps if t <= outside_temp_float), default=min(outside_temps))
-        upper_outside = min((t for t in outside_temps if t >= outside_temp_float), default=max(outside_temps))
-        
-        # Interpoliere zuerst für die untere Außentemperatur
-        lower_outside_cops = []
-        for flow_t in flow_temps:
-            # Explizite Typkonvertierung für den Vergleich
-            flow_t_float = float(flow_t)
-            if flow_t_float in [float(t[1]) for t in self.specs.cop_rating_points.keys() if float(t[0]) == float(lower_outside)]:
-                lower_outside_cops.append((flow_t_float, self.specs.cop_rating_points[(lower_outside, flow_t_float)]))
-        
-        lower_cop = self._interpolate_1d(
-            flow_temp,
-            lower_outside_cops[0][0],
-            lower_outside_cops[-1][0],
-            lower_outside_cops[0][1],
-            lower_outside_cops[-1][1]
-        )
-        
-        # Dann für die obere Außentemperatur
-        upper_outside_cops = []
-        for flow_t in flow_temps:
-            # Explizite Typkonvertierung für den Vergleich
-            flow_t_float = float(flow_t)
-            if flow_t_float in [float(t[1]) for t in self.specs.cop_rating_points.keys() if float(t[0]) == float(upper_outside)]:
-                upper_outside_cops.append((flow_t_float, self.specs.cop_rating_points[(upper_outside, flow_t_float)]))
-        
-        upper_cop = self._interpolate_1d(
-            flow_temp,
-            upper_outside_cops[0][0],
-            upper_outside_cops[-1][0],
-            upper_outside_cops[0][1],
-            upper_outside_cops[-1][1]
-        )
-        
-        # Schließlich zwischen den Außentemperaturen
-        cop = self._interpolate_1d(
-            outside_temp,
-            lower_outside,
-            upper_outside,
-            lower_cop,
-            upper_cop
-        )
+        # Bilineare Interpolation mit der auf das Kennfeld spezialisierten Funktion
+        cop = self._cop(float(outside_temp), float(flow_temp))
         
         self.current_cop = cop
         return cop
     
+    def calculate_cop_series(self,
+                             outside_temps: np.ndarray,
+                             flow_temps: np.ndarray) -> np.ndarray:
+        """
+        Berechnet den COP für ganze Temperaturreihen in einem Aufruf.
+        
+        Nutzt den vorberechneten Interpolator aus den Spezifikationen bzw. den
+        beim Initialisieren aus dem Kennfeld aufgebauten Interpolator.
+        
+        Args:
+            outside_temps: Außentemperaturen in °C
+            flow_temps: Vorlauftemperaturen in °C
+            
+        Returns:
+            Array mit COP-Werten (0.0 außerhalb der Betriebsgrenzen)
+        """
+        outside_temps = np.asarray(outside_temps, dtype=np.float64)
+        flow_temps = np.asarray(flow_temps, dtype=np.float64)
+        
+        interpolator = self._cop_interpolator
+        
+        # Außentemperatur wie in calculate_cop auf das Kennfeld begrenzen
+        outside_axis = interpolator.grid[0]
+        clipped_outside = np.clip(outside_temps, outside_axis[0], outside_axis[-1])
+        cops = interpolator(np.stack([clipped_outside, flow_temps], axis=-1))
+        
+        # Betriebsgrenzen prüfen
+        out_of_range = (outside_temps < self.specs.min_outside_temp) | (flow_temps > self.specs.max_flow_temp)
+        return np.where(out_of_range, 0.0, cops)
+    
     def get_power_output(self, 
                         outside_temp: float,
                         flow_temp: float,
@@ -180,56 +286,130 @@ class HeatPump:
         Returns:
             tuple: (Wärmeleistung in kWh, Stromverbrauch in kWh)
         """
-        cop = self.calculate_cop(outside_temp, flow_temp)
+        # COP, Teillast und Abtauung in einem Aufruf des Rechenkerns
+        heat_output, power_input, cop, defrost_energy = heat_pump_step(
+            self._ot, self._ft, self._grid,
+            float(outside_temp), float(flow_temp), float(demand), float(time_step),
+            *self._step_params
+        )
         if cop == 0:
             return 0.0, 0.0
-            
-        # Maximale Leistung unter aktuellen Bedingungen
-        max_power = self.specs.nominal_heating_power * (1 + (outside_temp - 7) * 0.03)
-        
-        # Minimale Leistung durch Teillastgrenze
-        min_power = max_power * self.specs.min_part_load_ratio
         
-        # Tatsächliche Leistung unter Berücksichtigung der Grenzen
-        if demand / time_step < min_power:
-            # Taktbetrieb
-            runtime_fraction = demand / (min_power * time_step)
-            heat_output = demand
-            power_input = (heat_output / cop) * (1 + 0.1 * (1 - runtime_fraction))
-        else:
-            heat_output = min(demand, max_power * time_step)
-            power_input = heat_output / cop
-            
-        # Abtauenergie berücksichtigen
-        if outside_temp < self.specs.defrost_temp_threshold:
-            defrost_energy = heat_output * 0.1  # 10% der Heizenergie für Abtauung
-            heat_output -= defrost_energy
-            self.defrost_energy += defrost_energy
-            
+        self.current_cop = cop
+        self.defrost_energy += defrost_energy
         self.current_power = heat_output / time_step
         self.current_flow_temp = flow_temp
         self.runtime += time_step
         
         return heat_output, power_input
     
+    def simulate_series(self,
+                        outside_temps: np.ndarray,
+                        flow_temps: np.ndarray,
+                        demands: np.ndarray,
+                        time_step: float = 1.0  # Stunde
+                        ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Berechnet Wärmeleistung und Stromverbrauch für ganze Zeitreihen.
+        
+        Variante von get_power_output für Arrays mit identischem Modell
+        (Betriebsgrenzen, Taktbetrieb, Abtauung). Mit numba läuft sie als
+        kompilierter Rechenkern (bei langen Reihen parallel), sonst
+        vektorisiert mit NumPy. Der Betriebszustand wird so fortgeschrieben,
+        als wäre get_power_output je Zeitschritt aufgerufen worden.
+        
+        Args:
+            outside_temps: Außentemperaturen in °C
+            flow_temps: Vorlauftemperaturen in °C
+            demands: Angeforderter Wärmebedarf je Zeitschritt in kWh
+            time_step: Zeitschritt in Stunden
+            
+        Returns:
+            tuple: (Wärmeleistung in kWh, Stromverbrauch in kWh, COP) als Arrays
+        """
+        outside_temps = np.asarray(outside_temps, dtype=np.float64)
+        flow_temps = np.asarray(flow_temps, dtype=np.float64)
+        demands = np.asarray(demands, dtype=np.float64)
+        
+        if NUMBA_AVAILABLE:
+            # Kompilierter Rechenkern, bei langen Reihen parallel über die Zeitschritte
+            heat_output, power_input, cop, defrost_energy = heat_pump_series(
+                self._ot, self._ft, self._grid,
+                outside_temps, flow_temps, demands, float(time_step),
+                *self._step_params
+            )
+        else:
+            heat_output, power_input, cop, defrost_energy = self._simulate_series_numpy(
+                outside_temps, flow_temps, demands, time_step
+            )
+        running = cop != 0
+        
+        # Betriebszustand wie bei schrittweiser Berechnung fortschreiben
+        if running.any():
+            last = np.flatnonzero(running)[-1]
+            self.current_cop = float(cop[last])
+            self.current_power = float(heat_output[last] / time_step)
+            self.current_flow_temp = float(flow_temps[last])
+            self.defrost_energy += float(defrost_energy.sum())
+            self.runtime += time_step * int(running.sum())
+        
+        return heat_output, power_input, cop
+    
+    def _simulate_series_numpy(self,
+                               outside_temps: np.ndarray,
+                               flow_temps: np.ndarray,
+                               demands: np.ndarray,
+                               time_step: float
+                               ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """NumPy-Variante von simulate_series ohne numba; liefert zusätzlich die Abtauenergie."""
+        cop = self.calculate_cop_series(outside_temps, flow_temps)
+        running = cop != 0
+        safe_cop = np.where(running, cop, 1.0)
+        
+        # Maximale Leistung unter aktuellen Bedingungen und Teillastgrenze
+        max_power = self.specs.nominal_heating_power * (1 + (outside_temps - 7) * 0.03)
+        min_power = max_power * self.specs.min_part_load_ratio
+        
+        # Taktbetrieb unterhalb der minimalen Leistung, sonst begrenzt auf Maximalleistung
+        cycling = demands / time_step < min_power
+        with np.errstate(divide='ignore', invalid='ignore'):
+            runtime_fraction = np.where(cycling, demands / (min_power * time_step), 1.0)
+        heat_output = np.where(cycling, demands, np.minimum(demands, max_power * time_step))
+        power_input = (heat_output / safe_cop) * np.where(cycling, 1 + 0.1 * (1 - runtime_fraction), 1.0)
+        
+        # Abtauenergie: 10% der Heizenergie
+        defrost_energy = np.where(outside_temps < self.specs.defrost_temp_threshold, heat_output * 0.1, 0.0)
+        heat_output = heat_output - defrost_energy
+        
+        # Außerhalb der Betriebsgrenzen keine Leistung
+        heat_output = np.where(running, heat_output, 0.0)
+        power_input = np.where(running, power_input, 0.0)
+        defrost_energy = np.where(running, defrost_energy, 0.0)
+        
+        return heat_output, power_input, cop, defrost_energy
+    
     def calculate_flow_temperature(self, 
-                                 outside_temp: float,
+                                 outside_temp: Union[float, np.ndarray],
                                  target_room_temp: float = 20.0
-                                 ) -> float:
+                                 ) -> Union[float, np.ndarray]:
         """
         Berechnet die optimale Vorlauftemperatur nach Heizkurve.
         
         Args:
-            outside_temp: Außentemperatur in °C
+            outside_temp: Außentemperatur in °C (Einzelwert oder Array)
             target_room_temp: Gewünschte Raumtemperatur in °C
             
         Returns:
-            Vorlauftemperatur in °C
+            Vorlauftemperatur in °C, bei Array-Eingabe als Array
         """
         # Heizkurve für Fußbodenheizung (35°C bei -15°C)
         base_temp = target_room_temp
         gradient = (35 - base_temp) / 35  # Steilheit der Heizkurve
         
+        if np.ndim(outside_temp) > 0:
+            flow_temps = base_temp + gradient * (20 - np.asarray(outside_temp, dtype=np.float64))
+            return np.minimum(flow_temps, self.specs.max_flow_temp)
+        
         flow_temp = base_temp + gradient * (20 - outside_temp)
         return min(flow_temp, self.specs.max_flow_temp)
     
@@ -0,0 +1,628 @@
+"""
+Rechenkerne für die Energiesystemsimulation.
+
+Die Kerne arbeiten ausschließlich auf NumPy-Arrays und Skalaren. Ist numba
+installiert, werden sie beim ersten Aufruf kompiliert und auf der Festplatte
+zwischengespeichert (cache=True), sodass weitere Prozesse die kompilierte
+Version ohne erneute JIT-Kompilierung laden. Ohne numba laufen dieselben
+Funktionen als reiner NumPy-Code.
+"""
+
+from typing import Tuple, Union
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Ersatz für numba.njit, der die Funktion unverändert zurückgibt."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
+
+
+# Mindestlänge von Zeitreihen, ab der Rechenkerne über mehrere Threads verteilt werden
+PARALLEL_MIN_STEPS = 8760
+
+# Heizgrenztemperatur und spezifischer Wärmebedarf des vereinfachten Gebäudemodells
+HEATING_LIMIT_TEMP = 15.0  # °C
+SPECIFIC_HEAT_DEMAND = 0.03  # kW/(m²·K), ~3W/m² pro Kelvin
+
+
+@njit(cache=True)
+def daily_heat_demand(outside_temps: np.ndarray, heated_area: float) -> np.ndarray:
+    """
+    Berechnet den vereinfachten Wärmebedarf aus der Außentemperatur.
+
+    Args:
+        outside_temps: Außentemperaturen in °C
+        heated_area: Beheizte Fläche in m²
+
+    Returns:
+        Wärmebedarf in kW je Zeitschritt (0 oberhalb der Heizgrenztemperatur)
+    """
+    demand = (HEATING_LIMIT_TEMP - outside_temps) * heated_area * SPECIFIC_HEAT_DEMAND
+    return np.where(outside_temps < HEATING_LIMIT_TEMP, np.maximum(demand, 0.0), 0.0)
+
+
+@njit(cache=True)
+def energy_balance(pv_outputs: np.ndarray, power_inputs: np.ndarray) -> Tuple[float, float, float]:
+    """
+    Berechnet Eigenverbrauch, Netzeinspeisung und Netzbezug.
+
+    Args:
+        pv_outputs: PV-Erzeugung je Zeitschritt in kWh
+        power_inputs: Strombedarf der Wärmepumpe je Zeitschritt in kWh
+
+    Returns:
+        Tuple aus (Eigenverbrauch, Netzeinspeisung, Netzbezug) in kWh
+    """
+    surplus = pv_outputs - power_inputs
+    self_consumption = np.minimum(pv_outputs, power_inputs).sum()
+    grid_feed = np.maximum(surplus, 0.0).sum()
+    grid_draw = np.maximum(-surplus, 0.0).sum()
+    return self_consumption, grid_feed, grid_draw
+
+
+def _series_statistics_numpy(outside_temps: np.ndarray,
+                             cop_values: np.ndarray,
+                             pv_outputs: np.ndarray) -> Tuple[float, float, float, float, float]:
+    """NumPy-Variante von series_statistics mit einzelnen Reduktionen."""
+    return (outside_temps.sum(), outside_temps.min(), outside_temps.max(),
+            cop_values.sum(), pv_outputs.max())
+
+
+@njit(cache=True)
+def _series_statistics_loop(outside_temps: np.ndarray,
+                            cop_values: np.ndarray,
+                            pv_outputs: np.ndarray) -> Tuple[float, float, float, float, float]:
+    """Kompilierte Variante von series_statistics in einem einzigen Durchlauf."""
+    temp_sum = 0.0
+    temp_min = np.inf
+    temp_max = -np.inf
+    cop_sum = 0.0
+    pv_peak = -np.inf
+    for i in range(outside_temps.shape[0]):
+        temp = outside_temps[i]
+        temp_sum += temp
+        if temp < temp_min:
+            temp_min = temp
+        if temp > temp_max:
+            temp_max = temp
+        cop_sum += cop_values[i]
+        if pv_outputs[i] > pv_peak:
+            pv_peak = pv_outputs[i]
+    return temp_sum, temp_min, temp_max, cop_sum, pv_peak
+
+
+def series_statistics(outside_temps: np.ndarray,
+                      cop_values: np.ndarray,
+                      pv_outputs: np.ndarray) -> Tuple[float, float, float, float, float]:
+    """
+    Berechnet die Kennzahlen der Zeitreihen für die Ergebniszusammenfassung.
+
+    Mit numba werden alle Kennzahlen in einem Durchlauf über die Daten
+    bestimmt, sonst über NumPy-Reduktionen.
+
+    Args:
+        outside_temps: Außentemperaturen in °C
+        cop_values: COP je Zeitschritt
+        pv_outputs: PV-Leistung (AC) je Zeitschritt in kW
+
+    Returns:
+        Tuple aus (Temperatursumme, Temperaturminimum, Temperaturmaximum,
+        COP-Summe, PV-Spitzenleistung)
+    """
+    if len(outside_temps) == 0:
+        raise ValueError("Zeitreihen enthalten keine Werte")
+    if NUMBA_AVAILABLE:
+        return _series_statistics_loop(outside_temps, cop_values, pv_outputs)
+    return _series_statistics_numpy(outside_temps, cop_values, pv_outputs)
+
+
+@njit(cache=True)
+def cop_bilinear(outside_axis: np.ndarray,
+                 flow_axis: np.ndarray,
+                 cop_grid: np.ndarray,
+                 outside_temp: float,
+                 flow_temp: float) -> float:
+    """
+    Bilineare COP-Interpolation auf einem Kennfeld.
+
+    Die Außentemperatur wird auf das Kennfeld begrenzt, über die
+    Vorlauftemperatur wird linear extrapoliert.
+
+    Args:
+        outside_axis: Aufsteigend sortierte Außentemperaturen (mind. 2 Werte)
+        flow_axis: Aufsteigend sortierte Vorlauftemperaturen (mind. 2 Werte)
+        cop_grid: COP-Werte der Form (len(outside_axis), len(flow_axis))
+        outside_temp: Außentemperatur in °C
+        flow_temp: Vorlauftemperatur in °C
+
+    Returns:
+        Interpolierter COP
+    """
+    outside = min(max(outside_temp, outside_axis[0]), outside_axis[-1])
+
+    # Umgebende Stützstellen über binäre Suche
+    i = min(max(np.searchsorted(outside_axis, outside, side='right') - 1, 0), outside_axis.shape[0] - 2)
+    j = min(max(np.searchsorted(flow_axis, flow_temp, side='right') - 1, 0), flow_axis.shape[0] - 2)
+    t = (outside - outside_axis[i]) / (outside_axis[i + 1] - outside_axis[i])
+    u = (flow_temp - flow_axis[j]) / (flow_axis[j + 1] - flow_axis[j])
+
+    # Zuerst über die Vorlauftemperatur, dann über die Außentemperatur
+    lower_cop = (1 - u) * cop_grid[i, j] + u * cop_grid[i, j + 1]
+    upper_cop = (1 - u) * cop_grid[i + 1, j] + u * cop_grid[i + 1, j + 1]
+    return (1 - t) * lower_cop + t * upper_cop
+
+
+@njit(cache=True)
+def heat_pump_step(outside_axis: np.ndarray,
+                   flow_axis: np.ndarray,
+                   cop_grid: np.ndarray,
+                   outside_temp: float,
+                   flow_temp: float,
+                   demand: float,
+                   time_step: float,
+                   nominal_heating_power: float,
+                   min_part_load_ratio: float,
+                   defrost_temp_threshold: float,
+                   min_outside_temp: float,
+                   max_flow_temp: float) -> Tuple[float, float, float, float]:
+    """
+    Berechnet einen Zeitschritt der Wärmepumpe (COP, Teillast, Abtauung).
+
+    Args:
+        outside_axis, flow_axis, cop_grid: COP-Kennfeld wie bei cop_bilinear
+        outside_temp: Außentemperatur in °C
+        flow_temp: Vorlauftemperatur in °C
+        demand: Angeforderter Wärmebedarf in kWh
+        time_step: Zeitschritt in Stunden
+        nominal_heating_power: Nennheizleistung in kW
+        min_part_load_ratio: Minimale Teillast (0-1)
+        defrost_temp_threshold: Temperatur, unter der abgetaut wird, in °C
+        min_outside_temp: Minimale Außentemperatur in °C
+        max_flow_temp: Maximale Vorlauftemperatur in °C
+
+    Returns:
+        Tuple aus (Wärmeleistung in kWh, Stromverbrauch in kWh, COP, Abtauenergie in kWh);
+        außerhalb der Betriebsgrenzen alles 0
+    """
+    if outside_temp < min_outside_temp or flow_temp > max_flow_temp:
+        return 0.0, 0.0, 0.0, 0.0
+    cop = cop_bilinear(outside_axis, flow_axis, cop_grid, outside_temp, flow_temp)
+    if cop == 0:
+        return 0.0, 0.0, 0.0, 0.0
+
+    # Maximale Leistung unter aktuellen Bedingungen und Teillastgrenze
+    max_power = nominal_heating_power * (1 + (outside_temp - 7) * 0.03)
+    min_power = max_power * min_part_load_ratio
+
+    if demand / time_step < min_power:
+        # Taktbetrieb
+        runtime_fraction = demand / (min_power * time_step)
+        heat_output = demand
+        power_input = (heat_output / cop) * (1 + 0.1 * (1 - runtime_fraction))
+    else:
+        heat_output = min(demand, max_power * time_step)
+        power_input = heat_output / cop
+
+    # Abtauenergie: 10% der Heizenergie
+    defrost_energy = 0.0
+    if outside_temp < defrost_temp_threshold:
+        defrost_energy = heat_output * 0.1
+        heat_output -= defrost_energy
+
+    return heat_output, power_input, cop, defrost_energy
+
+
+@njit(cache=True)
+def _heat_pump_series_loop(outside_axis: np.ndarray,
+                           flow_axis: np.ndarray,
+                           cop_grid: np.ndarray,
+                           outside_temps: np.ndarray,
+                           flow_temps: np.ndarray,
+                           demands: np.ndarray,
+                           time_step: float,
+                           nominal_heating_power: float,
+                           min_part_load_ratio: float,
+                           defrost_temp_threshold: float,
+                           min_outside_temp: float,
+                           max_flow_temp: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    n = outside_temps.shape[0]
+    heat_outputs = np.empty(n)
+    power_inputs = np.empty(n)
+    cops = np.empty(n)
+    defrost_energies = np.empty(n)
+    for i in range(n):
+        heat_outputs[i], power_inputs[i], cops[i], defrost_energies[i] = heat_pump_step(
+            outside_axis, flow_axis, cop_grid,
+            outside_temps[i], flow_temps[i], demands[i], time_step,
+            nominal_heating_power, min_part_load_ratio, defrost_temp_threshold,
+            min_outside_temp, max_flow_temp
+        )
+    return heat_outputs, power_inputs, cops, defrost_energies
+
+
+@njit(parallel=True, cache=True)
+def _heat_pump_series_parallel(outside_axis: np.ndarray,
+                               flow_axis: np.ndarray,
+                               cop_grid: np.ndarray,
+                               outside_temps: np.ndarray,
+                               flow_temps: np.ndarray,
+                               demands: np.ndarray,
+                               time_step: float,
+                               nominal_heating_power: float,
+                               min_part_load_ratio: float,
+                               defrost_temp_threshold: float,
+                               min_outside_temp: float,
+                               max_flow_temp: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    n = outside_temps.shape[0]
+    heat_outputs = np.empty(n)
+    power_inputs = np.empty(n)
+    cops = np.empty(n)
+    defrost_energies = np.empty(n)
+    for i in prange(n):
+        heat_outputs[i], power_inputs[i], cops[i], defrost_energies[i] = heat_pump_step(
+            outside_axis, flow_axis, cop_grid,
+            outside_temps[i], flow_temps[i], demands[i], time_step,
+            nominal_heating_power, min_part_load_ratio, defrost_temp_threshold,
+            min_outside_temp, max_flow_temp
+        )
+    return heat_outputs, power_inputs, cops, defrost_energies
+
+
+def heat_pump_series(outside_axis: np.ndarray,
+                     flow_axis: np.ndarray,
+                     cop_grid: np.ndarray,
+                     outside_temps: np.ndarray,
+                     flow_temps: np.ndarray,
+                     demands: np.ndarray,
+                     time_step: float,
+                     nominal_heating_power: float,
+                     min_part_load_ratio: float,
+                     defrost_temp_threshold: float,
+                     min_outside_temp: float,
+                     max_flow_temp: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Berechnet heat_pump_step für ganze Zeitreihen.
+
+    Erst ab PARALLEL_MIN_STEPS Zeitschritten wird über mehrere Threads
+    verteilt; kürzere Reihen (z.B. einzelne Tage in Worker-Prozessen) laufen
+    in einer einfachen Schleife, da der Start des Thread-Pools sonst mehr
+    kostet als die Rechnung.
+
+    Args:
+        outside_axis, flow_axis, cop_grid: COP-Kennfeld wie bei cop_bilinear
+        outside_temps: Außentemperaturen in °C
+        flow_temps: Vorlauftemperaturen in °C
+        demands: Angeforderter Wärmebedarf je Zeitschritt in kWh
+        time_step: Zeitschritt in Stunden
+        nominal_heating_power, min_part_load_ratio, defrost_temp_threshold,
+        min_outside_temp, max_flow_temp: Parameter wie bei heat_pump_step
+
+    Returns:
+        Tuple aus Arrays (Wärmeleistung, Stromverbrauch, COP, Abtauenergie)
+    """
+    kernel = _heat_pump_series_parallel if outside_temps.shape[0] >= PARALLEL_MIN_STEPS else _heat_pump_series_loop
+    return kernel(
+        outside_axis, flow_axis, cop_grid,
+        outside_temps, flow_temps, demands, time_step,
+        nominal_heating_power, min_part_load_ratio, defrost_temp_threshold,
+        min_outside_temp, max_flow_temp
+    )
+
+
+def _pv_dc_power_numpy(poa_global: np.ndarray,
+                       cell_temps: np.ndarray,
+                       peak_power_kw: Union[float, np.ndarray],
+                       temp_coefficient: Union[float, np.ndarray],
+                       loss_factor: float) -> np.ndarray:
+    """NumPy-Variante von pv_dc_power mit einem einzigen Ergebnisarray."""
+    dc_power = np.subtract(cell_temps, 25.0, dtype=poa_global.dtype)
+    dc_power *= temp_coefficient
+    dc_power += 1.0
+    dc_power *= poa_global
+    dc_power *= peak_power_kw / 1000.0 * loss_factor
+    return dc_power
+
+
+@njit(cache=True)
+def _pv_dc_power_loop(poa_global: np.ndarray,
+                      cell_temps: np.ndarray,
+                      peak_power_kw: float,
+                      temp_coefficient: float,
+                      loss_factor: float) -> np.ndarray:
+    """Kompilierte Variante von pv_dc_power in einem einzigen Durchlauf."""
+    dc_power = np.empty_like(poa_global)
+    for i in range(poa_global.shape[0]):
+        temp_factor = 1.0 + temp_coefficient * (cell_temps[i] - 25.0)
+        dc_power[i] = peak_power_kw * (poa_global[i] / 1000.0) * temp_factor * loss_factor
+    return dc_power
+
+
+def pv_dc_power(poa_global: np.ndarray,
+                cell_temps: np.ndarray,
+                peak_power_kw: Union[float, np.ndarray],
+                temp_coefficient: Union[float, np.ndarray],
+                loss_factor: float) -> np.ndarray:
+    """
+    Berechnet die temperaturkorrigierte DC-Leistung des PV-Generators.
+
+    Der Ausdruck wird ohne Zwischenarrays ausgewertet: mit numba in einer
+    kompilierten Schleife, sonst schrittweise in einem Ergebnisarray.
+    Nennleistung und Temperaturkoeffizient dürfen auch Arrays je Modultyp
+    sein; dann wird per Broadcasting gerechnet, z. B. Einstrahlung der Form
+    (T, 1) gegen Parameter der Form (M,) mit Zelltemperaturen der Form (T, M).
+
+    Args:
+        poa_global: Einstrahlung auf die Modulebene in W/m²
+        cell_temps: Zelltemperaturen in °C, Form des Ergebnisses
+        peak_power_kw: Gesamte Nennleistung in kWp
+        temp_coefficient: Temperaturkoeffizient in 1/°C
+        loss_factor: Faktor für Mismatch- und Verschmutzungsverluste
+
+    Returns:
+        DC-Leistung in kW je Zeitschritt (ohne Begrenzung auf 0), im
+        Datentyp von poa_global
+    """
+    if NUMBA_AVAILABLE and np.ndim(cell_temps) == 1 and np.ndim(peak_power_kw) == 0 and np.ndim(temp_coefficient) == 0:
+        return _pv_dc_power_loop(poa_global, cell_temps, peak_power_kw, temp_coefficient, loss_factor)
+    return _pv_dc_power_numpy(poa_global, cell_temps, peak_power_kw, temp_coefficient, loss_factor)
+
+
+def _pv_output_power_numpy(dc_power: np.ndarray,
+                           inverter_ac_power: np.ndarray,
+                           fallback_efficiency: float) -> Tuple[np.ndarray, np.ndarray]:
+    """NumPy-Variante von pv_output_power, ebenfalls direkt in den Eingaben."""
+    inverter_ac_power /= 1000.0
+    invalid = np.isnan(inverter_ac_power) | (inverter_ac_power < 0.0)
+    np.multiply(dc_power, fallback_efficiency, out=inverter_ac_power, where=invalid)
+    np.maximum(dc_power, 0.0, out=dc_power)
+    np.maximum(inverter_ac_power, 0.0, out=inverter_ac_power)
+    return dc_power, inverter_ac_power
+
+
+@njit(cache=True)
+def _pv_output_power_loop(dc_power: np.ndarray,
+                          inverter_ac_power: np.ndarray,
+                          fallback_efficiency: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Kompilierte Variante von pv_output_power in einem einzigen Durchlauf."""
+    for i in range(dc_power.shape[0]):
+        ac = inverter_ac_power[i] / 1000.0
+        if np.isnan(ac) or ac < 0.0:
+            ac = dc_power[i] * fallback_efficiency
+        dc_power[i] = max(dc_power[i], 0.0)
+        inverter_ac_power[i] = max(ac, 0.0)
+    return dc_power, inverter_ac_power
+
+
+def pv_output_power(dc_power: np.ndarray,
+                    inverter_ac_power: np.ndarray,
+                    fallback_efficiency: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Begrenzt DC- und AC-Leistung auf nicht-negative Werte.
+
+    Wo das Wechselrichtermodell keinen gültigen Wert liefert (NaN oder
+    negativ), wird die AC-Leistung über den Wirkungsgrad abgeschätzt. Die
+    Ergebnisse werden ohne zusätzliche Arrays in die Eingaben geschrieben.
+
+    Args:
+        dc_power: DC-Leistung in kW, wird überschrieben
+        inverter_ac_power: AC-Leistung des Wechselrichtermodells in W, wird
+            mit der AC-Leistung in kW überschrieben
+        fallback_efficiency: Wirkungsgrad für die Ersatzberechnung
+
+    Returns:
+        Tuple aus den Arrays (DC-Leistung, AC-Leistung) in kW
+    """
+    if NUMBA_AVAILABLE:
+        return _pv_output_power_loop(dc_power, inverter_ac_power, fallback_efficiency)
+    return _pv_output_power_numpy(dc_power, inverter_ac_power, fallback_efficiency)
+
+
+@njit(cache=True)
+def collector_efficiency(optical_efficiency: float,
+                         a1: float,
+                         a2: float,
+                         delta_t: float,
+                         solar_irradiance: float) -> float:
+    """
+    Kollektorwirkungsgrad nach EN 12975.
+
+    Args:
+        optical_efficiency: Optischer Wirkungsgrad η0
+        a1: Linearer Wärmeverlustkoeffizient in W/(m²·K)
+        a2: Quadratischer Wärmeverlustkoeffizient in W/(m²·K²)
+        delta_t: Temperaturdifferenz (Kollektor - Umgebung) in K
+        solar_irradiance: Solare Einstrahlung in W/m²
+
+    Returns:
+        Kollektorwirkungsgrad (0 unter 1 W/m²)
+    """
+    if solar_irradiance < 1:
+        return 0.0
+    efficiency = optical_efficiency - (a1 * delta_t + a2 * delta_t ** 2) / solar_irradiance
+    return max(0.0, efficiency)
+
+
+@njit(cache=True)
+def collector_thermal_power(optical_efficiency: float,
+                            a1: float,
+                            a2: float,
+                            area: float,
+                            specific_heat_capacity: float,
+                            flow_rate: float,
+                            max_stagnation_temp: float,
+                            stagnation_gain: float,
+                            collector_temp: float,
+                            solar_irradiance: float,
+                            ambient_temp: float,
+                            flow_temp: float) -> Tuple[float, float]:
+    """
+    Berechnet einen Zeitschritt des Kollektorfeldes (Leistung und Kollektortemperatur).
+
+    Args:
+        optical_efficiency, a1, a2: Kollektorkennwerte wie bei collector_efficiency
+        area: Aperturfläche in m²
+        specific_heat_capacity: Wärmekapazität des Wärmeträgers in kJ/(kg·K)
+        flow_rate: Durchfluss in kg/s pro m²
+        max_stagnation_temp: Maximale Stagnationstemperatur in °C
+        stagnation_gain: Temperaturanstieg ohne Durchfluss je W/m² (η0 / a1) in K·m²/W
+        collector_temp: Kollektortemperatur vor dem Zeitschritt in °C
+        solar_irradiance: Solare Einstrahlung in W/m²
+        ambient_temp: Umgebungstemperatur in °C
+        flow_temp: Vorlauftemperatur in °C
+
+    Returns:
+        Tuple aus (thermische Leistung in kW, neue Kollektortemperatur in °C)
+    """
+    # Stagnation oder kein Durchfluss: keine Leistung, Gleichgewichtstemperatur
+    if collector_temp >= max_stagnation_temp or flow_rate <= 0:
+        max_temp = ambient_temp + solar_irradiance * stagnation_gain
+        return 0.0, min(max_temp, max_stagnation_temp)
+
+    delta_t = flow_temp - ambient_temp
+    efficiency = collector_efficiency(optical_efficiency, a1, a2, delta_t, solar_irradiance)
+    power = (efficiency * solar_irradiance * area) / 1000  # kW
+
+    # Temperaturanstieg durch thermische Leistung (begrenzt durch Verluste)
+    max_temp_rise = solar_irradiance * optical_efficiency / (a1 + a2 * delta_t)
+    temp_rise = min(power * 1000 / (flow_rate * specific_heat_capacity), max_temp_rise)
+
+    new_temp = flow_temp + temp_rise
+    if new_temp > max_stagnation_temp:
+        # Leistung reduzieren, wenn die maximale Temperatur überschritten wird
+        power *= (max_stagnation_temp - flow_temp) / temp_rise
+        new_temp = max_stagnation_temp
+    return power, new_temp
+
+
+@njit(cache=True)
+def collector_thermal_power_series(optical_efficiency: float,
+                                   a1: float,
+                                   a2: float,
+                                   area: float,
+                                   specific_heat_capacity: float,
+                                   flow_rate: float,
+                                   max_stagnation_temp: float,
+                                   stagnation_gain: float,
+                                   collector_temp: float,
+                                   solar_irradiance: np.ndarray,
+                                   ambient_temps: np.ndarray,
+                                   flow_temps: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Berechnet collector_thermal_power für ganze Zeitreihen.
+
+    Die Zeitschritte werden nacheinander berechnet, da die Stagnation von
+    der Kollektortemperatur des vorherigen Zeitschritts abhängt.
+
+    Args:
+        optical_efficiency, a1, a2, area, specific_heat_capacity, flow_rate,
+        max_stagnation_temp, stagnation_gain: Parameter wie bei collector_thermal_power
+        collector_temp: Kollektortemperatur vor dem ersten Zeitschritt in °C
+        solar_irradiance: Solare Einstrahlung in W/m²
+        ambient_temps: Umgebungstemperaturen in °C
+        flow_temps: Vorlauftemperaturen in °C
+
+    Returns:
+        Tuple aus Arrays (thermische Leistung in kW, Kollektortemperatur in °C)
+    """
+    n = solar_irradiance.shape[0]
+    powers = np.empty(n)
+    collector_temps = np.empty(n)
+    for i in range(n):
+        powers[i], collector_temp = collector_thermal_power(
+            optical_efficiency, a1, a2, area, specific_heat_capacity, flow_rate,
+            max_stagnation_temp, stagnation_gain, collector_temp,
+            solar_irradiance[i], ambient_temps[i], flow_temps[i]
+        )
+        collector_temps[i] = collector_temp
+    return powers, collector_temps
+
+
+@njit(cache=True)
+def storage_layers_update(storage_temps: np.ndarray,
+                          layer_heat_capacity: float,
+                          heat_loss_rate: float,
+                          thermal_power: float,
+                          dhw_demand: float,
+                          hours: float,
+                          ambient_temp: float,
+                          min_temp: float) -> None:
+    """
+    Aktualisiert die Schichttemperaturen eines Speichers in einem Zeitschritt.
+
+    Args:
+        storage_temps: Schichttemperaturen in °C, werden direkt überschrieben
+        layer_heat_capacity: Wärmekapazität einer Schicht in kJ/K
+        heat_loss_rate: Wärmeverlustkoeffizient des Speichers in W/K
+        thermal_power: Zugeführte thermische Leistung in kW
+        dhw_demand: Warmwasserbedarf in kW
+        hours: Zeitschritt in Stunden
+        ambient_temp: Umgebungstemperatur des Speichers in °C
+        min_temp: Minimale Speichertemperatur in °C
+    """
+    n = storage_temps.shape[0]
+
+    # Wärmeverluste als Leistung (W/K -> kW)
+    storage_losses = heat_loss_rate * (storage_temps.sum() / n - ambient_temp) * 1e-3
+
+    # Energiebilanz in kWh, gleichmäßig auf alle Schichten verteilt
+    energy_in = thermal_power * hours
+    energy_out = (dhw_demand + storage_losses) * hours
+    delta_t = (energy_in - energy_out) / n / layer_heat_capacity
+    for i in range(n):
+        storage_temps[i] = max(storage_temps[i] + delta_t, min_temp)
+
+
+@njit(cache=True)
+def solar_fraction_series(total_demands: np.ndarray, solar_contributions: np.ndarray) -> np.ndarray:
+    """
+    Solarer Deckungsgrad nach VDI 6002 für ganze Zeitreihen.
+
+    Args:
+        total_demands: Gesamtwärmebedarf in kWh
+        solar_contributions: Solarer Beitrag in kWh
+
+    Returns:
+        Solarer Deckungsgrad je Eintrag (0 ohne Bedarf, höchstens 1)
+    """
+    fractions = np.empty(total_demands.shape[0])
+    for i in range(total_demands.shape[0]):
+        if total_demands[i] <= 0:
+            fractions[i] = 0.0
+        else:
+            fractions[i] = min(solar_contributions[i] / total_demands[i], 1.0)
+    return fractions
+
+
+@njit(cache=True)
+def layer_u_value(thicknesses: np.ndarray, lambdas: np.ndarray, r_si: float, r_se: float) -> float:
+    """
+    Berechnet den U-Wert eines Schichtaufbaus nach DIN EN ISO 6946.
+
+    Schichten ohne Dicke oder Wärmeleitfähigkeit werden übersprungen.
+
+    Args:
+        thicknesses: Schichtdicken in m
+        lambdas: Wärmeleitfähigkeiten in W/(m·K)
+        r_si: Innerer Wärmeübergangswiderstand in m²·K/W
+        r_se: Äußerer Wärmeübergangswiderstand in m²·K/W
+
+    Returns:
+        U-Wert in W/(m²·K)
+    """
+    r_total = r_si + r_se
+    for i in range(thicknesses.shape[0]):
+        if thicknesses[i] > 0 and lambdas[i] > 0:
+            r_total += thicknesses[i] / lambdas[i]
+    return 1.0 / r_total if r_total > 0 else 0.0
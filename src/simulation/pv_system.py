@@ -3,12 +3,16 @@ Simulation of a photovoltaic system.
 Uses real component data from the components database.
 """
 
+import calendar
+import multiprocessing
 from dataclasses import dataclass
-from typing import Optional, Tuple, Dict, Any
+from functools import lru_cache
+from typing import Optional, Tuple, Dict, Any, List, Union
 import numpy as np
 from datetime import datetime
 import pandas as pd
-from src.data_handlers.components import ComponentsDatabase
+from src.data_handlers.components import ComponentsDatabase, get_components_database
+from src.simulation.kernels import pv_dc_power, pv_output_power
 
 try:
     import pvlib
@@ -17,6 +21,28 @@ except ImportError:
     PVLIB_AVAILABLE = False
     print("Warning: pvlib not available. Using simplified PV calculations.")
 
+# Maximum number of cached solar positions (timestamps) per PV system, one leap year of hours
+SOLAR_POSITION_CACHE_SIZE = 8784
+
+# Module mismatch and soiling losses applied to the DC power
+MODULE_LOSS_FACTOR = 0.95
+
+# Reference parameters of the De Soto single diode model
+DESOTO_REFERENCE_PARAMETERS = {
+    'a_ref': 1.5,  # Diode ideality factor
+    'I_L_ref': 8.0,  # Light current at reference conditions (A)
+    'I_o_ref': 1e-10,  # Dark current at reference conditions (A)
+    'R_sh_ref': 400,  # Shunt resistance at reference conditions (Ohm)
+    'R_s': 0.4,  # Series resistance (Ohm)
+    'EgRef': 1.121,  # Band gap energy at reference temperature (eV)
+    'dEgdT': -0.0002677  # Temperature coefficient of band gap (eV/°C)
+}
+
+@lru_cache(maxsize=None)
+def _get_location(latitude: float, longitude: float, altitude: float) -> 'pvlib.location.Location':
+    """pvlib location for the given coordinates, created once and shared by all PV systems there."""
+    return pvlib.location.Location(latitude=latitude, longitude=longitude, altitude=altitude)
+
 @dataclass
 class PVModuleSpecifications:
     """Technical specifications of a PV module."""
@@ -47,6 +73,67 @@ class PVModuleSpecifications:
             warranty_years=module.warranty_years
         )
 
+@dataclass
+class PVModuleFleet:
+    """Specifications of many PV modules as parallel arrays (one entry per module type).
+    
+    Holding the fields column-wise lets whole portfolios be evaluated with
+    NumPy broadcasting instead of looping over PVModuleSpecifications objects.
+    """
+    peak_power: np.ndarray  # Wp
+    area: np.ndarray  # m²
+    efficiency: np.ndarray  # % at standard test conditions
+    temp_coefficient: np.ndarray  # %/°C temperature coefficient
+    noct: np.ndarray  # °C Nominal Operating Cell Temperature
+    
+    @classmethod
+    def from_records(cls, specs: List[PVModuleSpecifications]) -> 'PVModuleFleet':
+        """Create a fleet from individual module specifications."""
+        return cls(**{
+            name: np.fromiter((getattr(spec, name) for spec in specs), dtype=np.float64, count=len(specs))
+            for name in ('peak_power', 'area', 'efficiency', 'temp_coefficient', 'noct')
+        })
+    
+    def __len__(self) -> int:
+        return len(self.peak_power)
+    
+    def calculate_dc_power(self,
+                           poa_global: np.ndarray,
+                           temp_air: np.ndarray,
+                           wind_speed: Union[float, np.ndarray] = 1.0,
+                           modules_count: Union[int, np.ndarray] = 1) -> np.ndarray:
+        """Calculate the DC power of every module type for a series of weather data.
+        
+        Uses the same NOCT cell temperature and DC power model as
+        PVSystem.calculate_power_output_series, with all modules exposed to
+        the same plane of array irradiance.
+        
+        Args:
+            poa_global: Plane of array irradiance in W/m², shape (T,)
+            temp_air: Air temperature in °C, shape (T,)
+            wind_speed: Wind speed in m/s, scalar or shape (T,)
+            modules_count: Number of modules per module type, scalar or shape (M,)
+            
+        Returns:
+            DC power in kW with shape (T, M)
+        """
+        poa = np.asarray(poa_global, dtype=np.float64)[:, np.newaxis]
+        cell_temp = pvlib.temperature.noct_sam(
+            poa_global=poa,
+            temp_air=np.asarray(temp_air, dtype=np.float64)[:, np.newaxis],
+            wind_speed=np.asarray(wind_speed, dtype=np.float64)[..., np.newaxis],
+            noct=self.noct,
+            module_efficiency=self.efficiency
+        )
+        dc_power = pv_dc_power(
+            poa,
+            np.broadcast_to(cell_temp, (poa.shape[0], len(self))),
+            self.peak_power * np.asarray(modules_count) * 1e-3,
+            self.temp_coefficient * 0.01,  # %/°C -> 1/°C
+            MODULE_LOSS_FACTOR
+        )
+        return np.maximum(dc_power, 0.0, out=dc_power)
+
 @dataclass
 class InverterSpecifications:
     """Technical specifications of an inverter."""
@@ -107,7 +194,7 @@ class PVSystem:
         """
         # Initialize components database if not provided
         if components_db is None:
-            components_db = ComponentsDatabase()
+            components_db = get_components_database()
         
         # Load component specifications from database
         self.module_specs = PVModuleSpecifications.from_database(
@@ -127,15 +214,146 @@ class PVSystem:
         self.total_peak_power = self.module_specs.peak_power * self.config.modules_count
         self.total_area = self.module_specs.area * self.config.modules_count
         
-        # Initialize pvlib location info if available
+        # Derived constants used on every power calculation
+        self._peak_kw = self.total_peak_power * 1e-3  # kWp
+        self._temp_coef = self.module_specs.temp_coefficient * 0.01  # %/°C -> 1/°C
+        self._alpha_sc = self._temp_coef * self.module_specs.peak_power * 1e-3  # A/°C
+        self._sandia_params = self._inverter_parameters()
+        
+        # Fixed module orientation: trigonometry and transposition factors
+        tilt = np.radians(self.config.tilt)
+        self._cos_tilt = np.cos(tilt)
+        self._sin_tilt = np.sin(tilt)
+        self._surface_azimuth_rad = np.radians(self.config.azimuth)
+        self._sky_diffuse_factor = (1 + self._cos_tilt) * 0.5  # Isotropic sky
+        self._ground_diffuse_factor = self.config.albedo * (1 - self._cos_tilt) * 0.5
+        
+        # Initialize pvlib location info if available (shared by co-located systems)
         if PVLIB_AVAILABLE:
-            self.location_info = pvlib.location.Location(
-                latitude=location[0], 
-                longitude=location[1], 
-                altitude=altitude
-            )
+            self.location_info = _get_location(location[0], location[1], altitude)
         else:
             raise ImportError("pvlib is required for PV calculations but not available")
+        
+        # Solar positions per timestamp (UTC nanoseconds), reused across repeated runs
+        self._solar_position_cache: Dict[int, Tuple[float, float]] = {}
+        
+        # Optional lookup table of declination and equation of time, see build_solar_lut
+        self._solar_lut: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle without the solar position cache, e.g. when sent to worker processes."""
+        state = self.__dict__.copy()
+        state['_solar_position_cache'] = {}
+        return state
+
+    def build_solar_lut(self, year: int, step_days: int = 5) -> None:
+        """Precompute solar declination and equation of time for a whole year.
+        
+        Both vary slowly over the year, so they are sampled every few days and
+        interpolated. Solar positions are then derived analytically from the
+        hour angle instead of running the full SPA algorithm for every
+        timestamp. Deviations stay well below one degree, which is acceptable
+        for hourly energy yields.
+        
+        Args:
+            year: Year of the simulation (determines leap days)
+            step_days: Sampling interval in days
+        """
+        days_in_year = 366 if calendar.isleap(year) else 365
+        day_of_year = np.arange(1, days_in_year + step_days + 1, step_days, dtype=np.float64)
+        self._solar_lut = (
+            day_of_year,
+            np.asarray(pvlib.solarposition.declination_spencer71(day_of_year)),  # rad
+            np.asarray(pvlib.solarposition.equation_of_time_spencer71(day_of_year))  # min
+        )
+
+    def _solar_position(self, times: pd.DatetimeIndex) -> Tuple[np.ndarray, np.ndarray]:
+        """Solar zenith and azimuth for the given timestamps, cached per timestamp.
+        
+        Args:
+            times: Timestamps for solar position calculation
+            
+        Returns:
+            Tuple of (zenith, azimuth) arrays in degrees
+        """
+        if self._solar_lut is not None:
+            return self._solar_position_from_lut(times)
+        
+        # Naive timestamps are interpreted as UTC, like pvlib does for the default location
+        keys = times.as_unit('ns').asi8.tolist()
+        cache = self._solar_position_cache
+        missing = [key for key in dict.fromkeys(keys) if key not in cache]
+        
+        computed: Dict[int, Tuple[float, float]] = {}
+        if missing:
+            missing_times = pd.DatetimeIndex(np.asarray(missing, dtype='datetime64[ns]'), tz='UTC')
+            solar_position = self.location_info.get_solarposition(missing_times)
+            computed = dict(zip(missing, zip(solar_position['zenith'].tolist(),
+                                             solar_position['azimuth'].tolist())))
+        
+        positions = [computed[key] if key in computed else cache[key] for key in keys]
+        position = (np.array([p[0] for p in positions], dtype=np.float64),
+                    np.array([p[1] for p in positions], dtype=np.float64))
+        
+        # Bounded to SOLAR_POSITION_CACHE_SIZE timestamps; drop the oldest entries first
+        for key, value in list(computed.items())[-SOLAR_POSITION_CACHE_SIZE:]:
+            if len(cache) >= SOLAR_POSITION_CACHE_SIZE:
+                del cache[next(iter(cache))]
+            cache[key] = value
+        return position
+
+    def _solar_position_from_lut(self, times: pd.DatetimeIndex) -> Tuple[np.ndarray, np.ndarray]:
+        """Solar zenith and azimuth from the precomputed declination/equation-of-time table."""
+        lut_day, lut_declination, lut_eot = self._solar_lut
+        
+        # Fractional day of year, interpolated on the coarse table
+        day_fraction = times.dayofyear.to_numpy() + (times.hour.to_numpy() + times.minute.to_numpy() / 60) / 24
+        declination = np.interp(day_fraction, lut_day, lut_declination)
+        equation_of_time = np.interp(day_fraction, lut_day, lut_eot)
+        
+        hour_angle = np.radians(pvlib.solarposition.hour_angle(times, self.location[1], equation_of_time))
+        latitude = np.radians(self.location[0])
+        zenith = pvlib.solarposition.solar_zenith_analytical(latitude, hour_angle, declination)
+        azimuth = pvlib.solarposition.solar_azimuth_analytical(latitude, hour_angle, declination, zenith)
+        return np.degrees(np.asarray(zenith)), np.degrees(np.asarray(azimuth))
+
+    def _plane_of_array(self,
+                        times: pd.DatetimeIndex,
+                        ghi: np.ndarray,
+                        dni: np.ndarray,
+                        dhi: np.ndarray) -> Tuple[Dict[str, np.ndarray], Tuple[np.ndarray, np.ndarray]]:
+        """Plane of array irradiance together with the solar position it was derived from.
+        
+        Evaluates the same isotropic transposition as
+        pvlib.irradiance.get_total_irradiance, but with the sine/cosine of the
+        fixed module orientation precomputed in __init__.
+        
+        Args:
+            times: Timestamps for solar position calculation
+            ghi: Global horizontal irradiance in W/m²
+            dni: Direct normal irradiance in W/m²
+            dhi: Diffuse horizontal irradiance in W/m²
+            
+        Returns:
+            Tuple of (POA irradiance components as arrays, (zenith, azimuth) in degrees)
+        """
+        zenith, azimuth = self._solar_position(times)
+        zenith_rad = np.radians(zenith)
+        
+        # Cosine of the angle of incidence on the module plane
+        cos_aoi = (self._cos_tilt * np.cos(zenith_rad) +
+                   self._sin_tilt * np.sin(zenith_rad) * np.cos(np.radians(azimuth) - self._surface_azimuth_rad))
+        np.clip(cos_aoi, -1, 1, out=cos_aoi)
+        
+        poa_direct = np.maximum(np.asarray(dni, dtype=np.float64) * cos_aoi, 0)
+        poa_diffuse = (self._sky_diffuse_factor * np.asarray(dhi, dtype=np.float64) +
+                       self._ground_diffuse_factor * np.asarray(ghi, dtype=np.float64))
+        components = {
+            'poa_global': poa_direct + poa_diffuse,
+            'poa_direct': poa_direct,
+            'poa_diffuse': poa_diffuse
+        }
+        return components, (zenith, azimuth)
 
     def get_irradiance(self, 
                       timestamp: datetime,
@@ -149,38 +367,33 @@ class PVSystem:
         Returns:
             Tuple of (poa_global, poa_direct, poa_diffuse) in W/m²
         """
-        # Calculate solar position using pvlib
-        solar_position = self.location_info.get_solarposition(timestamp)
-        
-        # Calculate irradiance on tilted surface using pvlib
-        poa_irradiance = pvlib.irradiance.get_total_irradiance(
-            surface_tilt=self.config.tilt,
-            surface_azimuth=self.config.azimuth,
-            solar_zenith=solar_position['zenith'].iloc[0] if hasattr(solar_position['zenith'], 'iloc') else solar_position['zenith'],
-            solar_azimuth=solar_position['azimuth'].iloc[0] if hasattr(solar_position['azimuth'], 'iloc') else solar_position['azimuth'],
-            dni=weather_data.get('dni', weather_data.get('ghi', 0) * 0.85),  # Fallback if DNI not available
+        poa_irradiance, _ = self._plane_of_array(
+            pd.DatetimeIndex([timestamp]),
             ghi=weather_data.get('ghi', 0),
-            dhi=weather_data.get('dhi', weather_data.get('ghi', 0) * 0.15),  # Fallback if DHI not available
-            albedo=self.config.albedo
+            dni=weather_data.get('dni', weather_data.get('ghi', 0) * 0.85),  # Fallback if DNI not available
+            dhi=weather_data.get('dhi', weather_data.get('ghi', 0) * 0.15)  # Fallback if DHI not available
         )
         
-        return (poa_irradiance['poa_global'],
-                poa_irradiance['poa_direct'],
-                poa_irradiance['poa_diffuse'])
+        return (float(poa_irradiance['poa_global'][0]),
+                float(poa_irradiance['poa_direct'][0]),
+                float(poa_irradiance['poa_diffuse'][0]))
 
     def calculate_cell_temperature(self,
-                                ambient_temp: float,
-                                solar_irradiance: float,
-                                wind_speed: float = 1.0) -> float:
+                                ambient_temp: Union[float, np.ndarray],
+                                solar_irradiance: Union[float, np.ndarray],
+                                wind_speed: Union[float, np.ndarray] = 1.0) -> Union[float, np.ndarray]:
         """Calculate cell temperature using pvlib models.
         
+        All inputs may be scalars or arrays of equal length; the NOCT model is
+        evaluated element-wise in one call.
+        
         Args:
             ambient_temp: Ambient temperature in °C
             solar_irradiance: Irradiance in W/m²
             wind_speed: Wind speed in m/s (Optional, default = 1.0 m/s)
             
         Returns:
-            Cell temperature in °C
+            Cell temperature in °C (array for array input)
         """
         # Use pvlib's NOCT model
         cell_temp = pvlib.temperature.noct_sam(
@@ -192,6 +405,20 @@ class PVSystem:
         )
         return cell_temp
     
+    def _inverter_parameters(self) -> Dict[str, float]:
+        """Sandia inverter model parameters derived from the inverter specifications."""
+        return {
+            'Paco': self.inverter_specs.nominal_ac_power,
+            'Pdco': self.inverter_specs.max_dc_power,
+            'Vdco': 400,  # DC voltage at max power
+            'Pso': self.inverter_specs.nominal_ac_power * 0.02,  # Standby power
+            'C0': -0.000005,  # Curvature coefficient
+            'C1': -0.000005,  # Curvature coefficient
+            'C2': 0.0001,     # Curvature coefficient
+            'C3': 0.005,      # Curvature coefficient
+            'Pnt': 0.1        # Night tare loss
+        }
+    
     def calculate_power_output(self,
                             timestamp: datetime,
                             weather_data: dict) -> tuple[float, float]:
@@ -209,109 +436,173 @@ class PVSystem:
         Returns:
             Tuple of (DC_power, AC_power) in kW
         """
-        # Extract weather data
-        ghi = weather_data.get('ghi', 0)
-        dni = weather_data.get('dni', ghi * 0.85)  # Fallback estimate
-        dhi = weather_data.get('dhi', ghi * 0.15)  # Fallback estimate
-        temp_air = weather_data.get('temp_air', 25)
-        wind_speed = weather_data.get('wind_speed', 1.0)
-        
-        # Calculate plane of array irradiance
-        poa_global, poa_direct, poa_diffuse = self.get_irradiance(timestamp, {
-            'ghi': ghi, 'dni': dni, 'dhi': dhi
-        })
+        # One-element batch; the model itself lives in calculate_power_output_series
+        dc_power, ac_power = self.calculate_power_output_series(
+            pd.DatetimeIndex([timestamp]),
+            {key: np.atleast_1d(value) for key, value in weather_data.items()}
+        )
+        return float(dc_power[0]), float(ac_power[0])
+
+    def calculate_power_output_series(self,
+                                   timestamps: pd.DatetimeIndex,
+                                   weather_arrays: Dict[str, np.ndarray],
+                                   dtype: Union[str, np.dtype] = 'float64') -> Tuple[np.ndarray, np.ndarray]:
+        """Calculate power output for a whole series of timestamps at once.
+        
+        Solar position, transposition, cell temperature and inverter model are
+        evaluated in one pvlib call each for all timestamps.
+        
+        Args:
+            timestamps: Timestamps for solar position calculation
+            weather_arrays: Dictionary with weather arrays aligned to timestamps
+                (ghi, optional dni/dhi/temp_air/wind_speed, see calculate_power_output)
+            dtype: Precision of the power arrays. The pvlib models always run in
+                float64; 'float32' halves the memory of the power calculation and
+                results, which is sufficient for annual hourly yields.
+            
+        Returns:
+            Tuple of (DC_power, AC_power) arrays in kW
+        """
+        times = pd.DatetimeIndex(timestamps)
+        n_steps = len(times)
         
-        # Calculate cell temperature
+        # Extract weather data, estimating missing values from GHI
+        ghi = np.asarray(weather_arrays.get('ghi', np.zeros(n_steps)), dtype=np.float64)
+        dni = np.asarray(weather_arrays.get('dni', ghi * 0.85), dtype=np.float64)
+        dhi = np.asarray(weather_arrays.get('dhi', ghi * 0.15), dtype=np.float64)
+        temp_air = np.asarray(weather_arrays.get('temp_air', np.full(n_steps, 25.0)), dtype=np.float64)
+        wind_speed = np.asarray(weather_arrays.get('wind_speed', np.ones(n_steps)), dtype=np.float64)
+        
+        # Solar position and plane of array irradiance for all timestamps
+        poa_irradiance, _ = self._plane_of_array(times, ghi, dni, dhi)
+        poa_global = poa_irradiance['poa_global']
+        
+        # Cell temperature, one vectorized NOCT evaluation for all timestamps
         cell_temp = self.calculate_cell_temperature(temp_air, poa_global, wind_speed)
         
-        # Calculate DC power using pvlib photovoltaic model
-        # Use simplified Single Diode Model
+        # Single diode parameters for all timestamps in one call, then MPP voltage
         photocurrent, saturation_current, resistance_series, resistance_shunt, nNsVth = (
             pvlib.pvsystem.calcparams_desoto(
                 effective_irradiance=poa_global,
                 temp_cell=cell_temp,
-                alpha_sc=self.module_specs.temp_coefficient / 100 * self.module_specs.peak_power / 1000,  # A/°C
-                a_ref=1.5,  # Diode ideality factor
-                I_L_ref=8.0,  # Light current at reference conditions (A)
-                I_o_ref=1e-10,  # Dark current at reference conditions (A)
-                R_sh_ref=400,  # Shunt resistance at reference conditions (Ohm)
-                R_s=0.4,  # Series resistance (Ohm)
-                EgRef=1.121,  # Band gap energy at reference temperature (eV)
-                dEgdT=-0.0002677  # Temperature coefficient of band gap (eV/°C)
+                alpha_sc=self._alpha_sc,  # A/°C
+                **DESOTO_REFERENCE_PARAMETERS
             )
         )
-        
-        # Calculate I-V curve and find maximum power point using the newer recommended functions
-        # Ersetze 'singlediode' mit separaten v_from_i & i_from_v Berechnungen
-        # Erstelle ein Spannungsarray und berechne die entsprechenden Ströme
-        v = np.linspace(0, 40, 100)  # Spannungsbereich von 0-40V mit 100 Punkten
-        i = pvlib.pvsystem.i_from_v(
-            v, photocurrent, saturation_current, resistance_series, 
-            resistance_shunt, nNsVth
+        mpp = pvlib.pvsystem.max_power_point(
+            photocurrent, saturation_current, resistance_series,
+            resistance_shunt, nNsVth, method='newton'
         )
-        p = v * i  # Berechne Leistung
+        dc_voltage = np.asarray(mpp['v_mp'], dtype=np.float64)
         
-        # Finde MPP (Maximum Power Point)
-        idx_max_p = np.argmax(p)
-        dc_voltage, dc_current = v[idx_max_p], i[idx_max_p]
-        
-        # Simplified approach: Use temperature-corrected power
-        temp_coefficient = self.module_specs.temp_coefficient / 100  # Convert from %/°C to 1/°C
-        temp_factor = 1 + temp_coefficient * (cell_temp - 25)
-        
-        # DC power calculation
-        dc_power_per_module = (self.module_specs.peak_power * 
-                              (poa_global / 1000) *  # Irradiance factor
-                              temp_factor *  # Temperature factor
-                              0.95)  # Module mismatch and soiling losses
-        
-        dc_power_total = dc_power_per_module * self.config.modules_count / 1000  # Convert to kW
+        # Temperature-corrected DC power incl. module mismatch and soiling losses
+        dc_power_total = pv_dc_power(
+            poa_global.astype(dtype, copy=False),
+            np.asarray(cell_temp).astype(dtype, copy=False),
+            self._peak_kw,
+            self._temp_coef,
+            MODULE_LOSS_FACTOR
+        )
         
-        # Calculate AC power using inverter efficiency
-        # Use pvlib inverter model for more accuracy
-        ac_power = pvlib.inverter.sandia(
-            v_dc=dc_voltage if 'dc_voltage' in locals() else 400,  # Assume 400V DC
+        # AC power using the Sandia inverter model
+        ac_power = np.asarray(pvlib.inverter.sandia(
+            v_dc=dc_voltage,
             p_dc=dc_power_total * 1000,  # Convert back to W for pvlib
-            inverter={
-                'Paco': self.inverter_specs.nominal_ac_power,
-                'Pdco': self.inverter_specs.max_dc_power,
-                'Vdco': 400,  # DC voltage at max power
-                'Pso': self.inverter_specs.nominal_ac_power * 0.02,  # Standby power
-                'C0': -0.000005,  # Curvature coefficient
-                'C1': -0.000005,  # Curvature coefficient
-                'C2': 0.0001,     # Curvature coefficient
-                'C3': 0.005,      # Curvature coefficient
-                'Pnt': 0.1        # Night tare loss
-            }
-        ) / 1000  # Convert back to kW
-        
-        # Fallback to simple efficiency calculation if Sandia model fails
-        if np.isnan(ac_power) or ac_power < 0:
-            ac_power = dc_power_total * self.inverter_specs.euro_efficiency
-        
-        # Ensure non-negative values
-        dc_power_total = max(0, dc_power_total)
-        ac_power = max(0, ac_power)
-        
-        return dc_power_total, ac_power
+            inverter=self._sandia_params
+        ), dtype=dtype)
+        
+        # Non-negative values (in place), simple efficiency where the Sandia model fails
+        return pv_output_power(dc_power_total, ac_power, self.inverter_specs.euro_efficiency)
     
     def estimate_yearly_yield(self,
-                           yearly_radiation: float,  # kWh/m²/year
-                           avg_temp: float,  # °C
-                           system_losses: float = 0.14  # 14% system losses
-                           ) -> float:
+                           yearly_radiation: Union[float, np.ndarray],  # kWh/m²/year
+                           avg_temp: Union[float, np.ndarray],  # °C
+                           system_losses: Union[float, np.ndarray] = 0.14  # 14% system losses
+                           ) -> Union[float, np.ndarray]:
         """Estimate annual energy yield.
         
+        All inputs broadcast against each other, so parameter sweeps run as one
+        NumPy expression, e.g.
+        ``estimate_yearly_yield(np.array([1000, 1100, 1200]), np.array([10, 15, 20]))``.
+        
         Args:
             yearly_radiation: Annual irradiation on module surface
             avg_temp: Average temperature
             system_losses: System losses (soiling, wiring, etc.)
             
         Returns:
-            Estimated annual yield in kWh
+            Estimated annual yield in kWh (array for array input)
         """
         # Simple calculation using the PR method (Performance Ratio)
-        temp_loss = 1 + (self.module_specs.temp_coefficient / 100) * (avg_temp - 25)
-        pr = (1 - system_losses) * temp_loss
+        temp_loss = 1 + self._temp_coef * (np.asarray(avg_temp) - 25)
+        pr = (1 - np.asarray(system_losses)) * temp_loss
         
-        return (self.total_peak_power / 1000) * yearly_radiation * pr
+        return self._peak_kw * np.asarray(yearly_radiation) * pr
+    
+    def estimate_yearly_yield_batch(self,
+                                    yearly_radiations: np.ndarray,
+                                    avg_temps: np.ndarray,
+                                    system_losses: np.ndarray) -> np.ndarray:
+        """Estimate annual yields for every combination of the given parameters.
+        
+        Args:
+            yearly_radiations: Annual irradiations on module surface in kWh/m²
+            avg_temps: Average temperatures in °C
+            system_losses: System losses as fractions
+            
+        Returns:
+            Annual yields in kWh with shape (radiations, temperatures, losses)
+        """
+        radiation, temp, losses = np.ix_(
+            np.asarray(yearly_radiations, dtype=np.float64),
+            np.asarray(avg_temps, dtype=np.float64),
+            np.asarray(system_losses, dtype=np.float64)
+        )
+        return self.estimate_yearly_yield(radiation, temp, losses)
+
+
+# Weather arrays of the current worker process, set once by _init_worker
+_worker_weather: Dict[str, Any] = {}
+
+def _init_worker(timestamps: pd.DatetimeIndex, weather_arrays: Dict[str, np.ndarray]) -> None:
+    """Receive the shared timestamps and weather arrays once per worker process."""
+    _worker_weather['timestamps'] = timestamps
+    _worker_weather['weather_arrays'] = weather_arrays
+
+def _simulate_system(system: PVSystem) -> Tuple[np.ndarray, np.ndarray]:
+    """Simulate one PV system on the weather data of the worker process."""
+    return system.calculate_power_output_series(
+        _worker_weather['timestamps'],
+        _worker_weather['weather_arrays']
+    )
+
+def simulate_annual_parallel(systems: List[PVSystem],
+                             timestamps: pd.DatetimeIndex,
+                             weather_arrays: Dict[str, np.ndarray],
+                             n_workers: Optional[int] = None) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Simulate several independent PV systems on the same weather data in parallel.
+    
+    The weather data is transferred to each worker process once; only the
+    systems themselves are sent per task.
+    
+    Args:
+        systems: PV systems to simulate (e.g. different orientations or buildings)
+        timestamps: Timestamps of the simulation period
+        weather_arrays: Weather arrays aligned to timestamps, see calculate_power_output_series
+        n_workers: Number of worker processes (default: number of CPUs)
+        
+    Returns:
+        List of (DC_power, AC_power) arrays in kW, in the order of systems
+    """
+    timestamps = pd.DatetimeIndex(timestamps)
+    if n_workers is None:
+        n_workers = multiprocessing.cpu_count()
+    n_workers = min(n_workers, len(systems))
+    
+    if n_workers <= 1:
+        return [system.calculate_power_output_series(timestamps, weather_arrays) for system in systems]
+    
+    with multiprocessing.Pool(processes=n_workers,
+                              initializer=_init_worker,
+                              initargs=(timestamps, weather_arrays)) as pool:
+        return pool.map(_simulate_system, systems)
@@ -1,7 +1,33 @@
 from dataclasses import dataclass
-from typing import Dict, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, Optional, Tuple, Union
 import numpy as np
 from src.core.standards import VDI6002, DIN15316
+from src.simulation.kernels import (
+    collector_efficiency, collector_thermal_power, collector_thermal_power_series,
+    solar_fraction_series, storage_layers_update
+)
+
+# Klassenbreiten für die gecachte Wirkungsgradberechnung
+EFFICIENCY_DELTA_T_BIN = 0.5  # K
+EFFICIENCY_IRRADIANCE_BIN = 10.0  # W/m²
+
+
+@lru_cache(maxsize=8192)
+def _binned_collector_efficiency(optical_efficiency: float,
+                                 a1: float,
+                                 a2: float,
+                                 delta_t_bin: int,
+                                 irradiance_bin: int) -> float:
+    """Kollektorwirkungsgrad für eine Klasse aus Temperaturdifferenz und Einstrahlung."""
+    return collector_efficiency(
+        optical_efficiency,
+        a1,
+        a2,
+        delta_t_bin * EFFICIENCY_DELTA_T_BIN,
+        irradiance_bin * EFFICIENCY_IRRADIANCE_BIN
+    )
+
 
 @dataclass
 class SolarThermalSpecifications:
@@ -33,6 +59,8 @@ class SolarThermalSystem:
                 tilt: float,  # Neigungswinkel in Grad
                 azimuth: float):  # Azimutwinkel in Grad
         self.collector = collector_specs
+        # Temperaturanstieg je W/m² im Stillstand (η0 / a1)
+        self._opt_over_a1 = collector_specs.optical_efficiency / collector_specs.heat_loss_coefficient_a1
         self.storage = storage_specs
         self.location = location
         self.tilt = tilt
@@ -44,9 +72,17 @@ class SolarThermalSystem:
         
         # Betriebszustände
         self.collector_temp: float = 20.0
-        self.storage_temps: list[float] = [45.0] * 10  # 10 Schichten
+        self.storage_temps: np.ndarray = np.full(10, 45.0)  # 10 Schichten
         self.flow_rate: float = 0.02  # kg/s pro m²
         
+        # Wärmekapazität einer Speicherschicht in kJ/K (Wasser: 4.18 kJ/(kg·K))
+        self._layer_heat_capacity = self.storage.volume / len(self.storage_temps) * 1000 * 4.18
+        
+    @property
+    def storage_temps_list(self) -> list[float]:
+        """Schichttemperaturen als Liste, z.B. für die JSON-Ausgabe."""
+        return self.storage_temps.tolist()
+    
     def calculate_collector_efficiency(self,
                                    delta_t: float,  # K Temperaturdifferenz
                                    solar_irradiance: float  # W/m²
@@ -61,14 +97,40 @@ class SolarThermalSystem:
         Returns:
             Kollektorwirkungsgrad
         """
-        if solar_irradiance < 1:
-            return 0.0
+        return collector_efficiency(
+            self.collector.optical_efficiency,
+            self.collector.heat_loss_coefficient_a1,
+            self.collector.heat_loss_coefficient_a2,
+            delta_t,
+            solar_irradiance
+        )
+    
+    def calculate_collector_efficiency_binned(self,
+                                          delta_t: float,  # K Temperaturdifferenz
+                                          solar_irradiance: float  # W/m²
+                                          ) -> float:
+        """
+        Berechnet den Kollektorwirkungsgrad für gerundete Eingangswerte.
+        
+        Temperaturdifferenz und Einstrahlung werden auf EFFICIENCY_DELTA_T_BIN
+        bzw. EFFICIENCY_IRRADIANCE_BIN gerundet; wiederkehrende Klassen werden
+        aus dem Cache gelesen. Geeignet für Parameterstudien, die dieselben
+        Wetterdaten vielfach durchlaufen.
+        
+        Args:
+            delta_t: Temperaturdifferenz (Kollektor - Umgebung) in K
+            solar_irradiance: Solare Einstrahlung in W/m²
             
-        efficiency = (self.collector.optical_efficiency -
-                     (self.collector.heat_loss_coefficient_a1 * delta_t +
-                      self.collector.heat_loss_coefficient_a2 * delta_t**2) /
-                     solar_irradiance)
-        return max(0, efficiency)
+        Returns:
+            Kollektorwirkungsgrad der Klasse
+        """
+        return _binned_collector_efficiency(
+            self.collector.optical_efficiency,
+            self.collector.heat_loss_coefficient_a1,
+            self.collector.heat_loss_coefficient_a2,
+            round(delta_t / EFFICIENCY_DELTA_T_BIN),
+            round(solar_irradiance / EFFICIENCY_IRRADIANCE_BIN)
+        )
     
     def calculate_thermal_power(self,
                              solar_irradiance: float,  # W/m²
@@ -86,50 +148,70 @@ class SolarThermalSystem:
         Returns:
             Tuple aus (thermische_Leistung in kW, Kollektortemperatur in °C)
         """
-        # Stagnationsschutz nach VDI 6002
-        if self.collector_temp >= self.vdi6002.max_stagnation_temp:
-            # Bei Stagnation kein Durchfluss und keine Leistung
-            max_temp = ambient_temp + solar_irradiance * self.collector.optical_efficiency / self.collector.heat_loss_coefficient_a1
-            self.collector_temp = min(max_temp, self.vdi6002.max_stagnation_temp)
-            return 0.0, self.collector_temp
+        # Stagnationsschutz nach VDI 6002 und Kollektorbilanz im kompilierten Kern
+        power, self.collector_temp = collector_thermal_power(
+            self.collector.optical_efficiency,
+            self.collector.heat_loss_coefficient_a1,
+            self.collector.heat_loss_coefficient_a2,
+            self.collector.area,
+            self.collector.specific_heat_capacity,
+            self.flow_rate,
+            self.vdi6002.max_stagnation_temp,
+            self._opt_over_a1,
+            self.collector_temp,
+            solar_irradiance,
+            ambient_temp,
+            flow_temp
+        )
+        return power, self.collector_temp
+    
+    def calculate_thermal_power_series(self,
+                                    solar_irradiance: np.ndarray,  # W/m²
+                                    ambient_temps: np.ndarray,  # °C
+                                    flow_temps: Union[float, np.ndarray]  # °C
+                                    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Berechnet die thermische Leistung für ganze Zeitreihen, z.B. ein Jahr.
         
-        # Thermisches Gleichgewicht berechnen
-        if self.flow_rate > 0:
-            # Mit Durchfluss: Vorlauftemperatur + Temperaturhub
-            delta_t = flow_temp - ambient_temp
-            efficiency = self.calculate_collector_efficiency(delta_t, solar_irradiance)
-            power = (efficiency * solar_irradiance * self.collector.area) / 1000  # kW
-            
-            # Temperaturanstieg durch thermische Leistung (begrenzt durch Verluste)
-            max_temp_rise = solar_irradiance * self.collector.optical_efficiency / (
-                self.collector.heat_loss_coefficient_a1 + 
-                self.collector.heat_loss_coefficient_a2 * (flow_temp - ambient_temp)
-            )
-            temp_rise = min(
-                power * 1000 / (self.flow_rate * self.collector.specific_heat_capacity),
-                max_temp_rise
-            )
-            
-            new_temp = flow_temp + temp_rise
-            if new_temp > self.vdi6002.max_stagnation_temp:
-                # Reduziere Leistung wenn maximale Temperatur überschritten
-                power *= (self.vdi6002.max_stagnation_temp - flow_temp) / temp_rise
-                new_temp = self.vdi6002.max_stagnation_temp
+        Liefert dieselben Werte wie calculate_thermal_power je Zeitschritt,
+        einschließlich der Stagnation über die Kollektortemperatur des
+        vorherigen Zeitschritts, ohne Python-Aufruf pro Stunde.
+        
+        Args:
+            solar_irradiance: Solare Einstrahlung in W/m²
+            ambient_temps: Umgebungstemperaturen in °C
+            flow_temps: Vorlauftemperaturen in °C (Array oder konstanter Wert)
             
-            self.collector_temp = new_temp
-        else:
-            # Ohne Durchfluss: Stagnationstemperatur
-            max_temp = ambient_temp + solar_irradiance * self.collector.optical_efficiency / self.collector.heat_loss_coefficient_a1
-            self.collector_temp = min(max_temp, self.vdi6002.max_stagnation_temp)
-            power = 0.0
+        Returns:
+            Tuple aus Arrays (thermische_Leistung in kW, Kollektortemperatur in °C)
+        """
+        solar_irradiance = np.asarray(solar_irradiance, dtype=np.float64)
+        ambient_temps = np.asarray(ambient_temps, dtype=np.float64)
+        flow_temps = np.broadcast_to(np.asarray(flow_temps, dtype=np.float64), solar_irradiance.shape)
         
-        return power, self.collector_temp
+        powers, collector_temps = collector_thermal_power_series(
+            self.collector.optical_efficiency,
+            self.collector.heat_loss_coefficient_a1,
+            self.collector.heat_loss_coefficient_a2,
+            self.collector.area,
+            self.collector.specific_heat_capacity,
+            self.flow_rate,
+            self.vdi6002.max_stagnation_temp,
+            self._opt_over_a1,
+            self.collector_temp,
+            solar_irradiance,
+            ambient_temps,
+            flow_temps
+        )
+        if len(collector_temps):
+            self.collector_temp = float(collector_temps[-1])
+        return powers, collector_temps
     
     def update_storage(self,
                      thermal_power: float,
                      dhw_demand: float,
                      time_step: float = 3600  # Zeitschritt in Sekunden
-                     ) -> tuple[float, list[float]]:
+                     ) -> tuple[float, np.ndarray]:
         """
         Aktualisiert den Speicherzustand nach DIN EN 12977-3.
         
@@ -141,28 +223,18 @@ class SolarThermalSystem:
         Returns:
             Tuple aus (nutzbare_Leistung in kW, Schichttemperaturen in °C)
         """
-        # Wärmeverluste nach DIN 15316
-        storage_losses = (self.storage.heat_loss_rate *
-                        (np.mean(self.storage_temps) - 20.0) *  # 20°C Umgebungstemp.
-                        time_step / 3600) / 1000  # kWh -> kW
-        
-        # Energiebilanz
-        energy_in = thermal_power * time_step / 3600  # kWh
-        energy_out = (dhw_demand + storage_losses) * time_step / 3600  # kWh
-        
-        # Temperaturschichtung
-        volume_per_layer = self.storage.volume / len(self.storage_temps)
-        energy_per_layer = energy_in / len(self.storage_temps)
-        
-        for i in range(len(self.storage_temps)):
-            # Temperaturänderung durch Zu-/Abfuhr
-            delta_t = (energy_per_layer - energy_out/len(self.storage_temps)) / (
-                volume_per_layer * 1000 * 4.18  # Wasser: 4.18 kJ/(kg·K)
-            )
-            self.storage_temps[i] += delta_t
-            
-            # Minimale Temperatur nach DVGW W551
-            self.storage_temps[i] = max(self.storage_temps[i], 60.0)
+        # Wärmeverluste nach DIN 15316 bei 20°C Umgebungstemperatur,
+        # minimale Temperatur nach DVGW W551
+        storage_layers_update(
+            self.storage_temps,
+            self._layer_heat_capacity,
+            self.storage.heat_loss_rate,
+            thermal_power,
+            dhw_demand,
+            time_step / 3600.0,
+            20.0,
+            60.0
+        )
         
         return max(0, dhw_demand), self.storage_temps
     
@@ -185,3 +257,22 @@ class SolarThermalSystem:
             
         solar_fraction = solar_contribution / total_demand
         return min(solar_fraction, 1.0)
+    
+    def calculate_solar_fraction_series(self,
+                                     total_demands: np.ndarray,  # kWh
+                                     solar_contributions: np.ndarray  # kWh
+                                     ) -> np.ndarray:
+        """
+        Berechnet den solaren Deckungsgrad nach VDI 6002 für ganze Zeitreihen.
+        
+        Args:
+            total_demands: Gesamtwärmebedarf in kWh, z.B. kumuliert je Stunde
+            solar_contributions: Solarer Beitrag in kWh
+            
+        Returns:
+            Solarer Deckungsgrad je Eintrag
+        """
+        return solar_fraction_series(
+            np.asarray(total_demands, dtype=np.float64),
+            np.asarray(solar_contributions, dtype=np.float64)
+        )
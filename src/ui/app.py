@@ -3,11 +3,31 @@ Schlanke Web-App für energyOS 3D-Builder
 ========================================
 """
 
-from flask import Flask, render_template, request, jsonify
+import os
+from flask import Flask, Response, render_template, request, jsonify
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
-import json
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from waitress import serve as waitress_serve
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+
+# Anzahl Threads des WSGI-Servers
+SERVER_THREADS = 8
+
+# Cache-Dauer der Hauptseite und der statischen Dateien im Browser in Sekunden
+INDEX_MAX_AGE = 3600
+STATIC_MAX_AGE = 31536000
+
 # Flask-App initialisieren
 STATIC_DIR = Path(__file__).parent / "static"
 TEMPLATES_DIR = Path(__file__).parent / "templates"
@@ -18,10 +38,52 @@ app = Flask(__name__,
             static_url_path='/static')
 CORS(app)
 
+# Statische Dateien über Flasks eigenen Handler (ETag, Last-Modified) mit langer Cache-Dauer
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = STATIC_MAX_AGE
+app.url_map.strict_slashes = False
+
+@app.url_defaults
+def _static_cache_busting(endpoint, values):
+    """Hängt die Änderungszeit an URLs statischer Dateien, damit Browser nach Updates trotz langer Cache-Dauer neu laden"""
+    if endpoint == 'static' and 'v' not in values:
+        path = STATIC_DIR / values.get('filename', '')
+        if path.is_file():
+            values['v'] = int(path.stat().st_mtime)
+
+class OrjsonProvider(JSONProvider):
+    """JSON-Provider für jsonify und request.get_json auf Basis von orjson"""
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
+
+def _json_response(payload, status: int = 200):
+    """JSON-Antwort, mit orjson direkt als Bytes serialisiert (inkl. NumPy-Arrays), sonst über jsonify"""
+    if not ORJSON_AVAILABLE:
+        return jsonify(payload), status
+    return app.response_class(
+        orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+        status=status,
+        mimetype='application/json'
+    )
+
+# Gerenderte Hauptseite; das Template hängt nicht von der Anfrage ab
+_index_html = None
+
 @app.route('/')
 def index():
     """Hauptseite mit 3D-Builder"""
-    return render_template('3d_builder.html')
+    global _index_html
+    if _index_html is None or app.debug:
+        # Beim ersten Aufruf rendern (url_for benötigt einen Request-Kontext)
+        _index_html = render_template('3d_builder.html').encode('utf-8')
+    return Response(_index_html, mimetype='text/html',
+                    headers={'Cache-Control': f'public, max-age={INDEX_MAX_AGE}'})
 
 @app.route('/api/save', methods=['POST'])
 def save_building():
@@ -29,19 +91,40 @@ def save_building():
     try:
         data = request.get_json()
         # Hier könnte eine echte Speicherung implementiert werden
-        return jsonify({'status': 'success', 'message': 'Gebäude gespeichert'})
+        return _json_response({'status': 'success', 'message': 'Gebäude gespeichert'})
     except Exception as e:
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+        return _json_response({'status': 'error', 'message': str(e)}, 500)
 
 @app.route('/api/load', methods=['GET'])
 def load_building():
     """Gebäude laden"""
     try:
         # Hier könnte echtes Laden implementiert werden
-        return jsonify({'status': 'success', 'data': {}})
+        return _json_response({'status': 'success', 'data': {}})
     except Exception as e:
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+        return _json_response({'status': 'error', 'message': str(e)}, 500)
+
+def serve(host: str = '0.0.0.0', port: int = 5555):
+    """
+    Startet die Web-App mit mehreren Threads.
+    
+    Mit waitress läuft ein produktiver WSGI-Server, sonst der Flask-Server
+    im Thread-Modus. Der Debug-Modus des Flask-Servers wird nur über die
+    Umgebungsvariable ENERGYSIM_DEBUG aktiviert.
+    
+    Args:
+        host: Adresse, an die der Server gebunden wird
+        port: Port des Servers
+    """
+    debug = bool(os.environ.get('ENERGYSIM_DEBUG'))
+    if debug:
+        # Geänderte statische Dateien beim Entwickeln sofort ausliefern
+        app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
+    if WAITRESS_AVAILABLE and not debug:
+        waitress_serve(app, host=host, port=port, threads=SERVER_THREADS)
+    else:
+        app.run(debug=debug, host=host, port=port, threaded=True, use_reloader=False)
 
 if __name__ == '__main__':
     print("🚀 Starte energyOS 3D-Builder...")
-    app.run(debug=True, host='0.0.0.0', port=5555)
+    serve()
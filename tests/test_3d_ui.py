@@ -94,6 +94,19 @@ def test_integration():
         print(f"❌ Integration fehlgeschlagen: {e}")
         return False
 
+def test_static_urls_versioned():
+    """Statische Dateien werden mit Versionsparameter eingebunden"""
+    from src.ui.app import STATIC_DIR, app
+    
+    version = int((STATIC_DIR / '3d_builder.js').stat().st_mtime)
+    with app.test_client() as client:
+        response = client.get('/')
+        assert f'/static/3d_builder.js?v={version}'.encode() in response.data
+        
+        response = client.get(f'/static/3d_builder.js?v={version}')
+        assert response.status_code == 200
+        assert response.cache_control.max_age == 31536000
+
 def main():
     """Hauptfunktion für Tests"""
     
@@ -2,13 +2,18 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import json
 import pytest
 from datetime import datetime, timedelta
 import numpy as np
+import pandas as pd
 from src.core.building import Building, BuildingProperties, Wall, Window, Roof, Floor
 from src.simulation.heat_pump import HeatPump, HeatPumpSpecifications
 from src.data_handlers.weather import WeatherDataHandler
 from src.data_handlers.weather import WeatherDataHandler
+from src.data_handlers.components import ComponentsDatabase
+import src.main
+from src.main import _interp_rows, run_simulation
 
 def test_basic_simulation():
     # Gebäude erstellen
@@ -95,5 +100,84 @@ def test_basic_simulation():
     print(f"Durchschnittlicher COP: {np.mean(cops):.2f}")
     print(f"Maximale Heizlast: {max(heat_demands):.2f} kW")
 
+class _FixedWeather:
+    """Deterministische stündliche Wetterdaten ohne Netzwerk oder Cache."""
+    
+    def get_historical_data(self, location, start_date, end_date):
+        timestamps = pd.date_range(start=start_date, end=end_date, freq='h', inclusive='left')
+        hours = timestamps.hour.to_numpy(dtype=np.float64)
+        return pd.DataFrame({
+            'timestamp': timestamps,
+            'temperature': 2.0 + 5.0 * np.sin(2 * np.pi * (hours - 9) / 24),
+            'solar_radiation': np.clip(400.0 * np.sin(np.pi * (hours - 8) / 8), 0.0, None),
+            'wind_speed': 3.0 + np.cos(2 * np.pi * hours / 24)
+        })
+
+@pytest.fixture
+def fixed_simulation_inputs(monkeypatch, tmp_path):
+    # Komponenten-Datenbank und Wetterdaten fest vorgeben, damit beide Läufe
+    # unabhängig von data/components, data/weather und dem Netzwerk sind
+    components = {
+        "pv_modules.json": {"modules": {"SunPower_MAX6_440": {
+            "manufacturer": "SunPower", "model": "MAX6 440", "peak_power": 440, "efficiency": 22.8,
+            "area": 1.93, "temp_coefficient": -0.29, "noct": 45, "warranty_years": 25, "datasheet_url": ""}}},
+        "inverters.json": {"inverters": {"SMA_Sunny_Tripower_10": {
+            "manufacturer": "SMA", "model": "Sunny Tripower 10.0", "nominal_ac_power": 10000,
+            "max_dc_power": 15000, "euro_efficiency": 97.8, "max_efficiency": 98.3, "mppt_channels": 2,
+            "voltage_range": [200, 800], "warranty_years": 10, "datasheet_url": ""}}},
+        "heat_pumps.json": {"heat_pumps": {"Viessmann_Vitocal_200S": {
+            "manufacturer": "Viessmann", "model": "Vitocal 200-S", "nominal_heating_power": 9000,
+            "cop_data": {"A-7W35": 2.7, "A-7W45": 2.2, "A2W35": 3.4, "A2W45": 2.7,
+                         "A7W35": 4.0, "A7W45": 3.2, "A10W35": 4.4, "A10W45": 3.5},
+            "min_outdoor_temp": -20, "max_flow_temp": 60, "refrigerant": "R410A",
+            "sound_power": 50, "warranty_years": 5, "datasheet_url": ""}}}
+    }
+    for filename, content in components.items():
+        (tmp_path / filename).write_text(json.dumps(content))
+    database = ComponentsDatabase(str(tmp_path))
+    
+    monkeypatch.setattr(src.main, "get_components_database", lambda: database)
+    monkeypatch.setattr(src.main, "WeatherDataHandler", _FixedWeather)
+    src.main._default_heat_pump_specs.cache_clear()
+    src.main._cached_pv_system.cache_clear()
+    yield
+    src.main._default_heat_pump_specs.cache_clear()
+    src.main._cached_pv_system.cache_clear()
+
+def test_parallel_simulation_matches_sequential(fixed_simulation_inputs):
+    # Tage werden in Worker-Prozessen simuliert, Wärmepumpe und PV-System
+    # müssen sich dafür serialisieren lassen
+    settings = dict(start_date="2025-01-01", end_date="2025-01-04", save_output=False, create_plot=False)
+    sequential = run_simulation(**settings)
+    parallel = run_simulation(n_workers=2, **settings)
+    
+    for section in ("energy_demand", "costs", "emissions"):
+        for key, value in sequential[section].items():
+            assert parallel[section][key] == pytest.approx(value), f"{section}.{key}"
+
+def test_simulation_rejects_invalid_weather(fixed_simulation_inputs, monkeypatch):
+    settings = dict(start_date="2025-01-01", end_date="2025-01-02")
+    fixed_data = _FixedWeather.get_historical_data
+    
+    monkeypatch.setattr(_FixedWeather, "get_historical_data", lambda self, *args: fixed_data(self, *args)[::-1])
+    with pytest.raises(ValueError, match="aufsteigend"):
+        run_simulation(**settings)
+    
+    monkeypatch.setattr(_FixedWeather, "get_historical_data",
+                        lambda self, *args: pd.DataFrame({'timestamp': [], 'temperature': []}))
+    with pytest.raises(ValueError, match="solar_radiation"):
+        run_simulation(**settings)
+
+def test_interp_rows_with_repeated_timestamps():
+    # Nach tz_localize(None) tritt die Stunde der Zeitumstellung im Herbst doppelt auf
+    x = np.arange(-1.0, 5.0, 0.25)
+    for xp in (np.array([0.0, 1.0, 2.0, 2.0, 3.0, 4.0]), np.array([0.0, 0.0, 1.0, 2.0, 3.0, 3.0])):
+        fp = np.vstack([np.array([0.0, 10.0, 20.0, 25.0, 30.0, 40.0]), np.arange(6.0)])
+        result = _interp_rows(x, xp, fp)
+        
+        assert np.isfinite(result).all()
+        for row, expected in zip(result, fp):
+            np.testing.assert_allclose(row, np.interp(x, xp, expected))
+
 if __name__ == "__main__":
     test_basic_simulation()
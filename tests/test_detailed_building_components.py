@@ -0,0 +1,196 @@
+import json
+
+import pytest
+from werkzeug.http import parse_etags, unquote_etag
+
+from src.core.detailed_building_components import (
+    ComponentType,
+    DetailedBuildingManager,
+    DetailedDoor,
+    DetailedFloor,
+    DetailedRoof,
+    DetailedWall,
+    DetailedWindow,
+    Layer,
+    layered_u_values
+)
+
+
+def _manager_with_wall():
+    manager = DetailedBuildingManager()
+    wall = DetailedWall(name="Südwand", area=25.0, height=2.5,
+                        layers=list(manager.standard_constructions["external_wall_geg"]))
+    manager.add_component(wall)
+    return manager, wall
+
+
+def test_building_3d_data_cached_until_modified():
+    manager, wall = _manager_with_wall()
+    
+    data = manager.get_building_3d_data()
+    assert manager.get_building_3d_data() == data
+    
+    # Änderungen am Ergebnis wirken sich nicht auf spätere Aufrufe aus
+    data["walls"][0]["layers"].clear()
+    data["extra"] = True
+    assert len(manager.get_building_3d_data()["walls"][0]["layers"]) == 4
+    assert "extra" not in manager.get_building_3d_data()
+    
+    # Hinzufügen invalidiert den Cache
+    window_id = manager.add_component(DetailedWindow(name="Fenster Süd"))
+    data = manager.get_building_3d_data()
+    assert len(data["windows"]) == 1
+    
+    # Entfernen ebenso
+    manager.remove_component(window_id)
+    assert manager.get_building_3d_data()["windows"] == []
+    
+    # Direkte Änderungen werden erst nach mark_modified sichtbar
+    wall.area = 30.0
+    assert manager.get_building_3d_data()["walls"][0]["area"] == 25.0
+    manager.mark_modified()
+    assert manager.get_building_3d_data()["walls"][0]["area"] == 30.0
+
+
+def test_total_heat_loss_cached_per_temperature():
+    manager, wall = _manager_with_wall()
+    
+    losses = manager.calculate_total_heat_loss(20.0, -12.0)
+    losses["transmission_walls"] = 0.0
+    assert manager.calculate_total_heat_loss(20.0, -12.0)["transmission_walls"] > 0.0
+    losses = manager.calculate_total_heat_loss(20.0, -12.0)
+    assert losses["transmission_walls"] == pytest.approx(25.0 * wall.calculate_u_value() * 32.0)
+    
+    # Andere Temperaturen werden getrennt berechnet
+    assert manager.calculate_total_heat_loss(20.0, 0.0)["transmission_walls"] == pytest.approx(
+        losses["transmission_walls"] * 20.0 / 32.0)
+
+
+def test_transmission_losses_per_component_type():
+    manager, wall = _manager_with_wall()
+    windows = [DetailedWindow(width=1.2, height=1.5, u_value=0.9), DetailedWindow(width=2.0, height=1.0, u_value=1.1)]
+    for window in windows:
+        manager.add_component(window)
+    manager.add_component(DetailedDoor(u_value=1.3))
+    roof = DetailedRoof(area=80.0, layers=list(manager.standard_constructions["roof_geg"]))
+    manager.add_component(roof)
+    
+    losses = manager.calculate_total_heat_loss(20.0, -10.0)
+    assert roof.u_value is not None
+    assert losses["transmission_windows"] == pytest.approx((1.8 * 0.9 + 2.0 * 1.1) * 30.0)
+    assert losses["transmission_doors"] == pytest.approx(0.9 * 2.1 * 1.3 * 30.0)
+    assert losses["transmission_roof"] == pytest.approx(80.0 * roof.u_value * 30.0)
+    assert losses["transmission_floor"] == 0.0
+    assert losses["total_transmission"] == pytest.approx(
+        losses["transmission_walls"] + losses["transmission_windows"]
+        + losses["transmission_doors"] + losses["transmission_roof"])
+
+
+def test_layer_arrays_follow_layer_assignment():
+    manager, wall = _manager_with_wall()
+    layers = manager.standard_constructions["external_wall_geg"]
+    
+    thicknesses, lambdas = wall.layer_arrays()
+    assert thicknesses.tolist() == [layer.thickness for layer in layers]
+    assert wall.calculate_u_value() == pytest.approx(
+        1.0 / (0.13 + 0.04 + sum(layer.thickness / layer.material.lambda_value for layer in layers)))
+    
+    # Neue Schichten werden beim nächsten Zugriff übernommen
+    wall.layers = manager.standard_constructions["external_wall_passive"]
+    assert wall.layer_arrays()[0].tolist() == [0.015, 0.175, 0.24, 0.02]
+    assert wall.calculate_u_value() < 0.2
+
+
+def test_layer_arrays_follow_in_place_changes():
+    manager = DetailedBuildingManager()
+    brick = manager.standard_materials["brick"]
+    wall = DetailedWall(name="Wand", area=10.0, layers=[Layer(brick, 0.24)])
+    
+    def fresh_u_value():
+        layers = [Layer(layer.material, layer.thickness) for layer in wall.layers]
+        return DetailedWall(name="Referenz", area=10.0, layers=layers).calculate_u_value()
+    
+    u_brick = wall.calculate_u_value()
+    wall.layers.append(Layer(manager.standard_materials["insulation_eps"], 0.16))
+    assert wall.calculate_u_value() == pytest.approx(fresh_u_value())
+    assert wall.calculate_u_value() < u_brick
+    
+    wall.layers[0].thickness = 0.5
+    assert wall.layer_arrays()[0].tolist() == [0.5, 0.16]
+    assert wall.calculate_u_value() == pytest.approx(fresh_u_value())
+    assert layered_u_values([wall])[0] == pytest.approx(fresh_u_value())
+
+
+def test_building_3d_payload_etag():
+    manager, wall = _manager_with_wall()
+    
+    blob, etag = manager.get_building_3d_payload()
+    assert json.loads(blob) == manager.get_building_3d_data()
+    assert manager.get_building_3d_payload()[1] == etag
+    
+    # Werkzeug erkennt den ETag in If-None-Match wieder
+    assert parse_etags(etag).contains_weak(unquote_etag(etag)[0])
+    
+    # Neue Komponente ergibt neuen Inhalt und neuen ETag
+    manager.add_component(DetailedWindow())
+    assert manager.get_building_3d_payload()[1] != etag
+
+
+def test_add_components_single_revision():
+    manager = DetailedBuildingManager()
+    components = [DetailedWall(area=20.0), DetailedWindow(), DetailedDoor()]
+    
+    ids = manager.add_components(components)
+    assert ids == [component.id for component in components]
+    assert manager.revision == 1
+    assert manager.get_component(ids[1]) is components[1]
+
+
+def test_components_by_type_index():
+    manager, wall = _manager_with_wall()
+    window = DetailedWindow()
+    manager.add_components([window, DetailedDoor()])
+    
+    assert manager.get_components_by_type(ComponentType.WALL) == [wall]
+    assert manager.get_components_by_type(ComponentType.WINDOW) == [window]
+    assert manager.get_components_by_type(ComponentType.ROOF) == []
+    
+    # Ersetzen unter gleicher ID mit anderem Typ und Entfernen
+    manager.add_component(DetailedRoof(id=window.id, area=50.0))
+    assert manager.get_components_by_type(ComponentType.WINDOW) == []
+    assert len(manager.get_components_by_type(ComponentType.ROOF)) == 1
+    manager.remove_component(wall.id)
+    assert manager.get_components_by_type(ComponentType.WALL) == []
+
+
+def test_layered_u_values_match_components():
+    manager = DetailedBuildingManager()
+    constructions = manager.standard_constructions
+    components = [
+        DetailedWall(layers=list(constructions["external_wall_geg"])),
+        DetailedRoof(layers=list(constructions["roof_geg"])),
+        DetailedFloor(layers=list(constructions["floor_slab_geg"])),
+        DetailedFloor(layers=list(constructions["floor_slab_geg"]), ground_coupling=False),
+        DetailedWall(layers=list(constructions["external_wall_passive"]))
+    ]
+    
+    u_values = layered_u_values(components)
+    assert u_values == pytest.approx([component.calculate_u_value() for component in components])
+    assert layered_u_values([]).size == 0
+
+
+def test_component_delta():
+    manager, wall = _manager_with_wall()
+    window = DetailedWindow(name="Fenster Ost", orientation="E")
+    manager.add_component(window)
+    
+    delta = manager.get_component_delta(window.id)
+    assert delta["revision"] == manager.revision
+    assert delta["delta"][window.id]["type"] == "window"
+    assert delta["delta"][window.id]["orientation"] == "E"
+    assert manager.get_building_3d_data()["windows"][0] == {
+        key: value for key, value in delta["delta"][window.id].items() if key != "type"}
+    
+    # Entfernte Komponenten werden als None gemeldet
+    manager.remove_component(window.id)
+    assert manager.get_component_delta(window.id)["delta"] == {window.id: None}
@@ -81,5 +81,22 @@ def test_energy_optimization():
     print(f"Batterieladung: {battery_value:.2f}")
     print(f"WP-Betrieb wirtschaftlich: {operation_recommended}")
 
+def test_operational_constraints_batch():
+    optimizer = EnergyFlowOptimizer()
+    
+    # Drei Kandidatenzustände: zu kalt, im Komfortbereich, zu warm
+    controls = optimizer.apply_operational_constraints(
+        heat_pump=np.array([0.3, 0.3, 0.3]),
+        storage=np.array([0.4, 0.4, 0.4]),
+        pv_battery=np.array([0.5, 0.5, 0.5]),
+        building_temps=np.array([19.0, 22.0, 27.0]),
+        dhw_temps=np.array([55.0, 65.0, 65.0]),
+        battery_socs=np.array([30.0, 100.0, 30.0])
+    )
+    
+    np.testing.assert_allclose(controls['heat_pump'], [1.0, 0.3, 0.0])
+    np.testing.assert_allclose(controls['dhw_heating'], [1.0, 0.4, 0.4])
+    np.testing.assert_allclose(controls['battery_charging'], [0.5, 0.0, 0.5])
+
 if __name__ == "__main__":
     test_energy_optimization()
@@ -2,10 +2,13 @@
 Tests für den EnergyPredictor.
 """
 
+import os
+import tempfile
 import unittest
 import numpy as np
 import pandas as pd
 from src.models.energy_predictor import EnergyPredictor
+from src.models.onnx_runtime import ONNX_AVAILABLE
 
 class TestEnergyPredictor(unittest.TestCase):
     def setUp(self):
@@ -51,6 +54,15 @@ class TestEnergyPredictor(unittest.TestCase):
         self.assertEqual(X.shape[2], expected_features)
         self.assertEqual(len(y.shape), 1)
     
+    def test_sequence_values(self):
+        """Test der Sequenzinhalte und Zielwerte."""
+        X, y = self.predictor.prepare_sequences(self.data)
+        length = self.predictor.sequence_length
+        
+        self.assertEqual(len(X), len(self.data) - length)
+        np.testing.assert_allclose(X[5], self.data.iloc[5:5 + length].values, rtol=1e-6)
+        self.assertAlmostEqual(y[5], self.data['energy_demand'].iloc[5 + length], places=5)
+        
     def test_training(self):
         """Test des Modelltrainings."""
         # Modell erstellen
@@ -83,5 +95,74 @@ class TestEnergyPredictor(unittest.TestCase):
         self.assertEqual(prediction.shape[-1], 1)
         self.assertTrue(np.all(np.isfinite(prediction)))
 
+    def test_prediction_with_assigned_model(self):
+        """Test der Vorhersage mit einem zugewiesenen statt gebauten Modell."""
+        trained = EnergyPredictor()
+        trained.build_model((24, len(self.data.columns)))
+        trained.train(self.data, epochs=1)
+        
+        # Modell wie nach dem Laden direkt zuweisen, ohne build_model
+        self.predictor.model = trained.model
+        test_sequence = self.data.iloc[:24].values
+        prediction = self.predictor.predict(test_sequence)
+        
+        # Toleranz deckt bfloat16-Mixed-Precision auf entsprechender Hardware ab
+        expected = trained.model.predict(test_sequence[None])
+        np.testing.assert_allclose(prediction, expected, rtol=1e-2, atol=1e-2)
+        
+        # Ein ersetztes Modell erhält eine eigene Inferenzfunktion
+        replacement = EnergyPredictor()
+        replacement.build_model((24, len(self.data.columns)))
+        self.predictor.model = replacement.model
+        np.testing.assert_allclose(
+            self.predictor.predict(test_sequence),
+            replacement.model.predict(test_sequence[None]),
+            rtol=1e-2, atol=1e-2
+        )
+
+    def test_tflite_prediction(self):
+        """Test der Vorhersage über den TFLite-Interpreter."""
+        input_shape = (24, len(self.data.columns))
+        self.predictor.build_model(input_shape)
+        self.predictor.train(self.data, epochs=1)
+        
+        test_sequence = self.data.iloc[:24].values
+        expected = self.predictor.model.predict(test_sequence[None])
+        
+        self.predictor.to_tflite()
+        prediction = self.predictor.predict(test_sequence)
+        
+        self.assertEqual(prediction.shape, expected.shape)
+        np.testing.assert_allclose(prediction, expected, rtol=0.1, atol=0.5)
+
+    def test_quantized_prediction(self):
+        """Test der Vorhersage mit quantisiertem TFLite-Modell."""
+        input_shape = (24, len(self.data.columns))
+        self.predictor.build_model(input_shape)
+        self.predictor.train(self.data, epochs=1)
+        
+        X, _ = self.predictor.prepare_sequences(self.data)
+        self.predictor.quantize(X)
+        prediction = self.predictor.predict(X[0])
+        
+        self.assertEqual(prediction.shape[-1], 1)
+        self.assertTrue(np.all(np.isfinite(prediction)))
+
+    @unittest.skipUnless(ONNX_AVAILABLE, "tf2onnx/onnxruntime nicht installiert")
+    def test_onnx_prediction(self):
+        """Test der Vorhersage über ONNX Runtime."""
+        input_shape = (24, len(self.data.columns))
+        self.predictor.build_model(input_shape)
+        self.predictor.train(self.data, epochs=1)
+        
+        test_sequence = self.data.iloc[:24].values
+        expected = self.predictor.predict(test_sequence)
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.predictor.to_onnx(os.path.join(tmp_dir, 'predictor.onnx'))
+            prediction = self.predictor.predict(test_sequence)
+        
+        np.testing.assert_allclose(prediction, expected, rtol=1e-4, atol=1e-4)
+
 if __name__ == '__main__':
     unittest.main()
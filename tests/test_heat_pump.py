@@ -2,11 +2,15 @@
 Tests für die Wärmepumpen-Simulation.
 """
 
+import pickle
 import unittest
 
 import numpy as np
 
-from src.simulation.heat_pump import HeatPump, HeatPumpSpecifications
+from src.simulation.heat_pump import (
+    HeatPump, HeatPumpSpecifications, build_cop_function, build_cop_interpolator, _build_cop_grid
+)
+from src.simulation.kernels import cop_bilinear
 
 
 class TestHeatPump(unittest.TestCase):
@@ -84,6 +88,12 @@ class TestHeatPump(unittest.TestCase):
         # Vorlauftemperatur sollte Maximaltemperatur nicht überschreiten
         self.assertTrue(all(t <= self.specs.max_flow_temp for t in flow_temps))
 
+        # Array-Eingabe liefert dieselben Werte wie Einzelaufrufe
+        np.testing.assert_allclose(
+            self.heat_pump.calculate_flow_temperature(np.array(temps + [-200])),
+            flow_temps + [self.specs.max_flow_temp]
+        )
+
     def test_defrost_operation(self):
         """Test des Abtaubetriebs."""
         # Betrieb ohne Abtauung
@@ -115,6 +125,107 @@ class TestHeatPump(unittest.TestCase):
         self.assertEqual(heat_output, 0.0)
         self.assertEqual(power_input, 0.0)
 
+    def test_cop_series_matches_scalar(self):
+        """Test der vektorisierten COP-Berechnung mit vorberechnetem Interpolator."""
+        interpolator = build_cop_interpolator(self.specs.cop_rating_points)
+        specs = HeatPumpSpecifications(
+            nominal_heating_power=10.0,
+            cop_rating_points=self.specs.cop_rating_points,
+            min_outside_temp=-20.0,
+            max_flow_temp=60.0,
+            min_part_load_ratio=0.3,
+            cop_interpolator=interpolator,
+        )
+        heat_pump = HeatPump(specs)
+        self.assertIs(heat_pump._cop_interpolator, interpolator)
+
+        outside = np.array([-25.0, -10.0, -7.0, 0.0, 2.0, 5.5, 7.0, 12.0])
+        flow = np.array([35.0, 38.0, 45.0, 40.0, 35.0, 42.0, 65.0, 30.0])
+
+        cops = heat_pump.calculate_cop_series(outside, flow)
+        expected = [heat_pump.calculate_cop(o, f) for o, f in zip(outside, flow)]
+
+        np.testing.assert_allclose(cops, expected)
+
+    def test_simulate_series_matches_scalar(self):
+        """Test der vektorisierten Simulation gegen die schrittweise Berechnung."""
+        outside = np.array([-25.0, -10.0, -7.0, 0.0, 2.0, 5.5, 7.0, 12.0])
+        flow = np.array([35.0, 38.0, 45.0, 40.0, 35.0, 42.0, 65.0, 30.0])
+        demands = np.array([5.0, 8.0, 0.5, 4.0, 12.0, 1.0, 3.0, 0.0])
+
+        reference = HeatPump(self.specs)
+        expected = [reference.get_power_output(o, f, d) for o, f, d in zip(outside, flow, demands)]
+
+        heat, power, _ = self.heat_pump.simulate_series(outside, flow, demands)
+
+        np.testing.assert_allclose(heat, [h for h, _ in expected])
+        np.testing.assert_allclose(power, [p for _, p in expected])
+        self.assertAlmostEqual(self.heat_pump.runtime, reference.runtime)
+        self.assertAlmostEqual(self.heat_pump.defrost_energy, reference.defrost_energy)
+
+        # NumPy-Variante ohne numba liefert dieselben Werte
+        heat_np, power_np, _, _ = self.heat_pump._simulate_series_numpy(outside, flow, demands, 1.0)
+        np.testing.assert_allclose(heat_np, heat)
+        np.testing.assert_allclose(power_np, power)
+
+    def test_generated_cop_function_matches_kernel(self):
+        """Test der auf das Kennfeld spezialisierten COP-Funktion."""
+        outside_axis, flow_axis, cop_grid = _build_cop_grid(self.specs.cop_rating_points)
+        cop_function = build_cop_function(outside_axis, flow_axis, cop_grid)
+        
+        rng = np.random.default_rng(0)
+        for outside, flow in rng.uniform([-25.0, 20.0], [25.0, 70.0], size=(200, 2)):
+            self.assertEqual(
+                cop_function(outside, flow),
+                cop_bilinear(outside_axis, flow_axis, cop_grid, outside, flow)
+            )
+
+        # Große Kennfelder nutzen die binäre Suche des Rechenkerns
+        large_outside = np.linspace(-20.0, 20.0, 41)
+        large_flow = np.linspace(25.0, 65.0, 17)
+        large_grid = 5.0 + 0.05 * large_outside[:, None] - 0.06 * large_flow[None, :]
+        large_function = build_cop_function(large_outside, large_flow, large_grid)
+        self.assertAlmostEqual(
+            large_function(3.3, 41.0),
+            cop_bilinear(large_outside, large_flow, large_grid, 3.3, 41.0)
+        )
+        self.assertEqual(pickle.loads(pickle.dumps(large_function))(3.3, 41.0), large_function(3.3, 41.0))
+
+    def test_pickle_roundtrip(self):
+        """Wärmepumpen lassen sich für Worker-Prozesse serialisieren."""
+        self.heat_pump.get_power_output(outside_temp=2.0, flow_temp=35.0, demand=5.0)
+        restored = pickle.loads(pickle.dumps(self.heat_pump))
+
+        self.assertEqual(restored.runtime, self.heat_pump.runtime)
+        for outside, flow in [(-10.0, 35.0), (2.0, 40.0), (12.0, 45.0)]:
+            self.assertEqual(restored.calculate_cop(outside, flow), self.heat_pump.calculate_cop(outside, flow))
+
+    def test_cop_grid_points_and_gaps(self):
+        """Stützstellen werden exakt getroffen, Lücken im Kennfeld aufgefüllt."""
+        for (outside, flow), expected in self.specs.cop_rating_points.items():
+            self.assertAlmostEqual(self.heat_pump.calculate_cop(outside, flow), expected)
+
+        # A2W45 fehlt: Randwert der vorhandenen Stützstellen (A2W40) wird übernommen
+        points = dict(self.specs.cop_rating_points)
+        del points[(2, 45)]
+        points[(2, 40)] = 3.00
+        specs = HeatPumpSpecifications(
+            nominal_heating_power=10.0,
+            cop_rating_points=points,
+            min_outside_temp=-20.0,
+            max_flow_temp=60.0,
+            min_part_load_ratio=0.3,
+        )
+        heat_pump = HeatPump(specs)
+        self.assertAlmostEqual(heat_pump.calculate_cop(2.0, 40.0), 3.00)
+        self.assertAlmostEqual(heat_pump.calculate_cop(2.0, 45.0), 3.00)
+
+        # Kennfeld liegt als sortierte, zusammenhängende Arrays in den Spezifikationen
+        self.assertTrue(np.all(np.diff(specs.outside_axis) > 0))
+        self.assertTrue(np.all(np.diff(specs.flow_axis) > 0))
+        self.assertEqual(specs.cop_grid.shape, (len(specs.outside_axis), len(specs.flow_axis)))
+        self.assertTrue(specs.cop_grid.flags['C_CONTIGUOUS'])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,168 @@
+"""
+Tests für die Rechenkerne der Simulation.
+"""
+
+import unittest
+
+import numpy as np
+
+from src.simulation.kernels import (
+    _heat_pump_series_loop, _heat_pump_series_parallel, _pv_dc_power_numpy, _pv_output_power_numpy,
+    collector_efficiency, collector_thermal_power, daily_heat_demand, energy_balance, layer_u_value,
+    pv_dc_power, pv_output_power, series_statistics, solar_fraction_series,
+    storage_layers_update
+)
+
+
+class TestKernels(unittest.TestCase):
+    def test_daily_heat_demand(self):
+        """Wärmebedarf unterhalb der Heizgrenze, kein Bedarf darüber."""
+        temps = np.array([-10.0, 0.0, 14.9, 15.0, 25.0])
+        demand = daily_heat_demand(temps, 150.0)
+
+        expected = [(15 - t) * 150.0 * 0.03 if t < 15 else 0.0 for t in temps]
+        np.testing.assert_allclose(demand, expected)
+
+    def test_energy_balance(self):
+        """Eigenverbrauch, Einspeisung und Netzbezug je Zeitschritt aufgeteilt."""
+        pv = np.array([0.0, 2.0, 5.0, 1.0])
+        hp = np.array([1.5, 2.0, 3.0, 4.0])
+
+        self_consumption, grid_feed, grid_draw = energy_balance(pv, hp)
+
+        self.assertAlmostEqual(self_consumption, 0.0 + 2.0 + 3.0 + 1.0)
+        self.assertAlmostEqual(grid_feed, 2.0)
+        self.assertAlmostEqual(grid_draw, 1.5 + 3.0)
+
+    def test_series_statistics(self):
+        """Kennzahlen entsprechen den einzelnen NumPy-Reduktionen."""
+        rng = np.random.default_rng(0)
+        temps = rng.normal(5.0, 8.0, 500)
+        cops = rng.uniform(2.0, 5.0, 500)
+        pv = rng.uniform(0.0, 9.0, 500)
+
+        stats = series_statistics(temps, cops, pv)
+
+        np.testing.assert_allclose(
+            stats, (temps.sum(), temps.min(), temps.max(), cops.sum(), pv.max())
+        )
+
+    def test_pv_power(self):
+        """DC-Leistung mit Temperaturkorrektur, AC-Ersatzwert bei ungültigem Wechselrichterwert."""
+        poa = np.array([0.0, 500.0, 1000.0])
+        cell_temps = np.array([10.0, 25.0, 50.0])
+
+        dc = pv_dc_power(poa, cell_temps, 8.8, -0.0035, 0.95)
+        expected_dc = 8.8 * poa / 1000 * (1 - 0.0035 * (cell_temps - 25)) * 0.95
+        np.testing.assert_allclose(dc, expected_dc)
+
+        dc_in = np.array([-0.1, 4.0, 8.0])
+        ac_in = np.array([-50.0, np.nan, 7600.0])
+        dc_out, ac_out = pv_output_power(dc_in, ac_in, 0.96)
+        np.testing.assert_allclose(dc_out, [0.0, 4.0, 8.0])
+        np.testing.assert_allclose(ac_out, [0.0, 4.0 * 0.96, 7.6])
+
+        # Ergebnisse stehen in den übergebenen Arrays
+        self.assertIs(dc_out, dc_in)
+        self.assertIs(ac_out, ac_in)
+
+        # float32-Eingaben ergeben float32-Ergebnisse
+        dc32 = pv_dc_power(poa.astype(np.float32), cell_temps.astype(np.float32), 8.8, -0.0035, 0.95)
+        self.assertEqual(dc32.dtype, np.float32)
+        np.testing.assert_allclose(dc32, expected_dc, rtol=1e-6)
+
+        # Parameter je Modultyp werden gegen die Zeitreihe gebroadcastet
+        peak_kw = np.array([8.8, 4.0])
+        temp_coef = np.array([-0.0035, -0.0029])
+        cell_grid = np.column_stack([cell_temps, cell_temps + 2.0])
+        dc_fleet = pv_dc_power(poa[:, np.newaxis], cell_grid, peak_kw, temp_coef, 0.95)
+        self.assertEqual(dc_fleet.shape, (3, 2))
+        for m in range(2):
+            np.testing.assert_allclose(
+                dc_fleet[:, m], pv_dc_power(poa, cell_grid[:, m].copy(), peak_kw[m], temp_coef[m], 0.95))
+
+    def test_pv_power_numpy_matches_kernel(self):
+        """NumPy-Varianten ohne numba liefern dieselben Werte."""
+        rng = np.random.default_rng(1)
+        poa = rng.uniform(0.0, 1000.0, 200)
+        cell_temps = rng.uniform(-10.0, 60.0, 200)
+        ac_watts = rng.uniform(-100.0, 8000.0, 200)
+        ac_watts[::7] = np.nan
+
+        np.testing.assert_allclose(
+            _pv_dc_power_numpy(poa, cell_temps, 8.8, -0.0035, 0.95),
+            pv_dc_power(poa, cell_temps, 8.8, -0.0035, 0.95)
+        )
+
+        dc = pv_dc_power(poa, cell_temps, 8.8, -0.0035, 0.95) - 0.5
+        expected = pv_output_power(dc.copy(), ac_watts.copy(), 0.96)
+        result = _pv_output_power_numpy(dc.copy(), ac_watts.copy(), 0.96)
+        np.testing.assert_allclose(result[0], expected[0])
+        np.testing.assert_allclose(result[1], expected[1])
+
+    def test_collector_thermal_power(self):
+        """Kollektorleistung nach EN 12975, keine Leistung bei Stagnation oder ohne Durchfluss."""
+        self.assertEqual(collector_efficiency(0.75, 1.8, 0.008, 40.0, 0.5), 0.0)
+        self.assertAlmostEqual(
+            collector_efficiency(0.75, 1.8, 0.008, 40.0, 800.0),
+            0.75 - (1.8 * 40.0 + 0.008 * 40.0 ** 2) / 800.0
+        )
+
+        # Vorlauf auf Umgebungstemperatur: optischer Wirkungsgrad, Temperaturhub durch Verluste begrenzt
+        power, temp = collector_thermal_power(0.75, 1.8, 0.008, 10.0, 3.6, 0.02, 120.0, 0.75 / 1.8,
+                                              50.0, 100.0, 20.0, 20.0)
+        self.assertAlmostEqual(power, 0.75 * 100.0 * 10.0 / 1000)
+        self.assertAlmostEqual(temp, 20.0 + 100.0 * 0.75 / 1.8)
+
+        # Begrenzung auf die maximale Stagnationstemperatur reduziert die Leistung
+        power, temp = collector_thermal_power(0.75, 1.8, 0.008, 10.0, 3.6, 0.02, 120.0, 0.75 / 1.8,
+                                              50.0, 800.0, 20.0, 60.0)
+        efficiency = 0.75 - (1.8 * 40.0 + 0.008 * 40.0 ** 2) / 800.0
+        max_temp_rise = 800.0 * 0.75 / (1.8 + 0.008 * 40.0)
+        self.assertAlmostEqual(power, efficiency * 800.0 * 10.0 / 1000 * (120.0 - 60.0) / max_temp_rise)
+        self.assertEqual(temp, 120.0)
+
+        # Stagnation und Stillstand: Gleichgewichtstemperatur, begrenzt auf das Maximum
+        for collector_temp, flow_rate in [(120.0, 0.02), (50.0, 0.0)]:
+            power, temp = collector_thermal_power(0.75, 1.8, 0.008, 10.0, 3.6, flow_rate, 120.0, 0.75 / 1.8,
+                                                  collector_temp, 800.0, 20.0, 60.0)
+            self.assertEqual(power, 0.0)
+            self.assertEqual(temp, 120.0)
+
+    def test_solar_fraction_series(self):
+        """Deckungsgrad ohne Bedarf 0, sonst Anteil begrenzt auf 1."""
+        fractions = solar_fraction_series(np.array([0.0, 10.0, 10.0, -1.0]), np.array([1.0, 4.0, 15.0, 1.0]))
+        np.testing.assert_allclose(fractions, [0.0, 0.4, 1.0, 0.0])
+
+    def test_storage_layers_update(self):
+        """Energiebilanz wird gleichmäßig verteilt, Minimaltemperatur gilt je Schicht."""
+        temps = np.array([70.0, 65.0, 61.0, 60.0])
+        storage_layers_update(temps, 100.0, 2.0, 20.0, 0.0, 1.0, 20.0, 60.0)
+        losses = 2.0 * (64.0 - 20.0) * 1e-3
+        delta_t = (20.0 - losses) / 4 / 100.0
+        np.testing.assert_allclose(temps, [70.0 + delta_t, 65.0 + delta_t, 61.0 + delta_t, 60.0 + delta_t])
+
+        storage_layers_update(temps, 100.0, 2.0, 0.0, 10000.0, 1.0, 20.0, 60.0)
+        np.testing.assert_allclose(temps, [60.0, 60.0, 60.0, 60.0])
+
+    def test_heat_pump_series_serial_matches_parallel(self):
+        """Einfache Schleife und paralleler Rechenkern liefern identische Reihen."""
+        outside_axis = np.array([-7.0, 2.0, 7.0])
+        flow_axis = np.array([35.0, 45.0])
+        cop_grid = np.array([[2.7, 2.2], [3.4, 2.7], [4.0, 3.2]])
+        rng = np.random.default_rng(0)
+        outside, flow, demands = rng.uniform([-25.0, 30.0, 0.0], [15.0, 65.0, 12.0], size=(100, 3)).T
+        args = (outside_axis, flow_axis, cop_grid, outside, flow, demands, 1.0, 10.0, 0.3, 7.0, -20.0, 60.0)
+
+        for serial, parallel in zip(_heat_pump_series_loop(*args), _heat_pump_series_parallel(*args)):
+            np.testing.assert_array_equal(serial, parallel)
+
+    def test_layer_u_value(self):
+        """U-Wert aus Schichtwiderständen, ungültige Schichten werden ignoriert."""
+        u_value = layer_u_value(np.array([0.015, 0.175, 0.14, 0.0]), np.array([0.87, 0.79, 0.035, 1.0]), 0.13, 0.04)
+        self.assertAlmostEqual(u_value, 1.0 / (0.13 + 0.04 + 0.015 / 0.87 + 0.175 / 0.79 + 0.14 / 0.035))
+        self.assertAlmostEqual(layer_u_value(np.empty(0), np.empty(0), 0.13, 0.04), 1.0 / 0.17)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,9 +6,12 @@ import pytest
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
-from src.simulation.pv_system import PVSystem, PVModuleSpecifications, PVArrayConfiguration
+from src.simulation.pv_system import (
+    PVSystem, PVModuleSpecifications, PVModuleFleet, PVArrayConfiguration, simulate_annual_parallel
+)
 from src.data_handlers.weather import WeatherDataHandler
 
+
 def test_pv_system():
     # PV-System erstellen mit korrekter Parameterreihenfolge
     config = PVArrayConfiguration(
@@ -75,5 +78,204 @@ def test_pv_system():
     print(f"Maximale AC-Leistung: {max(ac_powers):.2f} kW")
     print(f"Geschätzter Jahresertrag: {yearly_yield:.0f} kWh")
 
+
+def _reference_power_output(pv_system, timestamp, ghi, temp_air, wind_speed):
+    """Ursprüngliches Einzelzeitpunkt-Modell mit direkten pvlib-Aufrufen als unabhängige Referenz"""
+    import pvlib
+    specs = pv_system.module_specs
+    location = pvlib.location.Location(latitude=52.52, longitude=13.405, altitude=34.0)
+    solar_position = location.get_solarposition(timestamp)
+    poa_global = pvlib.irradiance.get_total_irradiance(
+        surface_tilt=30, surface_azimuth=180,
+        solar_zenith=solar_position['zenith'].iloc[0], solar_azimuth=solar_position['azimuth'].iloc[0],
+        dni=ghi * 0.85, ghi=ghi, dhi=ghi * 0.15, albedo=0.2
+    )['poa_global']
+    cell_temp = pvlib.temperature.noct_sam(
+        poa_global=poa_global, temp_air=temp_air, wind_speed=wind_speed,
+        noct=specs.noct, module_efficiency=specs.efficiency
+    )
+    dc_power = specs.peak_power * (poa_global / 1000) * (1 + specs.temp_coefficient / 100 * (cell_temp - 25)) * 0.95 * 20 / 1000
+    
+    # MPP-Spannung aus einer abgetasteten I-U-Kennlinie
+    diode_params = pvlib.pvsystem.calcparams_desoto(
+        effective_irradiance=poa_global, temp_cell=cell_temp,
+        alpha_sc=specs.temp_coefficient / 100 * specs.peak_power / 1000,
+        a_ref=1.5, I_L_ref=8.0, I_o_ref=1e-10, R_sh_ref=400, R_s=0.4, EgRef=1.121, dEgdT=-0.0002677
+    )
+    v = np.linspace(0, 40, 100)
+    p = v * pvlib.pvsystem.i_from_v(v, *diode_params)
+    ac_power = pvlib.inverter.sandia(
+        v_dc=v[np.argmax(p)], p_dc=dc_power * 1000, inverter=pv_system._inverter_parameters()
+    ) / 1000
+    if np.isnan(ac_power) or ac_power < 0:
+        ac_power = dc_power * pv_system.inverter_specs.euro_efficiency
+    return max(dc_power, 0.0), max(ac_power, 0.0)
+
+
+def test_pv_power_output_matches_reference():
+    config = PVArrayConfiguration(
+        modules_count=20,
+        tilt=30,
+        azimuth=180,
+        albedo=0.2,
+        module_key="SunPower_MAX6_440",
+        inverter_key="SMA_Sunny_Tripower_10"
+    )
+    pv_system = PVSystem(config, (52.52, 13.405), 34.0)
+    
+    # Synthetischer Sommertag mit Tag- und Nachtstunden
+    timestamps = pd.date_range("2024-06-21", periods=24, freq="h")
+    ghi = np.clip(800 * np.sin(np.pi * (np.arange(24) - 5) / 15), 0, None)
+    temp_air = 15 + 8 * np.sin(np.pi * (np.arange(24) - 8) / 12)
+    wind_speed = np.full(24, 2.0)
+    
+    dc_series, ac_series = pv_system.calculate_power_output_series(timestamps, {
+        'ghi': ghi,
+        'dni': ghi * 0.85,
+        'dhi': ghi * 0.15,
+        'temp_air': temp_air,
+        'wind_speed': wind_speed
+    })
+    
+    # Nacht, Morgen, Mittag und Abend gegen das ursprüngliche Modell; die
+    # AC-Toleranz deckt die gerasterte MPP-Spannung der Referenz ab
+    for i in (2, 7, 12, 17):
+        dc_ref, ac_ref = _reference_power_output(pv_system, timestamps[i], ghi[i], temp_air[i], wind_speed[i])
+        assert dc_series[i] == pytest.approx(dc_ref, rel=1e-9, abs=1e-12)
+        assert ac_series[i] == pytest.approx(ac_ref, rel=1e-4, abs=1e-9)
+        
+        dc, ac = pv_system.calculate_power_output(timestamps[i], {
+            'ghi': ghi[i], 'temp_air': temp_air[i], 'wind_speed': wind_speed[i]
+        })
+        assert dc == pytest.approx(dc_ref, rel=1e-9, abs=1e-12)
+        assert ac == pytest.approx(ac_ref, rel=1e-4, abs=1e-9)
+    assert dc_series[12] > 0 and ac_series[12] > 0
+
+
+def test_solar_lut_matches_spa():
+    config = PVArrayConfiguration(modules_count=20, tilt=30, azimuth=180)
+    pv_system = PVSystem(config, (52.52, 13.405), 34.0)
+    
+    # Tagesstunden über das ganze Jahr verteilt
+    timestamps = pd.date_range("2024-01-01 06:00", "2024-12-31 18:00", freq="7h")
+    zenith_spa, _ = pv_system._solar_position(timestamps)
+    
+    pv_system.build_solar_lut(2024)
+    zenith_lut, _ = pv_system._solar_position(timestamps)
+    
+    # Abweichung der Näherung unter 1° gegenüber SPA
+    assert np.max(np.abs(zenith_lut - zenith_spa)) < 1.0
+
+
+def test_solar_position_cache_per_timestamp(monkeypatch):
+    config = PVArrayConfiguration(modules_count=20, tilt=30, azimuth=180)
+    pv_system = PVSystem(config, (52.52, 13.405), 34.0)
+    timestamps = pd.date_range("2024-06-01", "2024-06-03", freq="h")
+    zenith, azimuth = pv_system._solar_position(timestamps)
+    
+    # Teilreihen und andere Zeitzonen nutzen dieselben Einträge
+    zenith_part, azimuth_part = pv_system._solar_position(timestamps[5:30].tz_localize("UTC").tz_convert("Europe/Berlin"))
+    np.testing.assert_array_equal(zenith_part, zenith[5:30])
+    np.testing.assert_array_equal(azimuth_part, azimuth[5:30])
+    
+    # Der Cache ist auf eine feste Anzahl Zeitpunkte begrenzt
+    monkeypatch.setattr("src.simulation.pv_system.SOLAR_POSITION_CACHE_SIZE", 10)
+    pv_system._solar_position_cache.clear()
+    zenith_bounded, _ = pv_system._solar_position(timestamps)
+    assert len(pv_system._solar_position_cache) == 10
+    np.testing.assert_array_equal(zenith_bounded, zenith)
+
+
+def test_pv_power_output_series_float32():
+    config = PVArrayConfiguration(modules_count=20, tilt=30, azimuth=180)
+    pv_system = PVSystem(config, (52.52, 13.405), 34.0)
+    
+    timestamps = pd.date_range("2024-06-21", periods=24, freq="h")
+    ghi = np.clip(800 * np.sin(np.pi * (np.arange(24) - 5) / 15), 0, None)
+    weather = {'ghi': ghi, 'temp_air': np.full(24, 20.0), 'wind_speed': np.full(24, 2.0)}
+    
+    dc64, ac64 = pv_system.calculate_power_output_series(timestamps, weather)
+    dc32, ac32 = pv_system.calculate_power_output_series(timestamps, weather, dtype='float32')
+    
+    assert dc32.dtype == np.float32 and ac32.dtype == np.float32
+    np.testing.assert_allclose(dc32, dc64, rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(ac32, ac64, rtol=1e-5, atol=1e-6)
+
+
+def test_simulate_annual_parallel():
+    systems = [
+        PVSystem(PVArrayConfiguration(modules_count=20, tilt=tilt, azimuth=azimuth), (52.52, 13.405), 34.0)
+        for tilt, azimuth in [(30, 180), (45, 90), (15, 270)]
+    ]
+    timestamps = pd.date_range("2024-06-21", periods=48, freq="h")
+    ghi = np.clip(800 * np.sin(np.pi * (np.arange(48) % 24 - 5) / 15), 0, None)
+    weather = {'ghi': ghi, 'temp_air': np.full(48, 20.0), 'wind_speed': np.full(48, 2.0)}
+    
+    parallel = simulate_annual_parallel(systems, timestamps, weather, n_workers=2)
+    
+    assert len(parallel) == len(systems)
+    for system, (dc, ac) in zip(systems, parallel):
+        dc_serial, ac_serial = system.calculate_power_output_series(timestamps, weather)
+        np.testing.assert_allclose(dc, dc_serial)
+        np.testing.assert_allclose(ac, ac_serial)
+
+
+def test_module_fleet_matches_system():
+    config = PVArrayConfiguration(modules_count=20, tilt=30, azimuth=180)
+    pv_system = PVSystem(config, (52.52, 13.405), 34.0)
+    
+    timestamps = pd.date_range("2024-06-21", periods=24, freq="h")
+    ghi = np.clip(800 * np.sin(np.pi * (np.arange(24) - 5) / 15), 0, None)
+    temp_air = np.full(24, 20.0)
+    wind_speed = np.full(24, 2.0)
+    dc_system, _ = pv_system.calculate_power_output_series(
+        timestamps, {'ghi': ghi, 'temp_air': temp_air, 'wind_speed': wind_speed}
+    )
+    poa_global, _, _ = zip(*(pv_system.get_irradiance(ts, {'ghi': g}) for ts, g in zip(timestamps, ghi)))
+    
+    fleet = PVModuleFleet.from_records([pv_system.module_specs, pv_system.module_specs])
+    dc_fleet = fleet.calculate_dc_power(np.array(poa_global), temp_air, wind_speed, np.array([20, 10]))
+    
+    assert dc_fleet.shape == (24, 2)
+    np.testing.assert_allclose(dc_fleet[:, 0], dc_system, rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(dc_fleet[:, 1], dc_system / 2, rtol=1e-9, atol=1e-12)
+
+
+def test_plane_of_array_matches_pvlib():
+    import pvlib
+    config = PVArrayConfiguration(modules_count=20, tilt=35, azimuth=150, albedo=0.25)
+    pv_system = PVSystem(config, (52.52, 13.405), 34.0)
+    
+    timestamps = pd.date_range("2024-03-20", periods=72, freq="h")
+    ghi = np.clip(700 * np.sin(np.pi * (np.arange(72) % 24 - 6) / 12), 0, None)
+    dni, dhi = ghi * 0.85, ghi * 0.15
+    
+    components, (zenith, azimuth) = pv_system._plane_of_array(timestamps, ghi, dni, dhi)
+    expected = pvlib.irradiance.get_total_irradiance(
+        surface_tilt=35, surface_azimuth=150, solar_zenith=zenith, solar_azimuth=azimuth,
+        dni=dni, ghi=ghi, dhi=dhi, albedo=0.25
+    )
+    for key in ('poa_global', 'poa_direct', 'poa_diffuse'):
+        np.testing.assert_allclose(components[key], np.asarray(expected[key]), rtol=1e-9, atol=1e-9)
+
+
+def test_yearly_yield_arrays():
+    config = PVArrayConfiguration(modules_count=20, tilt=30, azimuth=180)
+    pv_system = PVSystem(config, (52.52, 13.405), 34.0)
+    
+    radiations = np.array([1000.0, 1100.0, 1200.0])
+    temps = np.array([10.0, 15.0, 20.0])
+    losses = np.array([0.10, 0.14])
+    
+    yields = pv_system.estimate_yearly_yield(radiations, temps)
+    assert yields.shape == (3,)
+    for i in range(3):
+        assert yields[i] == pytest.approx(pv_system.estimate_yearly_yield(radiations[i], temps[i]))
+    
+    cube = pv_system.estimate_yearly_yield_batch(radiations, temps, losses)
+    assert cube.shape == (3, 3, 2)
+    assert cube[2, 0, 1] == pytest.approx(pv_system.estimate_yearly_yield(1200.0, 10.0, 0.14))
+
+
 if __name__ == "__main__":
     test_pv_system()
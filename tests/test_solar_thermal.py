@@ -121,5 +121,63 @@ def test_solar_thermal_system():
     print(f"Solarer Deckungsgrad: {solar_fractions[-1]*100:.1f}%")
     print(f"Maximale Kollektortemperatur: {max(collector_temps):.1f} °C")
 
+def test_thermal_power_series_matches_scalar():
+    collector_specs = SolarThermalSpecifications(
+        area=10.0,
+        optical_efficiency=0.75,
+        heat_loss_coefficient_a1=1.8,
+        heat_loss_coefficient_a2=0.008,
+        incident_angle_modifier=0.94
+    )
+    storage_specs = StorageSpecifications(
+        volume=0.75,
+        height=1.8,
+        insulation_thickness=0.1,
+        insulation_conductivity=0.04,
+        heat_loss_rate=2.5,
+        stratification_efficiency=0.85
+    )
+    series_system = SolarThermalSystem(collector_specs, storage_specs, (52.52, 13.405), 45, 180)
+    scalar_system = SolarThermalSystem(collector_specs, storage_specs, (52.52, 13.405), 45, 180)
+    
+    # Zwei Tage, beginnend in Stagnation
+    hours = np.arange(48)
+    irradiance = np.clip(1000 * np.sin(np.pi * (hours % 24 - 6) / 12), 0, None)
+    ambient_temps = 10 + 8 * np.sin(2 * np.pi * hours / 24)
+    series_system.collector_temp = scalar_system.collector_temp = 125.0
+    
+    powers, collector_temps = series_system.calculate_thermal_power_series(irradiance, ambient_temps, 60.0)
+    
+    for i in range(len(hours)):
+        power, temp = scalar_system.calculate_thermal_power(irradiance[i], ambient_temps[i], 60.0)
+        assert powers[i] == pytest.approx(power)
+        assert collector_temps[i] == pytest.approx(temp)
+    assert series_system.collector_temp == pytest.approx(scalar_system.collector_temp)
+
+def test_collector_efficiency_binned():
+    collector_specs = SolarThermalSpecifications(
+        area=10.0,
+        optical_efficiency=0.75,
+        heat_loss_coefficient_a1=1.8,
+        heat_loss_coefficient_a2=0.008,
+        incident_angle_modifier=0.94
+    )
+    storage_specs = StorageSpecifications(
+        volume=0.75,
+        height=1.8,
+        insulation_thickness=0.1,
+        insulation_conductivity=0.04,
+        heat_loss_rate=2.5,
+        stratification_efficiency=0.85
+    )
+    system = SolarThermalSystem(collector_specs, storage_specs, (52.52, 13.405), 45, 180)
+    
+    # Werte auf Klassengrenzen sind exakt, Zwischenwerte werden gerundet
+    assert system.calculate_collector_efficiency_binned(30.0, 800.0) == pytest.approx(
+        system.calculate_collector_efficiency(30.0, 800.0))
+    assert system.calculate_collector_efficiency_binned(30.1, 803.0) == pytest.approx(
+        system.calculate_collector_efficiency(30.0, 800.0))
+    assert system.calculate_collector_efficiency_binned(30.0, 0.0) == 0
+
 if __name__ == "__main__":
     test_solar_thermal_system()